@@ -3,6 +3,9 @@
 import re
 from datetime import datetime
 
+from agents.keyword_matcher import register_vocabulary
+from agents.transcript_analysis import TranscriptAnalysis
+
 # --- PERSONA SUPPORT ---
 PERSONAS = {
     "generalist": {
@@ -289,6 +292,18 @@ class AskAuraAgentWrapper:
             ]
         }
 
+        # Additional medical term detection
+        self.medical_terms = {
+            "fr": ["cardiaque", "respiratoire", "neurologique", "gastro", "urinaire",
+                  "infectieux", "traumatique", "métabolique", "psychiatrique"],
+            "en": ["cardiac", "respiratory", "neurological", "gastro", "urinary",
+                  "infectious", "traumatic", "metabolic", "psychiatric"]
+        }
+
+        register_vocabulary("ask_aura.medical_contexts", self.medical_contexts)
+        for language, terms in self.medical_terms.items():
+            register_vocabulary(f"ask_aura.medical_terms.{language}", terms)
+
     def _parse_input(self, payload):
         """Parse and validate input payload"""
         transcript = ""
@@ -322,28 +337,16 @@ class AskAuraAgentWrapper:
 
     def _extract_keywords(self, text, language):
         """Extract relevant medical keywords from text"""
-        text_lower = text.lower()
-        keywords = []
+        analysis = TranscriptAnalysis(text)
         
         # Check for medical contexts
-        for keyword, context_info in self.medical_contexts.items():
-            if keyword in text_lower:
-                keywords.append(keyword)
+        keywords = analysis.vocabulary("ask_aura.medical_contexts")
         
         # Additional medical term detection
-        medical_terms = {
-            "fr": ["cardiaque", "respiratoire", "neurologique", "gastro", "urinaire", 
-                  "infectieux", "traumatique", "métabolique", "psychiatrique"],
-            "en": ["cardiac", "respiratory", "neurological", "gastro", "urinary",
-                  "infectious", "traumatic", "metabolic", "psychiatric"]
-        }
-        
-        lang_terms = medical_terms.get(language, medical_terms["fr"])
-        for term in lang_terms:
-            if term in text_lower:
-                keywords.append(term)
+        terms_language = language if language in self.medical_terms else "fr"
+        keywords.extend(analysis.vocabulary(f"ask_aura.medical_terms.{terms_language}"))
         
-        return list(set(keywords))  # Remove duplicates
+        return list(dict.fromkeys(keywords))  # Remove duplicates, keep vocabulary order
 
     def _generate_structured_response(self, question, transcript, context, keywords, language):
         """Generate a structured medical response"""
@@ -519,10 +522,10 @@ class AskAuraAgentWrapper:
         try:
             transcript, question, context, language = self._parse_input(payload)
 
-            # Extract persona from payload if provided
-            if isinstance(payload, dict):
+            # Persona from the payload applies to this call only (the agent is shared across requests)
+            persona_key = self.persona_key
+            if isinstance(payload, dict) and payload.get("persona", "generalist") in PERSONAS:
                 persona_key = payload.get("persona", "generalist")
-                self.set_persona(persona_key)
 
             # Validate input
             if not transcript and not question:
@@ -575,7 +578,7 @@ class AskAuraAgentWrapper:
                 confidence = "low"
 
             # Get persona info
-            persona = PERSONAS.get(self.persona_key, PERSONAS["generalist"])
+            persona = PERSONAS.get(persona_key, PERSONAS["generalist"])
             persona_name = persona["name"] if language == "fr" else persona["name_en"]
 
             return {
@@ -590,7 +593,7 @@ class AskAuraAgentWrapper:
                 "contexts_detected": contexts_found,
                 "confidence": confidence,
                 "persona": {
-                    "key": self.persona_key,
+                    "key": persona_key,
                     "name": persona_name,
                     "expertise": persona.get("expertise", [])
                 },
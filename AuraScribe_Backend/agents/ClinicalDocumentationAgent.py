@@ -2,6 +2,9 @@
 # With persona support and improved medical reasoning
 
 import re
+
+from agents.keyword_matcher import register_vocabulary
+from agents.transcript_analysis import get_analysis
 # --- PERSONA SUPPORT ---
 # Copy this into every agent
 PERSONAS = {
@@ -32,6 +35,7 @@ def apply_persona(persona_key="generalist"):
     persona = PERSONAS.get(persona_key, PERSONAS["generalist"])
     return f"\n[Perspective: {persona['name']} - {persona['focus']}]\n"
 from datetime import datetime
+from types import SimpleNamespace
 
 class ClinicalDocumentationAgentWrapper:
     def __init__(self, name="ClinicalDocumentationAgent"):
@@ -39,6 +43,17 @@ class ClinicalDocumentationAgentWrapper:
         self.medical_knowledge = self._load_medical_knowledge()
         self.symptom_patterns = self._load_symptom_patterns()
         self.persona = None
+        # Read-only persona views, built once and shared by every request
+        self._personas = {
+            key: SimpleNamespace(
+                persona_key=key,
+                persona_data=data,
+                specialty_terms={'diagnostic_focus': data.get('focus', '').split()}
+            )
+            for key, data in PERSONAS.items()
+        }
+        for system, data in self.medical_knowledge.items():
+            register_vocabulary(f"clinical_documentation.symptoms.{system}", data["symptoms"])
         
     def _load_medical_knowledge(self):
         """Load medical knowledge base"""
@@ -83,32 +98,32 @@ class ClinicalDocumentationAgentWrapper:
         """Set the medical persona for this agent"""
         self.persona = persona
     
-    def _extract_symptoms(self, text):
-        """Extract and categorize symptoms from text"""
-        text_lower = text.lower()
+    def _extract_symptoms(self, analysis):
+        """Extract and categorize symptoms from the shared transcript analysis"""
         symptoms = []
         
         # Extract by system
-        for system, data in self.medical_knowledge.items():
-            for symptom in data["symptoms"]:
-                if symptom in text_lower:
-                    symptoms.append({
-                        "symptom": symptom,
-                        "system": system,
-                        "description": f"{symptom} mentioned"
-                    })
-        
-        # Extract severity and timing
-        for symptom in symptoms:
-            symptom_text = text_lower
-            # Look for patterns
+        for system in self.medical_knowledge:
+            for symptom in analysis.vocabulary(f"clinical_documentation.symptoms.{system}"):
+                symptoms.append({
+                    "symptom": symptom,
+                    "system": system,
+                    "description": f"{symptom} mentioned"
+                })
+        
+        # Extract severity and timing (patterns apply to the whole transcript, so search once)
+        if symptoms:
+            matched_pattern = None
             for pattern_name, pattern in self.symptom_patterns.items():
-                if pattern.search(symptom_text):
-                    symptom["pattern"] = pattern_name
+                if analysis.search(pattern, "lower"):
+                    matched_pattern = pattern_name
+            if matched_pattern:
+                for symptom in symptoms:
+                    symptom["pattern"] = matched_pattern
         
         return symptoms
     
-    def _generate_system_specific_assessment(self, system, symptoms):
+    def _generate_system_specific_assessment(self, system, symptoms, persona=None):
         """Generate assessment based on specific system"""
         if system not in self.medical_knowledge:
             return ""
@@ -118,11 +133,11 @@ class ClinicalDocumentationAgentWrapper:
         assessment.append(f"{system.capitalize()} considerations:")
         assessment.append(f"  - Symptoms: {', '.join([s['symptom'] for s in symptoms if s['system'] == system])}")
         
-        if self.persona and hasattr(self.persona, 'persona_key'):
+        if persona and hasattr(persona, 'persona_key'):
             # Add persona-specific considerations
-            persona_focus = self.persona.specialty_terms.get('diagnostic_focus', [])
+            persona_focus = persona.specialty_terms.get('diagnostic_focus', [])
             if persona_focus:
-                assessment.append(f"  - {self.persona.persona_data['name']} focus: {', '.join(persona_focus[:2])}")
+                assessment.append(f"  - {persona.persona_data['name']} focus: {', '.join(persona_focus[:2])}")
         
         assessment.append(f"  - Recommended assessments: {', '.join(knowledge['assessments'][:3])}")
         
@@ -138,18 +153,14 @@ class ClinicalDocumentationAgentWrapper:
             transcript_text = payload.get("transcript", "")
             persona_key = payload.get("persona", "generalist")
             persona_data = payload.get("persona_summary", {})
-            # Set persona if key provided
-            if persona_key in PERSONAS:
-                self.persona = type('Persona', (), {
-                    'persona_key': persona_key,
-                    'persona_data': PERSONAS[persona_key],
-                    'specialty_terms': {'diagnostic_focus': PERSONAS[persona_key].get('focus', '').split()}
-                })()
         else:
             transcript_text = payload
             persona_data = {}
             persona_key = "generalist"
 
+        # Resolved per call (never stored on the shared agent) so concurrent requests don't race
+        persona = self._personas.get(persona_key, self.persona) if isinstance(payload, dict) else self.persona
+
         if not transcript_text or len(transcript_text.strip()) < 20:
             return {
                 "soap_note": {
@@ -168,20 +179,21 @@ class ClinicalDocumentationAgentWrapper:
             }
         
         # Extract symptoms and systems
-        symptoms = self._extract_symptoms(transcript_text)
-        systems_involved = list(set([s["system"] for s in symptoms]))
+        symptoms = self._extract_symptoms(get_analysis(payload))
+        # dict.fromkeys: de-duplicate in a stable order (set order varies between processes)
+        systems_involved = list(dict.fromkeys(s["system"] for s in symptoms))
         
         # Generate Subjective
-        subjective = self._generate_subjective(transcript_text, symptoms)
+        subjective = self._generate_subjective(transcript_text, symptoms, persona)
         
         # Generate Objective
-        objective = self._generate_objective(symptoms, systems_involved)
+        objective = self._generate_objective(symptoms, systems_involved, persona)
         
         # Generate Assessment
-        assessment = self._generate_assessment(symptoms, systems_involved, transcript_text)
+        assessment = self._generate_assessment(symptoms, systems_involved, transcript_text, persona)
         
         # Generate Plan
-        plan = self._generate_plan(symptoms, systems_involved, transcript_text)
+        plan = self._generate_plan(symptoms, systems_involved, transcript_text, persona)
         
         # Generate patient explanation
         patient_explanation = self._generate_patient_explanation(symptoms, transcript_text)
@@ -206,7 +218,7 @@ class ClinicalDocumentationAgentWrapper:
             "symptoms_detected": [s["symptom"] for s in symptoms],
             "symptom_count": len(symptoms),
             "confidence": confidence,
-            "clinical_reasoning": self._generate_clinical_reasoning(symptoms, transcript_text),
+            "clinical_reasoning": self._generate_clinical_reasoning(symptoms, transcript_text, persona),
             "formatted_content": self._format_soap_as_text({
                 "subjective": subjective,
                 "objective": objective,
@@ -216,7 +228,7 @@ class ClinicalDocumentationAgentWrapper:
             "persona_used": persona_key if 'persona_key' in dir() else "generalist"
         }
     
-    def _generate_subjective(self, transcript, symptoms):
+    def _generate_subjective(self, transcript, symptoms, persona=None):
         """Generate subjective section"""
         parts = []
         
@@ -232,13 +244,13 @@ class ClinicalDocumentationAgentWrapper:
                     desc += f" [{symptom['pattern']}]"
                 parts.append(desc)
         
-        if self.persona and hasattr(self.persona, 'persona_data'):
-            parts.append(f"\n  Perspective: {self.persona.persona_data['name']}")
-            parts.append(f"  Approach: {self.persona.persona_data['approach']}")
+        if persona and hasattr(persona, 'persona_data'):
+            parts.append(f"\n  Perspective: {persona.persona_data['name']}")
+            parts.append(f"  Approach: {persona.persona_data['approach']}")
         
         return '\n'.join(parts)
     
-    def _generate_objective(self, symptoms, systems):
+    def _generate_objective(self, symptoms, systems, persona=None):
         """Generate objective section"""
         parts = []
         
@@ -252,10 +264,10 @@ class ClinicalDocumentationAgentWrapper:
                     parts.append(f"    - {exam}")
         
         # Add persona-specific exams if available
-        if self.persona and hasattr(self.persona, 'specialty_terms'):
-            focus = self.persona.specialty_terms.get('diagnostic_focus', [])
+        if persona and hasattr(persona, 'specialty_terms'):
+            focus = persona.specialty_terms.get('diagnostic_focus', [])
             if focus:
-                parts.append(f"\n  {self.persona.persona_data['name'].upper()} FOCUS:")
+                parts.append(f"\n  {persona.persona_data['name'].upper()} FOCUS:")
                 for item in focus[:2]:
                     parts.append(f"    - {item}")
         
@@ -264,7 +276,7 @@ class ClinicalDocumentationAgentWrapper:
         
         return '\n'.join(parts)
     
-    def _generate_assessment(self, symptoms, systems, transcript):
+    def _generate_assessment(self, symptoms, systems, transcript, persona=None):
         """Generate assessment section"""
         parts = []
         
@@ -275,7 +287,7 @@ class ClinicalDocumentationAgentWrapper:
             system_symptoms = [s for s in symptoms if s["system"] == system]
             if system_symptoms:
                 parts.append(f"\n  {system.upper()}:")
-                parts.append(self._generate_system_specific_assessment(system, system_symptoms))
+                parts.append(self._generate_system_specific_assessment(system, system_symptoms, persona))
         
         # Overall impression
         if symptoms:
@@ -284,15 +296,15 @@ class ClinicalDocumentationAgentWrapper:
             parts.append("    Further clinical correlation needed.")
         
         # Persona-specific assessment
-        if self.persona and hasattr(self.persona, 'adapt_assessment'):
-            parts.append(self.persona.adapt_assessment(transcript, ""))
-        elif self.persona and hasattr(self.persona, 'persona_data'):
-            parts.append(f"\n  {self.persona.persona_data['name'].upper()} PERSPECTIVE:")
-            parts.append(f"    Consider {self.persona.persona_data['approach']}")
+        if persona and hasattr(persona, 'adapt_assessment'):
+            parts.append(persona.adapt_assessment(transcript, ""))
+        elif persona and hasattr(persona, 'persona_data'):
+            parts.append(f"\n  {persona.persona_data['name'].upper()} PERSPECTIVE:")
+            parts.append(f"    Consider {persona.persona_data['approach']}")
         
         return '\n'.join(parts)
     
-    def _generate_plan(self, symptoms, systems, transcript):
+    def _generate_plan(self, symptoms, systems, transcript, persona=None):
         """Generate plan section"""
         parts = []
         
@@ -313,11 +325,11 @@ class ClinicalDocumentationAgentWrapper:
         parts.append("    - Document in medical record")
         
         # Persona-specific plan
-        if self.persona and hasattr(self.persona, 'adapt_plan'):
-            parts.append("\n" + self.persona.adapt_plan(transcript, ""))
-        elif self.persona and hasattr(self.persona, 'persona_data'):
-            parts.append(f"\n  {self.persona.persona_data['name'].upper()} RECOMMENDATIONS:")
-            parts.append(f"    Follow {self.persona.persona_data['approach']}")
+        if persona and hasattr(persona, 'adapt_plan'):
+            parts.append("\n" + persona.adapt_plan(transcript, ""))
+        elif persona and hasattr(persona, 'persona_data'):
+            parts.append(f"\n  {persona.persona_data['name'].upper()} RECOMMENDATIONS:")
+            parts.append(f"    Follow {persona.persona_data['approach']}")
         
         return '\n'.join(parts)
     
@@ -327,7 +339,7 @@ class ClinicalDocumentationAgentWrapper:
         
         # Summary
         if symptoms:
-            symptom_list = ', '.join(set([s['symptom'] for s in symptoms]))
+            symptom_list = ', '.join(dict.fromkeys(s['symptom'] for s in symptoms))
             explanation['summary'] = f"During your consultation, we discussed: {symptom_list}."
         else:
             explanation['summary'] = "Thank you for your consultation. We've documented your visit."
@@ -355,7 +367,7 @@ class ClinicalDocumentationAgentWrapper:
         
         return explanation
     
-    def _generate_clinical_reasoning(self, symptoms, transcript):
+    def _generate_clinical_reasoning(self, symptoms, transcript, persona=None):
         """Generate clinical reasoning narrative"""
         reasoning = []
         
@@ -367,9 +379,9 @@ class ClinicalDocumentationAgentWrapper:
             reasoning.append("2. Symptoms suggest involvement of multiple physiological systems.")
             reasoning.append("3. Differential diagnosis should consider common conditions first.")
         
-        if self.persona and hasattr(self.persona, 'persona_data'):
-            approach = self.persona.persona_data.get('approach', self.persona.persona_data.get('focus', 'comprehensive care'))
-            reasoning.append(f"4. From {self.persona.persona_data['name']} perspective: Focus on {approach}")
+        if persona and hasattr(persona, 'persona_data'):
+            approach = persona.persona_data.get('approach', persona.persona_data.get('focus', 'comprehensive care'))
+            reasoning.append(f"4. From {persona.persona_data['name']} perspective: Focus on {approach}")
         
         return '\n'.join(reasoning)
     
@@ -1,5 +1,8 @@
 # ComplianceMonitorAgent - Checks documentation for compliance
 # WITH PERSONA SUPPORT
+from agents.keyword_matcher import register_vocabulary
+from agents.transcript_analysis import get_analysis
+
 # --- PERSONA SUPPORT ---
 PERSONAS = {
     "generalist": {
@@ -52,6 +55,25 @@ class ComplianceMonitorAgentWrapper:
             "generalist": ["No vital signs", "No problem list", "No follow-up plan"]
         }
 
+        # Basic documentation checks: (keyword, warning when missing)
+        self.basic_checks = [
+            ("consent", "No consent documented"),
+            ("agree", "No agreement documented"),
+            ("patient", "Patient identification incomplete"),
+            ("history", "History documentation incomplete"),
+            ("exam", "Exam findings not detailed"),
+            ("plan", "Treatment plan unclear")
+        ]
+        self.good_practices = ["follow-up", "education", "discussed", "explained", "informed"]
+
+        register_vocabulary("compliance.basic_checks", [keyword for keyword, _ in self.basic_checks])
+        register_vocabulary("compliance.good_practices", self.good_practices)
+        for persona_key, requirements in self.persona_requirements.items():
+            register_vocabulary(f"compliance.must_have.{persona_key}", requirements["must_have"])
+        for persona_key, flags in self.red_flags.items():
+            register_vocabulary(f"compliance.red_flags.{persona_key}",
+                                [word for flag in flags for word in flag.lower().split()[:2]])
+
     def run(self, payload):
         """
         Check documentation compliance.
@@ -72,7 +94,7 @@ class ComplianceMonitorAgentWrapper:
                 "persona_used": persona_key
             }
 
-        transcript_lower = transcript_text.lower()
+        analysis = get_analysis(payload)
         issues = []
         warnings = []
         passed_checks = []
@@ -81,36 +103,37 @@ class ComplianceMonitorAgentWrapper:
         requirements = self.persona_requirements.get(persona_key, self.persona_requirements["generalist"])
         specialty_red_flags = self.red_flags.get(persona_key, [])
         
+        # SOAP note from ClinicalDocumentationAgent, when the orchestrator ran it first
+        upstream = payload.get("upstream", {}) if isinstance(payload, dict) else {}
+        soap_note = (upstream.get("ClinicalDocumentationAgent") or {}).get("soap_note", {})
+        if soap_note:
+            missing_sections = [section for section in ("subjective", "objective", "assessment", "plan")
+                                if not soap_note.get(section)]
+            if missing_sections:
+                warnings.append(f"SOAP note incomplete: {', '.join(missing_sections)}")
+            else:
+                passed_checks.append("SOAP note complete")
+
         # Check basic requirements
-        basic_checks = [
-            ("consent", "No consent documented"),
-            ("agree", "No agreement documented"),
-            ("patient", "Patient identification incomplete"),
-            ("history", "History documentation incomplete"),
-            ("exam", "Exam findings not detailed"),
-            ("plan", "Treatment plan unclear")
-        ]
-        
-        for keyword, warning in basic_checks:
-            if keyword not in transcript_lower:
+        for keyword, warning in self.basic_checks:
+            if not analysis.contains(keyword):
                 warnings.append(warning)
             else:
                 passed_checks.append(f"Has {keyword}")
         
         # Check persona-specific requirements
         for requirement in requirements["must_have"]:
-            if requirement.lower() not in transcript_lower:
+            if not analysis.contains(requirement):
                 issues.append(f"Missing: {requirement}")
         
         # Check for red flags
         for red_flag in specialty_red_flags:
             flag_keywords = red_flag.lower().split()
-            if all(keyword in transcript_lower for keyword in flag_keywords[:2]):
+            if analysis.contains_all(flag_keywords[:2]):
                 issues.append(f"Red flag: {red_flag}")
         
         # Check for positive findings
-        good_practices = ["follow-up", "education", "discussed", "explained", "informed"]
-        positives = [word for word in good_practices if word in transcript_lower]
+        positives = analysis.vocabulary("compliance.good_practices")
         
         # Add specialty-specific notes
         specialty_notes = []
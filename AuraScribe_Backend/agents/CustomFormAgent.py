@@ -1,5 +1,8 @@
 # CustomFormAgent - Generates custom medical forms
 # WITH PERSONA SUPPORT
+from agents.keyword_matcher import register_vocabulary
+from agents.transcript_analysis import get_analysis
+
 # --- PERSONA SUPPORT ---
 PERSONAS = {
     "generalist": {
@@ -64,6 +67,10 @@ class CustomFormAgentWrapper:
             "insurance": ["insurance", "assurance", "claim", "reclamation"],
             "disability": ["disability", "invalidite", "incapacity", "handicap"]
         }
+        self.referral_keywords = ['referral', 'specialiste', 'specialist', 'reference', 'consultation']
+        for form_type, keywords in self.form_triggers.items():
+            register_vocabulary(f"custom_form.{form_type}", keywords)
+        register_vocabulary("custom_form.referral", self.referral_keywords)
 
     def run(self, payload):
         """
@@ -85,15 +92,15 @@ class CustomFormAgentWrapper:
                 "persona_used": persona_key
             }
 
-        transcript_lower = transcript_text.lower()
+        analysis = get_analysis(payload)
         forms = []
         
         # Get persona-specific forms
         persona_form_templates = self.persona_forms.get(persona_key, self.persona_forms["generalist"])
         
         # Check for form triggers
-        for form_type, keywords in self.form_triggers.items():
-            if any(keyword in transcript_lower for keyword in keywords):
+        for form_type in self.form_triggers:
+            if analysis.vocabulary(f"custom_form.{form_type}"):
                 # Find appropriate form for this persona
                 form_description = ""
                 if form_type == "work":
@@ -115,8 +122,7 @@ class CustomFormAgentWrapper:
                 })
         
         # Check for referral needs (common across specialties)
-        referral_keywords = ['referral', 'specialiste', 'specialist', 'reference', 'consultation']
-        if any(word in transcript_lower for word in referral_keywords):
+        if analysis.vocabulary("custom_form.referral"):
             forms.append({
                 "type": "referral_form",
                 "status": "template_ready",
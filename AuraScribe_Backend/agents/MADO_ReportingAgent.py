@@ -8,6 +8,9 @@ from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 import uuid
 
+from agents.keyword_matcher import register_vocabulary
+from agents.transcript_analysis import TranscriptAnalysis, get_analysis
+
 # Load MADO configuration from environment
 MADO_CONFIG = {
     "form_url": os.getenv("MADO_FORM_URL", "https://www.msss.gouv.qc.ca/professionnels/maladies-a-declaration-obligatoire/mado/declarer-une-mado/"),
@@ -15,6 +18,12 @@ MADO_CONFIG = {
     "form_number": os.getenv("MADO_AS770_FORM", "AS-770_DT9070")
 }
 
+# Patient identifiers read from the transcript (case-insensitive; RAMQ and postal codes are upper-cased)
+RAMQ_NUMBER_PATTERN = re.compile(r'[A-Z]{4}\s?\d{8}', re.IGNORECASE)
+POSTAL_CODE_PATTERN = re.compile(r'[A-Z]\d[A-Z]\s?\d[A-Z]\d', re.IGNORECASE)
+PHONE_PATTERN = re.compile(r'\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}')
+DOB_PATTERN = re.compile(r'\b(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})\b')
+
 # --- PERSONA SUPPORT ---
 PERSONAS = {
     "generalist": {
@@ -107,6 +116,11 @@ class MADOReportingAgentWrapper:
             "méningite": ["méningocoque", "haemophilus", "pneumocoque"]
         }
         
+        register_vocabulary("mado.urgent_diseases", self.urgent_diseases)
+        register_vocabulary("mado.diseases_48h", self.diseases_48h)
+        register_vocabulary("mado.related_keywords",
+                            [keyword for pattern in self.related_keywords for keyword in pattern.split(' + ')])
+
         # Regional DSP contacts (you can expand this from your mado.env)
         self.regional_contacts = {
             "montreal": {"phone": "514-528-2400", "region": "Montréal"},
@@ -133,7 +147,7 @@ class MADOReportingAgentWrapper:
         else:
             return "montreal"  # Default
     
-    def _extract_patient_info(self, transcript: str) -> Dict:
+    def _extract_patient_info(self, analysis: TranscriptAnalysis) -> Dict:
         """Extract patient information from transcript"""
         info = {
             "full_name": "",
@@ -145,64 +159,60 @@ class MADOReportingAgentWrapper:
         }
         
         # Look for RAMQ format: 4 letters, 8 numbers
-        ramq_pattern = r'[A-Z]{4}\s?\d{8}'
-        ramq_match = re.search(ramq_pattern, transcript.upper())
+        ramq_match = analysis.search(RAMQ_NUMBER_PATTERN)
         if ramq_match:
-            info["ramq"] = ramq_match.group(0)
+            info["ramq"] = ramq_match.group(0).upper()
         
         # Look for postal code: A1A 1A1 format
-        postal_pattern = r'[A-Z]\d[A-Z]\s?\d[A-Z]\d'
-        postal_match = re.search(postal_pattern, transcript.upper())
+        postal_match = analysis.search(POSTAL_CODE_PATTERN)
         if postal_match:
-            info["postal_code"] = postal_match.group(0)
+            info["postal_code"] = postal_match.group(0).upper()
         
         # Look for phone numbers
-        phone_pattern = r'\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}'
-        phone_match = re.search(phone_pattern, transcript)
+        phone_match = analysis.search(PHONE_PATTERN)
         if phone_match:
             info["phone"] = phone_match.group(0)
         
         # Look for date of birth
-        dob_pattern = r'\b(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})\b'
-        dob_match = re.search(dob_pattern, transcript)
+        dob_match = analysis.search(DOB_PATTERN)
         if dob_match:
             info["dob"] = dob_match.group(1)
         
         return info
     
-    def _detect_disease_mentions(self, transcript_lower: str) -> List[Dict]:
+    def _detect_disease_mentions(self, analysis: TranscriptAnalysis) -> List[Dict]:
         """Detect all MADO disease mentions in transcript"""
         detected = []
         
         # Check urgent diseases
-        for keyword, disease_info in self.urgent_diseases.items():
-            if keyword in transcript_lower:
-                detected.append({
-                    "name_fr": disease_info["fr"],
-                    "name_en": disease_info["en"],
-                    "category": "URGENT",
-                    "timeframe": disease_info["timeframe"],
-                    "action": "APPELER IMMÉDIATEMENT DSP + DSP National",
-                    "confidence": "high"
-                })
+        for keyword in analysis.vocabulary("mado.urgent_diseases"):
+            disease_info = self.urgent_diseases[keyword]
+            detected.append({
+                "name_fr": disease_info["fr"],
+                "name_en": disease_info["en"],
+                "category": "URGENT",
+                "timeframe": disease_info["timeframe"],
+                "action": "APPELER IMMÉDIATEMENT DSP + DSP National",
+                "confidence": "high"
+            })
         
         # Check 48-hour diseases
-        for keyword, disease_info in self.diseases_48h.items():
-            if keyword in transcript_lower:
-                detected.append({
-                    "name_fr": disease_info["fr"],
-                    "name_en": disease_info["en"],
-                    "category": disease_info["category"],
-                    "timeframe": "48 heures",
-                    "action": "Compléter formulaire AS-770",
-                    "confidence": "high",
-                    "relevant_specialties": disease_info["specialties"]
-                })
+        for keyword in analysis.vocabulary("mado.diseases_48h"):
+            disease_info = self.diseases_48h[keyword]
+            detected.append({
+                "name_fr": disease_info["fr"],
+                "name_en": disease_info["en"],
+                "category": disease_info["category"],
+                "timeframe": "48 heures",
+                "action": "Compléter formulaire AS-770",
+                "confidence": "high",
+                "relevant_specialties": disease_info["specialties"]
+            })
         
         # Check related keyword combinations
         for pattern, diseases in self.related_keywords.items():
             keywords = pattern.split(' + ')
-            if all(keyword in transcript_lower for keyword in keywords):
+            if analysis.contains_all(keywords):
                 for disease in diseases:
                     if disease in self.diseases_48h:
                         disease_info = self.diseases_48h[disease]
@@ -361,15 +371,15 @@ class MADOReportingAgentWrapper:
                 "persona_used": persona_key
             }
         
-        transcript_lower = transcript_text.lower()
+        analysis = get_analysis(payload)
         
         # Extract patient info from transcript and context
-        extracted_info = self._extract_patient_info(transcript_text)
+        extracted_info = self._extract_patient_info(analysis)
         # Merge with provided context
         patient_info = {**extracted_info, **patient_context}
         
         # Detect diseases
-        detected_diseases = self._detect_disease_mentions(transcript_lower)
+        detected_diseases = self._detect_disease_mentions(analysis)
         
         if not detected_diseases:
             return {
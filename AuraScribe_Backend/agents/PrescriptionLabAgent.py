@@ -1,5 +1,8 @@
 # PrescriptionLabAgent - Manages medication prescriptions and lab orders
 # WITH PERSONA SUPPORT
+from agents.keyword_matcher import register_vocabulary
+from agents.transcript_analysis import get_analysis
+
 # --- PERSONA SUPPORT ---
 PERSONAS = {
     "generalist": {
@@ -45,6 +48,12 @@ class PrescriptionLabAgentWrapper:
             "generalist": ["Basic blood work", "Urine test", "Basic imaging", "Screening tests"]
         }
 
+        # Transcript keywords that trigger a prescription / lab suggestion
+        self.medication_keywords = ['medication', 'medicament', 'prescription', 'drug', 'pill', 'tablet', 'injection', 'dose']
+        self.lab_keywords = ['lab', 'test', 'blood', 'analyse', 'examination', 'scan', 'x-ray', 'imaging']
+        register_vocabulary("prescription_lab.medications", self.medication_keywords)
+        register_vocabulary("prescription_lab.labs", self.lab_keywords)
+
     def run(self, payload):
         """
         Generate prescription and lab order suggestions.
@@ -67,7 +76,7 @@ class PrescriptionLabAgentWrapper:
                 "persona_used": persona_key
             }
 
-        transcript_lower = transcript_text.lower()
+        analysis = get_analysis(payload)
         
         # Apply persona
         persona_meds = self.persona_medications.get(persona_key, self.persona_medications["generalist"])
@@ -75,9 +84,8 @@ class PrescriptionLabAgentWrapper:
         
         # Check for medication needs
         prescription = None
-        medication_keywords = ['medication', 'medicament', 'prescription', 'drug', 'pill', 'tablet', 'injection', 'dose']
         
-        if any(word in transcript_lower for word in medication_keywords):
+        if analysis.vocabulary("prescription_lab.medications"):
             prescription = {
                 "status": "Suggested by " + PERSONAS.get(persona_key, PERSONAS["generalist"])["name"],
                 "persona_specific_suggestions": persona_meds[:3],  # Top 3 for this specialty
@@ -88,9 +96,8 @@ class PrescriptionLabAgentWrapper:
 
         # Check for lab needs
         lab_order = None
-        lab_keywords = ['lab', 'test', 'blood', 'analyse', 'examination', 'scan', 'x-ray', 'imaging']
         
-        if any(word in transcript_lower for word in lab_keywords):
+        if analysis.vocabulary("prescription_lab.labs"):
             lab_order = {
                 "status": "Suggested by " + PERSONAS.get(persona_key, PERSONAS["generalist"])["name"],
                 "persona_specific_tests": persona_labs[:3],  # Top 3 for this specialty
@@ -1,5 +1,8 @@
 # RAMQ_BillingAgent - Suggests billing codes for Quebec health insurance
 # WITH PERSONA SUPPORT
+from agents.keyword_matcher import register_vocabulary
+from agents.transcript_analysis import get_analysis
+
 # --- PERSONA SUPPORT ---
 PERSONAS = {
     "generalist": {
@@ -48,6 +51,16 @@ class RAMQBillingAgentWrapper:
             }
         }
         
+        # Transcript keywords that suggest additional codes
+        self.code_triggers = {
+            "extended_consult": ['long', 'extended', 'complicated', 'multiple issues', 'detailed'],
+            "emergency": ['emergency', 'urgent', 'acute', 'severe', 'critical'],
+            "ecg_interpretation": ['ecg', 'electrocardiogram'],
+            "lung_function": ['test', 'function']
+        }
+        for code_key, keywords in self.code_triggers.items():
+            register_vocabulary(f"ramq_billing.{code_key}", keywords)
+
         # Persona-specific billing advice
         self.persona_advice = {
             "generalist": "As family doctor, bill for time spent and complexity. Document well.",
@@ -75,7 +88,7 @@ class RAMQBillingAgentWrapper:
                 "persona_used": persona_key
             }
 
-        transcript_lower = transcript_text.lower()
+        analysis = get_analysis(payload)
         suggested_codes = []
         
         # Get codes for this persona
@@ -90,8 +103,7 @@ class RAMQBillingAgentWrapper:
         })
         
         # Check for extended time
-        time_keywords = ['long', 'extended', 'complicated', 'multiple issues', 'detailed']
-        if any(word in transcript_lower for word in time_keywords) and "extended_consult" in persona_codes:
+        if analysis.vocabulary("ramq_billing.extended_consult") and "extended_consult" in persona_codes:
             suggested_codes.append({
                 **persona_codes["extended_consult"],
                 "confidence": "MEDIUM",
@@ -99,8 +111,7 @@ class RAMQBillingAgentWrapper:
             })
         
         # Check for emergency
-        emergency_keywords = ['emergency', 'urgent', 'acute', 'severe', 'critical']
-        if any(word in transcript_lower for word in emergency_keywords) and "emergency" in persona_codes:
+        if analysis.vocabulary("ramq_billing.emergency") and "emergency" in persona_codes:
             suggested_codes.append({
                 **persona_codes["emergency"],
                 "confidence": "MEDIUM", 
@@ -109,7 +120,7 @@ class RAMQBillingAgentWrapper:
         
         # Check for procedures
         if persona_key == "cardiologist":
-            if 'ecg' in transcript_lower or 'electrocardiogram' in transcript_lower:
+            if analysis.vocabulary("ramq_billing.ecg_interpretation"):
                 suggested_codes.append({
                     **persona_codes["ecg_interpretation"],
                     "confidence": "HIGH",
@@ -117,15 +128,20 @@ class RAMQBillingAgentWrapper:
                 })
         
         elif persona_key == "pulmonologist":
-            if 'lung' in transcript_lower and ('test' in transcript_lower or 'function' in transcript_lower):
+            if analysis.contains('lung') and analysis.vocabulary("ramq_billing.lung_function"):
                 suggested_codes.append({
                     **persona_codes["lung_function"],
                     "confidence": "MEDIUM",
                     "reason": "Lung function testing discussed"
                 })
 
+        # Systems documented in the SOAP note support the complexity billed
+        upstream = payload.get("upstream", {}) if isinstance(payload, dict) else {}
+        documented_systems = (upstream.get("ClinicalDocumentationAgent") or {}).get("systems_involved", [])
+
         return {
             "suggested_codes": suggested_codes,
+            "documented_systems": documented_systems,
             "total_estimate": f"${sum(int(c['fee'].replace('$', '')) for c in suggested_codes)}",
             "persona_used": persona_key,
             "specialty": PERSONAS.get(persona_key, PERSONAS["generalist"])["name"],
@@ -1,5 +1,8 @@
 # TaskManagerAgent - Manages follow-up tasks and reminders
 # WITH PERSONA SUPPORT
+from agents.keyword_matcher import register_vocabulary
+from agents.transcript_analysis import get_analysis
+
 # --- PERSONA SUPPORT ---
 # --- PERSONA SUPPORT ---
 PERSONAS = {
@@ -64,6 +67,17 @@ class TaskManagerAgentWrapper:
             "generalist": {"fever": "URGENT", "follow-up": "ROUTINE", "preventive": "SCHEDULED"}
         }
 
+        # Transcript keywords that create tasks / reminders
+        self.task_keywords = {
+            "follow_up": ['follow-up', 'revoir', 'return', 'suivi', 'appointment', 'rendez-vous'],
+            "results_review": ['test', 'result', 'lab', 'analyse', 'scan', 'x-ray'],
+            "medication_review": ['medication', 'medicament', 'pill', 'dose', 'prescription']
+        }
+        for task_type, keywords in self.task_keywords.items():
+            register_vocabulary(f"task_manager.{task_type}", keywords)
+        for persona_key, rules in self.urgency_levels.items():
+            register_vocabulary(f"task_manager.urgency.{persona_key}", rules)
+
     def run(self, payload):
         """
         Extract and manage follow-up tasks.
@@ -85,7 +99,7 @@ class TaskManagerAgentWrapper:
                 "persona_used": persona_key
             }
 
-        transcript_lower = transcript_text.lower()
+        analysis = get_analysis(payload)
         tasks = []
         reminders = []
         
@@ -93,8 +107,7 @@ class TaskManagerAgentWrapper:
         persona_task_templates = self.persona_tasks.get(persona_key, self.persona_tasks["generalist"])
         
         # Check for follow-up mentions
-        follow_keywords = ['follow-up', 'revoir', 'return', 'suivi', 'appointment', 'rendez-vous']
-        if any(word in transcript_lower for word in follow_keywords):
+        if analysis.vocabulary("task_manager.follow_up"):
             tasks.append({
                 "type": "follow_up",
                 "description": persona_task_templates[0],  # First task for this specialty
@@ -104,8 +117,7 @@ class TaskManagerAgentWrapper:
             })
         
         # Check for test results
-        test_keywords = ['test', 'result', 'lab', 'analyse', 'scan', 'x-ray']
-        if any(word in transcript_lower for word in test_keywords):
+        if analysis.vocabulary("task_manager.results_review"):
             reminders.append({
                 "type": "results_review",
                 "description": persona_task_templates[1],  # Second task for this specialty
@@ -115,8 +127,7 @@ class TaskManagerAgentWrapper:
             })
         
         # Check for medication management
-        med_keywords = ['medication', 'medicament', 'pill', 'dose', 'prescription']
-        if any(word in transcript_lower for word in med_keywords):
+        if analysis.vocabulary("task_manager.medication_review"):
             tasks.append({
                 "type": "medication_review",
                 "description": persona_task_templates[2] if len(persona_task_templates) > 2 else "Medication management",
@@ -127,16 +138,37 @@ class TaskManagerAgentWrapper:
         
         # Check for urgent issues
         urgency_rules = self.urgency_levels.get(persona_key, {})
-        for symptom, urgency in urgency_rules.items():
-            if symptom in transcript_lower:
-                tasks.append({
-                    "type": "urgent_follow",
-                    "description": f"Follow up on {symptom} ({urgency})",
-                    "priority": "high" if urgency == "URGENT" else "normal",
-                    "reason": f"{symptom} mentioned - {urgency} priority for {PERSONAS.get(persona_key, PERSONAS['generalist'])['name']}",
-                    "specialty_context": PERSONAS.get(persona_key, PERSONAS["generalist"])["focus"]
-                })
+        for symptom in analysis.vocabulary(f"task_manager.urgency.{persona_key}"):
+            urgency = urgency_rules[symptom]
+            tasks.append({
+                "type": "urgent_follow",
+                "description": f"Follow up on {symptom} ({urgency})",
+                "priority": "high" if urgency == "URGENT" else "normal",
+                "reason": f"{symptom} mentioned - {urgency} priority for {PERSONAS.get(persona_key, PERSONAS['generalist'])['name']}",
+                "specialty_context": PERSONAS.get(persona_key, PERSONAS["generalist"])["focus"]
+            })
         
+        # Follow-up on upstream agents' findings
+        upstream = payload.get("upstream", {}) if isinstance(payload, dict) else {}
+        mado = upstream.get("MADO_ReportingAgent") or {}
+        if mado.get("mado_detected"):
+            tasks.append({
+                "type": "mado_declaration",
+                "description": "Complete MADO declaration (AS-770) and notify the DSP",
+                "priority": "high",
+                "reason": "Reportable disease detected by MADO_ReportingAgent",
+                "specialty_context": PERSONAS.get(persona_key, PERSONAS["generalist"])["focus"]
+            })
+        prescription_lab = upstream.get("PrescriptionLabAgent") or {}
+        if prescription_lab.get("lab_order") and not any(r["type"] == "results_review" for r in reminders):
+            reminders.append({
+                "type": "results_review",
+                "description": persona_task_templates[1],
+                "priority": "normal",
+                "reason": "Lab orders suggested by PrescriptionLabAgent",
+                "specialty_context": PERSONAS.get(persona_key, PERSONAS["generalist"])["focus"]
+            })
+
         # Add generic reminders if none found
         if not reminders:
             reminders.append({
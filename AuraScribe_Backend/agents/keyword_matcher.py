@@ -0,0 +1,175 @@
+# KeywordAutomaton - compiled multi-pattern matcher over every agent vocabulary
+#
+# Agents register their keyword lists under a vocabulary id when they are
+# constructed (at import, via each module's root_agent). The first scan compiles
+# one Aho-Corasick automaton over all of them, so a transcript is matched
+# against every vocabulary in a single pass instead of one substring scan per
+# keyword per agent.
+
+import logging
+import re
+import threading
+import unicodedata
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def _build_fold_table() -> Dict[int, str]:
+    table = {}
+    for code in range(0xC0, 0x250):
+        base = ''.join(c for c in unicodedata.normalize('NFD', chr(code)) if not unicodedata.combining(c))
+        if len(base) == 1 and base != chr(code):
+            table[code] = base
+    return table
+
+
+# Accented Latin letters (Latin-1 + Extended-A/B) -> base letter, one character each
+_FOLD_TABLE = _build_fold_table()
+_ACCENTED_RE = re.compile('[' + ''.join(map(chr, sorted(_FOLD_TABLE))) + ']')
+
+
+def fold_text(text: str) -> str:
+    """Lowercase and strip accents, keeping one character per input character"""
+    lower = text.lower()
+    if len(lower) != len(text):
+        # Rare case-mappings that change length (e.g. 'İ'); keep offsets aligned
+        lower = ''.join(ch.lower()[0] for ch in text)
+    if lower.isascii():
+        return lower
+    # re.sub only touches accented characters; str.translate walks every character in Python
+    return _ACCENTED_RE.sub(lambda m: _FOLD_TABLE[ord(m.group())], lower)
+
+
+class KeywordMatch(NamedTuple):
+    term: str          # folded keyword
+    start: int
+    end: int
+    whole_word: bool   # not glued to a letter/digit on either side
+
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick automaton over the folded terms of several vocabularies.
+
+    ``scan(folded_text)`` returns every occurrence of every term (overlapping
+    and nested ones included) in one left-to-right pass over the text.
+    """
+
+    def __init__(self, vocabularies: Dict[str, Iterable[str]]):
+        self.vocabularies: Dict[str, Tuple[str, ...]] = {
+            vocab_id: tuple(terms) for vocab_id, terms in vocabularies.items()
+        }
+        self.terms: Dict[str, int] = {}
+        for terms in self.vocabularies.values():
+            for term in terms:
+                key = fold_text(term)
+                if key and key not in self.terms:
+                    self.terms[key] = len(self.terms)
+        self._term_list = list(self.terms)
+        self._build()
+
+    def _build(self):
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[Tuple[int, ...]] = [()]
+        for index, term in enumerate(self._term_list):
+            state = 0
+            for ch in term:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    outputs.append(())
+                state = nxt
+            outputs[state] = (index,)
+
+        # Breadth-first: failure links, then a full transition table so scanning never
+        # follows failure links (a missing entry means "back to the root")
+        fail = [0] * len(goto)
+        delta: List[Dict[str, int]] = [None] * len(goto)
+        delta[0] = dict(goto[0])
+        queue = list(goto[0].values())
+        for state in queue:
+            delta[state] = {**delta[fail[state]], **goto[state]}
+            if outputs[fail[state]]:
+                outputs[state] = outputs[state] + outputs[fail[state]]
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                fail[nxt] = delta[fail[state]].get(ch, 0)
+
+        self._delta = delta
+        self._outputs = outputs
+        self._lengths = [len(term) for term in self._term_list]
+
+    @property
+    def state_count(self) -> int:
+        return len(self._delta)
+
+    def has_term(self, folded_term: str) -> bool:
+        return folded_term in self.terms
+
+    def scan(self, folded_text: str) -> List[KeywordMatch]:
+        """All keyword occurrences in ``folded_text`` (already passed through fold_text)"""
+        hits, _ = self.advance(folded_text)
+        return self.matches(hits, folded_text)
+
+    def advance(self, folded_chunk: str, state: int = 0, offset: int = 0) -> Tuple[List[Tuple[int, int]], int]:
+        """
+        Feed one chunk of a longer text, starting from ``state`` (the value returned
+        for the previous chunk). Terms spanning chunk boundaries are found as usual.
+        Returns ``([(state, end_offset), ...], state)``; see ``matches``.
+        """
+        delta, outputs = self._delta, self._outputs
+        hits: List[Tuple[int, int]] = []
+        for i, ch in enumerate(folded_chunk, offset + 1):
+            state = delta[state].get(ch, 0)
+            if outputs[state]:
+                hits.append((state, i))
+        return hits, state
+
+    def matches(self, hits: List[Tuple[int, int]], folded_text: str) -> List[KeywordMatch]:
+        """Expand ``advance`` hits into matches; ``folded_text`` is the whole text so far"""
+        matches = []
+        text_len = len(folded_text)
+        for state, end in hits:
+            for index in self._outputs[state]:
+                start = end - self._lengths[index]
+                matches.append(KeywordMatch(self._term_list[index], start, end,
+                                            is_whole_word(folded_text, start, end, text_len)))
+        return matches
+
+
+def is_whole_word(text: str, start: int, end: int, text_len: int) -> bool:
+    return ((start == 0 or not text[start - 1].isalnum())
+            and (end == text_len or not text[end].isalnum()))
+
+
+_vocabularies: Dict[str, Tuple[str, ...]] = {}
+_automaton: Optional[KeywordAutomaton] = None
+_lock = threading.Lock()
+
+
+def register_vocabulary(vocab_id: str, terms: Iterable[str]):
+    """Add (or replace) a named keyword list; the automaton is recompiled on next use"""
+    global _automaton
+    terms = tuple(terms)
+    with _lock:
+        if _vocabularies.get(vocab_id) == terms:
+            return
+        _vocabularies[vocab_id] = terms
+        _automaton = None
+
+
+def get_automaton() -> KeywordAutomaton:
+    """Automaton over every registered vocabulary, compiled once and reused"""
+    global _automaton
+    automaton = _automaton
+    if automaton is None:
+        with _lock:
+            if _automaton is None:
+                _automaton = KeywordAutomaton(_vocabularies)
+                logger.info(f"Compiled keyword automaton: {len(_vocabularies)} vocabularies, "
+                            f"{len(_automaton.terms)} terms, {_automaton.state_count} states")
+            automaton = _automaton
+    return automaton
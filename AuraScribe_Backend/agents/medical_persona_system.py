@@ -1,10 +1,22 @@
 # medical_persona_system.py
 # Central persona system for medical specialties
 
+from types import MappingProxyType
+
+
+def _deep_freeze(value):
+    """Read-only copy: mappings become MappingProxyType, lists tuples, all the way down"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _deep_freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_deep_freeze(item) for item in value)
+    return value
+
+
 class MedicalPersona:
     """Defines the persona (medical specialty) for agents"""
     
-    PERSONAS = {
+    PERSONAS = _deep_freeze({
         "generalist": {
             "name": "General Practitioner",
             "description": "Primary care physician with broad medical knowledge",
@@ -75,12 +87,19 @@ class MedicalPersona:
             "treatment_style": ["Psychotropics", "Psychotherapy", "Crisis management"],
             "language_style": "Therapeutic, non-judgmental"
         }
-    }
+    })
     
     def __init__(self, persona_key="generalist"):
         self.persona_key = persona_key
         self.persona_data = self.PERSONAS.get(persona_key, self.PERSONAS["generalist"])
-        self.specialty_terms = self._build_specialty_terms()
+        self.specialty_terms = _deep_freeze(self._build_specialty_terms())
+        self._frozen = True
+
+    def __setattr__(self, name, value):
+        # Personas are shared between concurrent requests (see get_persona), so they never change
+        if getattr(self, '_frozen', False):
+            raise AttributeError(f"MedicalPersona is immutable (cannot set '{name}')")
+        super().__setattr__(name, value)
         
     def _build_specialty_terms(self):
         """Build a dictionary of specialty-specific medical terms"""
@@ -140,6 +159,15 @@ class MedicalPersona:
             "persona_key": self.persona_key,
             "persona_name": self.persona_data["name"],
             "description": self.persona_data["description"],
-            "specialties": self.persona_data["specialties"],
+            "specialties": list(self.persona_data["specialties"]),
             "language_style": self.persona_data["language_style"]
-        }
\ No newline at end of file
+        }
+
+
+# One pre-built persona per key, created at import and shared by every request
+_PERSONA_CACHE = MappingProxyType({key: MedicalPersona(key) for key in MedicalPersona.PERSONAS})
+
+
+def get_persona(persona_key="generalist"):
+    """Shared, immutable persona for a key (unknown keys get the generalist)"""
+    return _PERSONA_CACHE.get(persona_key) or _PERSONA_CACHE["generalist"]
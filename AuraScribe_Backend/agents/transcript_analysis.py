@@ -0,0 +1,194 @@
+# TranscriptAnalysis - one normalisation pass over a transcript, shared by all agents
+#
+# The orchestrator builds it once and passes it in the payload as "analysis";
+# agents call get_analysis(payload) and query it instead of lowercasing and
+# rescanning the transcript themselves.
+
+import re
+from functools import cached_property
+from typing import Dict, Iterable, List, Optional, Pattern, Tuple
+
+from agents.keyword_matcher import KeywordMatch, fold_text, get_automaton, is_whole_word
+
+_TOKEN_RE = re.compile(r"[^\W_]+(?:[-'][^\W_]+)*")
+_SENTENCE_RE = re.compile(r"[^.!?\n]+[.!?]*")
+# Characters of already-seen text rescanned by incremental pattern searches; patterns
+# passed to search() are expected to match less than this many characters
+_SEARCH_OVERLAP = 64
+
+
+class TranscriptAnalysis:
+    """
+    Normalised view of a transcript.
+
+    - ``lower``: lowercased text
+    - ``folded``: lowercased and accent-folded (same length and offsets as the original)
+    - ``tokens``: (token, start, end) over the folded text (built on first use)
+    - ``sentences``: (start, end) offsets of each sentence (built on first use)
+
+    ``contains(term)`` has the same substring semantics agents used on the
+    lowercased text, but accent-insensitive, and each term is resolved once per
+    transcript no matter how many agents ask for it. Terms from a registered
+    vocabulary (see keyword_matcher) are answered from one automaton scan over
+    the transcript; anything else falls back to a substring search.
+    """
+
+    def __init__(self, text: str):
+        self.text = text or ""
+        self.lower = self.text.lower()
+        self.folded = fold_text(self.text)
+        self._hits: Dict[str, bool] = {}
+        self._searches: Dict[Tuple[Pattern, str], Optional[re.Match]] = {}
+
+    @cached_property
+    def tokens(self) -> List[Tuple[str, int, int]]:
+        return [(m.group(0), m.start(), m.end()) for m in _TOKEN_RE.finditer(self.folded)]
+
+    @cached_property
+    def token_set(self) -> frozenset:
+        return frozenset(token for token, _, _ in self.tokens)
+
+    @cached_property
+    def sentences(self) -> List[Tuple[int, int]]:
+        return [(m.start(), m.end()) for m in _SENTENCE_RE.finditer(self.text) if m.group(0).strip()]
+
+    @cached_property
+    def _keywords(self):
+        automaton = get_automaton()
+        matches = automaton.scan(self.folded)
+        return automaton, matches, {match.term for match in matches}
+
+    @property
+    def keyword_matches(self) -> List[KeywordMatch]:
+        """Every occurrence of every registered vocabulary term, with offsets"""
+        return self._keywords[1]
+
+    def vocabulary(self, vocab_id: str, whole_word: bool = False) -> List[str]:
+        """Terms of a registered vocabulary (in vocabulary order) found in the transcript"""
+        automaton, matches, found = self._keywords
+        if whole_word:
+            found = {match.term for match in matches if match.whole_word}
+        return [term for term in automaton.vocabularies.get(vocab_id, ()) if fold_text(term) in found]
+
+    @property
+    def word_count(self) -> int:
+        return len(self.tokens)
+
+    def contains(self, term: str) -> bool:
+        """True if the (folded) term occurs anywhere in the folded transcript"""
+        hit = self._hits.get(term)
+        if hit is None:
+            key = fold_text(term)
+            automaton, _, found = self._keywords
+            hit = key in found if automaton.has_term(key) else key in self.folded
+            self._hits[term] = hit
+        return hit
+
+    def search(self, pattern: Pattern, field: str = "text") -> Optional[re.Match]:
+        """First match of a compiled pattern in ``text``, ``lower`` or ``folded`` (memoized per pattern)"""
+        key = (pattern, field)
+        if key not in self._searches:
+            self._searches[key] = pattern.search(getattr(self, field))
+        return self._searches[key]
+
+    def contains_any(self, terms: Iterable[str]) -> bool:
+        return any(self.contains(term) for term in terms)
+
+    def contains_all(self, terms: Iterable[str]) -> bool:
+        return all(self.contains(term) for term in terms)
+
+    def matching(self, terms: Iterable[str]) -> List[str]:
+        """Terms (in the given order) found in the transcript"""
+        return [term for term in terms if self.contains(term)]
+
+    def sentence(self, index: int) -> str:
+        start, end = self.sentences[index]
+        return self.text[start:end].strip()
+
+    def sentence_at(self, offset: int) -> str:
+        """Sentence containing a character offset"""
+        for start, end in self.sentences:
+            if start <= offset < end:
+                return self.text[start:end].strip()
+        return ""
+
+
+class IncrementalTranscriptAnalysis(TranscriptAnalysis):
+    """
+    TranscriptAnalysis that can grow: ``extend(segment)`` appends text and updates
+    the keyword matches, memoized lookups, tokens and sentences by looking only at
+    the new segment (plus a short overlap where a match may straddle the old end).
+
+    Answers are the same as a TranscriptAnalysis built from the whole text.
+    """
+
+    def __init__(self, text: str = ""):
+        super().__init__(text)
+        self._automaton = None
+
+    @property
+    def _keywords(self):
+        automaton = get_automaton()
+        if automaton is not self._automaton:
+            # First use, or a vocabulary was registered since: scan everything once
+            hits, self._state = automaton.advance(self.folded)
+            self._matches = automaton.matches(hits, self.folded)
+            self._found = {match.term for match in self._matches}
+            self._automaton = automaton
+        return automaton, self._matches, self._found
+
+    def extend(self, segment: str):
+        """
+        Append ``segment`` verbatim to the transcript. No separator is added: a caller
+        joining separately dictated segments must supply the whitespace between them,
+        or words at the boundary merge.
+        """
+        if not segment:
+            return
+        old_len = len(self.text)
+        self.text += segment
+        self.lower += segment.lower()
+        self.folded += fold_text(segment)
+
+        if self._automaton is not None and self._automaton is get_automaton():
+            # A match that ended at the old end of text may now be glued to the next word
+            if old_len and self.folded[old_len].isalnum():
+                for i in range(len(self._matches) - 1, -1, -1):
+                    if self._matches[i].end != old_len:
+                        break
+                    self._matches[i] = self._matches[i]._replace(whole_word=False)
+            hits, self._state = self._automaton.advance(self.folded[old_len:], self._state, old_len)
+            new_matches = self._automaton.matches(hits, self.folded)
+            self._matches.extend(new_matches)
+            self._found.update(match.term for match in new_matches)
+        else:
+            self._automaton = None
+
+        # Found terms stay found; only misses need asking again
+        self._hits = {term: hit for term, hit in self._hits.items() if hit}
+        rescan_from = max(0, old_len - _SEARCH_OVERLAP)
+        for (pattern, field), match in list(self._searches.items()):
+            if match is None or match.end() + _SEARCH_OVERLAP > old_len:
+                start = rescan_from if match is None else min(match.start(), rescan_from)
+                self._searches[(pattern, field)] = pattern.search(getattr(self, field), start)
+
+        # Cached tokens/sentences: rescan from the start of the last one, which may continue
+        tokens = self.__dict__.get("tokens")
+        if tokens is not None:
+            start = tokens.pop()[1] if tokens else 0
+            tokens.extend((m.group(0), m.start(), m.end()) for m in _TOKEN_RE.finditer(self.folded, start))
+            self.__dict__.pop("token_set", None)
+        sentences = self.__dict__.get("sentences")
+        if sentences is not None:
+            start = sentences.pop()[0] if sentences else 0
+            sentences.extend((m.start(), m.end()) for m in _SENTENCE_RE.finditer(self.text, start) if m.group(0).strip())
+
+
+def get_analysis(payload) -> TranscriptAnalysis:
+    """Shared analysis from an orchestrator payload, or a fresh one for plain text"""
+    if isinstance(payload, dict):
+        analysis = payload.get("analysis")
+        if isinstance(analysis, TranscriptAnalysis):
+            return analysis
+        return TranscriptAnalysis(payload.get("transcript", ""))
+    return TranscriptAnalysis(payload or "")
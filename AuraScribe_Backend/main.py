@@ -12,17 +12,17 @@ from services.pdf.pdf_service import save_pdf, get_pdf_path
 from services.integration_loader import load_clinic_config, get_efax_adapter, get_emr_adapter
 
 # --- Persona System ---
-from agents.medical_persona_system import MedicalPersona
+from agents.medical_persona_system import MedicalPersona, get_persona
 
 # Default persona
-current_persona = MedicalPersona("generalist")
+current_persona = get_persona("generalist")
 
 """
 AuraScribe - Complete Medical Documentation System
 """
 
 from functools import wraps
-from flask import Flask, jsonify, request, send_file
+from flask import Flask, Response, jsonify, request, send_file, stream_with_context
 import logging
 from flask_cors import CORS
 from flask_limiter import Limiter
@@ -31,8 +31,9 @@ import os
 import sys
 from datetime import datetime
 from dotenv import load_dotenv
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import json
+import time
 import redis
 
 # Load environment variables FIRST
@@ -49,22 +50,22 @@ app = Flask(__name__)
 
 # Configure file uploads (100MB limit for audio files)
 app.config['MAX_CONTENT_LENGTH'] = 100 * 1024 * 1024  # 100MB
+# Uploads are forwarded to Deepgram in reads of this size
+UPLOAD_CHUNK_SIZE = 64 * 1024
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
 
 # Initialize Redis connection for session storage
 # Sessions expire after 24 hours (86400 seconds) for Loi 25 compliance
-REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
 SESSION_TTL = 86400  # 24 hours in seconds
 
-try:
-    redis_client = redis.from_url(REDIS_URL, decode_responses=True)
-    redis_client.ping()
-    logging.info(f"Redis connected successfully: {REDIS_URL.split('@')[-1] if '@' in REDIS_URL else REDIS_URL}")
-except redis.ConnectionError as e:
-    logging.warning(f"Redis connection failed: {e}. Falling back to in-memory storage (NOT RECOMMENDED for production)")
-    redis_client = None
+from services.storage import get_redis, get_storage_stats
+
+# Shared pooled client (services/storage.py); None if Redis is unreachable
+redis_client = get_redis()
+if not redis_client:
+    logging.warning("Redis unavailable. Falling back to in-memory storage (NOT RECOMMENDED for production)")
 
 # CORS Configuration
 def _normalize_origins(origins: List[str]) -> List[str]:
@@ -137,8 +138,8 @@ except ImportError as e:
     logging.warning(f"Integration loader not available: {e}")
 
 try:
-    from agents.medical_persona_system import MedicalPersona
-    current_persona = MedicalPersona("generalist")
+    from agents.medical_persona_system import MedicalPersona, get_persona
+    current_persona = get_persona("generalist")
 except ImportError as e:
     logging.warning(f"Medical persona system not available: {e}")
     current_persona = None
@@ -232,8 +233,8 @@ def api_key_required(func):
 
 # Import Deepgram service
 try:
-    from services.deepgram_local_service import DeepgramLocalService
-    deepgram_service = DeepgramLocalService()
+    from services.deepgram_local_service import get_deepgram_service
+    deepgram_service = get_deepgram_service()
     logging.info(f"Deepgram service initialized: {deepgram_service.base_url}")
 except ImportError as e:
     logging.warning(f"Could not import Deepgram service: {e}")
@@ -256,8 +257,30 @@ deepgram_fr_model: Optional[str] = os.getenv("DEEPGRAM_FR_MODEL", "nova-3")
 
 
 # Import real agent wrappers
-from services.AuraScribeRouter import route_transcript
-from services.AuraScribeOrchestrator import orchestrate_transcript
+from services.AuraScribeRouter import route_transcript, routing_payload
+from services.AuraScribeOrchestrator import (orchestrate_transcript, orchestrate_incremental, ResyncRequired, get_result_cache_stats,
+                                             stream_orchestration, orchestration_event)
+from services.agent_executor import get_agent_executor
+from services.agent_process_pool import get_agent_process_pool
+from services.orchestration_batch import iter_batch, parse_ndjson, ORCHESTRATION_BATCH_MAX_ITEMS
+from services.orchestration_sessions import get_session_store
+from services.codec import get_codec_info
+from services.local_cache import LocalTTLCache, get_local_cache_stats
+from services.record_index import RecordIndex, page_records
+from services.session_store import SessionStore
+from services.job_queue import JobQueue, QueueFullError, JOB_PENDING, TERMINAL_STATES
+
+# Background jobs for /api/transcribe?async=1 (records expire with sessions, 24h)
+job_queue = JobQueue(
+    redis_client,
+    SESSION_TTL,
+    workers=int(os.getenv('TRANSCRIBE_WORKERS', '2')),
+    max_pending=int(os.getenv('TRANSCRIBE_QUEUE_MAX', '100'))
+)
+# ?stream=1 job status: stream lifetime, time without a status change, keep-alive comment interval (seconds)
+JOB_STREAM_MAX_SECONDS = float(os.getenv('JOB_STREAM_MAX_SECONDS', '900'))
+JOB_STREAM_IDLE_SECONDS = float(os.getenv('JOB_STREAM_IDLE_SECONDS', '300'))
+JOB_STREAM_KEEPALIVE_SECONDS = float(os.getenv('JOB_STREAM_KEEPALIVE_SECONDS', '15'))
 try:
     from agents.AskAura_agent import root_agent as ask_aura_agent
 except ImportError as e:
@@ -285,7 +308,7 @@ def manage_persona():
         persona_key = data.get('persona', 'generalist')
         
         if persona_key in MedicalPersona.PERSONAS:
-            current_persona = MedicalPersona(persona_key)
+            current_persona = get_persona(persona_key)
             logging.info(f"Persona switched to: {persona_key}")
             
             return jsonify({
@@ -374,6 +397,13 @@ def system():
             },
             'vertex_ai_configured': 'GOOGLE_APPLICATION_CREDENTIALS' in os.environ,
             'deepgram_configured': 'DEEPGRAM_API_KEY' in os.environ,
+            'job_queue': job_queue.get_stats(),
+            'agent_executor': get_agent_executor().get_stats(),
+            'agent_process_pool': get_agent_process_pool().get_stats() if get_agent_process_pool() else None,
+            'orchestration_sessions': get_session_store().get_stats(),
+            'orchestration_cache': get_result_cache_stats(),
+            'storage': {**get_storage_stats(), **get_codec_info()},
+            'fallback_caches': get_local_cache_stats(),
             'timestamp': datetime.now().isoformat()
         })
     except Exception as e:
@@ -406,147 +436,194 @@ def deepgram_status():
 @app.route('/api/transcribe', methods=['POST'])
 @api_key_required
 def transcribe():
-    """Transcribe audio file using Deepgram with dynamic language/model selection and fallback."""
+    """Transcribe audio file using Deepgram with dynamic language/model selection and fallback.
+
+    Accepts a multipart upload ("file" or "audio" field) or a raw audio body
+    (Content-Type audio/* or application/octet-stream, options in the query string),
+    which is piped to Deepgram without a temp file. With ?async=1 the upload is
+    queued and a job id is returned immediately; poll /api/jobs/<job_id> for
+    progress and the result.
+    """
     if not deepgram_service:
         return jsonify({
             'error': 'Deepgram service not available',
             'help': 'Set DEEPGRAM_API_KEY and DEEPGRAM_SELF_HOSTED_URL in .env'
         }), 503
     try:
-        # Check if file was uploaded - accept both 'file' and 'audio' field names
-        audio_file = None
-        if 'file' in request.files:
-            audio_file = request.files['file']
-        elif 'audio' in request.files:
-            audio_file = request.files['audio']
-
-        if not audio_file:
-            return jsonify({'error': 'No audio file provided. Use "file" or "audio" field.'}), 400
-        # Check if file is empty
-        if audio_file.filename == '':
-            return jsonify({'error': 'No selected file'}), 400
+        if request.mimetype.startswith('audio/') or request.mimetype == 'application/octet-stream':
+            # Raw body: read straight from the request stream
+            audio_stream = request.stream
+            upload_name = request.args.get('filename', 'upload')
+            options = request.args
+        else:
+            # Check if file was uploaded - accept both 'file' and 'audio' field names
+            audio_file = None
+            if 'file' in request.files:
+                audio_file = request.files['file']
+            elif 'audio' in request.files:
+                audio_file = request.files['audio']
+
+            if not audio_file:
+                return jsonify({'error': 'No audio file provided. Use "file" or "audio" field.'}), 400
+            # Check if file is empty
+            if audio_file.filename == '':
+                return jsonify({'error': 'No selected file'}), 400
+            audio_stream = audio_file.stream
+            upload_name = audio_file.filename
+            options = request.form
         # Get parameters
-        language = request.form.get('language')
-        model = request.form.get('model')
+        language = options.get('language')
+        model = options.get('model')
         detect_language = False
         # If language is not provided, enable auto-detect
         if not language:
             detect_language = True
             language = deepgram_service.default_language
-        # Save temporary file
-        import tempfile
-        import uuid
-        temp_dir = tempfile.gettempdir()
-        filename = f"{uuid.uuid4()}_{audio_file.filename}"
-        filepath = os.path.join(temp_dir, filename)
-        audio_file.save(filepath)
-        # Try primary transcription
-        result = deepgram_service.transcribe_audio_file(
-            filepath,
-            language=language,
-            model=model,
-            detect_language=detect_language
-        )
-        # Fallback logic if failed or empty transcript
-        fallback_attempted = False
-        fallback_result = None
-        if (not result.get('success')) or (not result.get('transcript')):
-            fallback_attempted = True
-            # Fallback: try with default model/language combos
-            fallback_combos = [
-                (deepgram_service.models.get('fr', 'nova-3'), 'fr-CA'),
-                (deepgram_service.models.get('en', 'nova-3'), 'en-US'),
-                (deepgram_service.models.get('default', 'nova-3'), deepgram_service.default_language)
-            ]
-            for fb_model, fb_lang in fallback_combos:
-                if (model == fb_model and language == fb_lang):
-                    continue  # Don't retry the same combo
-                fallback_result = deepgram_service.transcribe_audio_file(
-                    filepath,
-                    language=fb_lang,
-                    model=fb_model,
-                    detect_language=False
-                )
-                if fallback_result.get('success') and fallback_result.get('transcript'):
-                    result = fallback_result
-                    break
-        # Clean up temp file
-        try:
-            os.remove(filepath)
-        except Exception as cleanup_err:
-            logging.warning(f"Could not remove temp file: {cleanup_err}")
-        # If transcription was successful, run orchestrator to generate forms
-        generated_forms = None
-        if result.get('success') and result.get('transcript'):
+        persona_key = options.get('persona', 'generalist')
+
+        if request.args.get('async', '').lower() in ('1', 'true'):
+            # Queued jobs outlive the request, so the upload is saved to a temporary file
+            import shutil
+            import tempfile
+            import uuid
+            temp_dir = tempfile.gettempdir()
+            filename = f"{uuid.uuid4()}_{os.path.basename(upload_name)}"
+            filepath = os.path.join(temp_dir, filename)
+            with open(filepath, 'wb') as f:
+                shutil.copyfileobj(audio_stream, f, UPLOAD_CHUNK_SIZE)
             try:
-                # Get persona from request if available
-                persona_key = request.form.get('persona', 'generalist')
-                logging.info(f"Running orchestrator to generate forms (persona: {persona_key})...")
-                orchestration_result = orchestrate_transcript(result['transcript'], persona_key=persona_key)
+                job_id = job_queue.submit('transcribe', _transcription_job, filepath, language, model,
+                                          detect_language, persona_key,
+                                          metadata={'filename': upload_name, 'language': language})
+            except QueueFullError as e:
+                os.remove(filepath)
+                return jsonify({'error': str(e)}), 503
+            except Exception:
+                # e.g. the executor is shut down: the job will never remove the upload
+                os.remove(filepath)
+                raise
+            return jsonify({
+                'job_id': job_id,
+                'status': JOB_PENDING,
+                'status_url': f"/api/jobs/{job_id}"
+            }), 202
 
-                # Extract forms from agent results
-                agent_results = orchestration_result.get('agent_results', {})
+        return jsonify(_transcribe_and_orchestrate(audio_stream, language, model, detect_language, persona_key))
+    except Exception as e:
+        logging.error(f"Error in /api/transcribe: {e}")
+        return jsonify({'error': 'Internal server error', 'details': str(e)}), 500
 
-                # Build generated_forms structure that frontend expects
-                clinical_doc = agent_results.get('ClinicalDocumentationAgent', {})
-                prescription_lab = agent_results.get('PrescriptionLabAgent', {})
-                mado_data = agent_results.get('MADO_ReportingAgent', {})
-                compliance = agent_results.get('ComplianceMonitorAgent', {})
-                ramq_billing = agent_results.get('RAMQ_BillingAgent', {})
+def _transcription_job(job, filepath, language, model, detect_language, persona_key):
+    """Worker entry point for async /api/transcribe jobs"""
+    result = _transcribe_and_orchestrate(filepath, language, model, detect_language, persona_key,
+                                         progress=job.progress)
+    if not result.get('success'):
+        raise RuntimeError(result.get('error') or 'Transcription failed')
+    return result
 
-                # Get the formatted SOAP content
-                soap_note = clinical_doc.get('soap_note', {})
-                formatted_soap = clinical_doc.get('formatted_content', '')
+def _transcribe_and_orchestrate(audio, language: str, model: Optional[str], detect_language: bool,
+                                persona_key: str, progress=None) -> dict:
+    """Transcribe an upload and generate forms.
 
-                # Add formatted_content to soap_note for frontend compatibility
-                soap_with_format = {**soap_note, 'formatted_content': formatted_soap}
+    ``audio`` is either a readable stream (piped to Deepgram in UPLOAD_CHUNK_SIZE reads)
+    or the path of a saved upload, which is removed afterwards.
+    """
+    def report(percent, stage):
+        if progress:
+            progress(percent, stage)
 
-                generated_forms = {
+    report(10, 'transcribing')
+    # Language/model fallbacks (hedged) are handled inside the service
+    if isinstance(audio, str):
+        try:
+            result = deepgram_service.transcribe_audio_file(
+                audio,
+                language=language,
+                model=model,
+                detect_language=detect_language
+            )
+        finally:
+            # Clean up temp file
+            try:
+                os.remove(audio)
+            except Exception as cleanup_err:
+                logging.warning(f"Could not remove temp file: {cleanup_err}")
+    else:
+        result = deepgram_service.transcribe_audio_stream(
+            iter(lambda: audio.read(UPLOAD_CHUNK_SIZE), b''),
+            language=language,
+            model=model,
+            detect_language=detect_language
+        )
+    # If transcription was successful, run orchestrator to generate forms
+    generated_forms = None
+    if result.get('success') and result.get('transcript'):
+        report(60, 'orchestrating')
+        try:
+            logging.info(f"Running orchestrator to generate forms (persona: {persona_key})...")
+            orchestration_result = orchestrate_transcript(result['transcript'], persona_key=persona_key)
+
+            # Extract forms from agent results
+            agent_results = orchestration_result.get('agent_results', {})
+
+            # Build generated_forms structure that frontend expects
+            clinical_doc = agent_results.get('ClinicalDocumentationAgent', {})
+            prescription_lab = agent_results.get('PrescriptionLabAgent', {})
+            mado_data = agent_results.get('MADO_ReportingAgent', {})
+            compliance = agent_results.get('ComplianceMonitorAgent', {})
+            ramq_billing = agent_results.get('RAMQ_BillingAgent', {})
+
+            # Get the formatted SOAP content
+            soap_note = clinical_doc.get('soap_note', {})
+            formatted_soap = clinical_doc.get('formatted_content', '')
+
+            # Add formatted_content to soap_note for frontend compatibility
+            soap_with_format = {**soap_note, 'formatted_content': formatted_soap}
+
+            generated_forms = {
+                'soap': soap_with_format,
+                'patientNote': clinical_doc.get('patient_explanation', {}),
+                'clinicalData': {
                     'soap': soap_with_format,
-                    'patientNote': clinical_doc.get('patient_explanation', {}),
-                    'clinicalData': {
-                        'soap': soap_with_format,
-                        'soapNote': soap_with_format,
-                        'patientInstruction': clinical_doc.get('patient_explanation', {}),
-                        'clinicalReasoning': clinical_doc.get('clinical_reasoning', ''),
-                        'formatted_content': formatted_soap
-                    },
-                    'prescription': prescription_lab.get('prescription', {}),
-                    'labOrder': prescription_lab.get('lab_order', {}),
-                    'referralLetter': clinical_doc.get('referral_letter', {}),
-                    'madoData': mado_data,
-                    'complianceAudit': compliance,
-                    'billingData': ramq_billing
-                }
-                logging.info("Forms generated successfully")
-            except Exception as orch_err:
-                logging.error(f"Orchestration error: {orch_err}")
-                generated_forms = {'error': str(orch_err)}
-
-        response = {
-            'success': result.get('success', False),
-            'transcript': result.get('transcript', ''),
-            'language': result.get('language', language),
-            'model_used': result.get('model_used', 'auto'),
-            'confidence': result.get('confidence', 0),
-            'word_count': result.get('word_count', 0),
-            'word_confidences': result.get('word_confidences', []),
-            'word_timestamps': result.get('word_timestamps', []),
-            'audio_duration': result.get('audio_duration', None),
-            'utterances': result.get('utterances', []),
-            'speaker_segments': result.get('speaker_segments', []),
-            'error': result.get('error', None),
-            'timestamp': datetime.now().isoformat(),
-            'auto_detected_language': detect_language,
-            'fallback_attempted': fallback_attempted,
-            'generated_forms': generated_forms
-        }
-        if fallback_attempted:
-            response['fallback_result'] = fallback_result
-        return jsonify(response)
-    except Exception as e:
-        logging.error(f"Error in /api/transcribe: {e}")
-        return jsonify({'error': 'Internal server error', 'details': str(e)}), 500
+                    'soapNote': soap_with_format,
+                    'patientInstruction': clinical_doc.get('patient_explanation', {}),
+                    'clinicalReasoning': clinical_doc.get('clinical_reasoning', ''),
+                    'formatted_content': formatted_soap
+                },
+                'prescription': prescription_lab.get('prescription', {}),
+                'labOrder': prescription_lab.get('lab_order', {}),
+                'referralLetter': clinical_doc.get('referral_letter', {}),
+                'madoData': mado_data,
+                'complianceAudit': compliance,
+                'billingData': ramq_billing
+            }
+            logging.info("Forms generated successfully")
+        except Exception as orch_err:
+            logging.error(f"Orchestration error: {orch_err}")
+            generated_forms = {'error': str(orch_err)}
+
+    response = {
+        'success': result.get('success', False),
+        'transcript': result.get('transcript', ''),
+        'language': result.get('language', language),
+        'model_used': result.get('model_used', 'auto'),
+        'confidence': result.get('confidence', 0),
+        'word_count': result.get('word_count', 0),
+        'word_confidences': result.get('word_confidences', []),
+        'word_timestamps': result.get('word_timestamps', []),
+        'audio_duration': result.get('audio_duration', None),
+        'utterances': result.get('utterances', []),
+        'speaker_segments': result.get('speaker_segments', []),
+        'error': result.get('error', None),
+        'timestamp': datetime.now().isoformat(),
+        'auto_detected_language': detect_language,
+        'fallback_attempted': result.get('attempts', 1) > 1,
+        'fallback_used': result.get('fallback_used', False),
+        'transcription_attempts': result.get('attempts', 1),
+        'cached': result.get('cached', False),
+        'generated_forms': generated_forms
+    }
+    return response
 
 @app.route('/api/route', methods=['POST'])
 @limiter.limit("30/minute")
@@ -574,16 +651,47 @@ def route():
 @limiter.limit("20/minute")
 @api_key_required
 def orchestrate():
-    """Orchestrate medical transcript processing with persona support"""
+    """Orchestrate medical transcript processing with persona support.
+
+    With ?stream=1 (or Accept: text/event-stream) each agent's result is pushed as a
+    server-sent event as soon as it is ready, followed by the summary; ?stream=ndjson
+    (or Accept: application/x-ndjson) sends the same events as JSON lines.
+    """
     try:
-        data = request.json
-        if not data or 'transcript' not in data:
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({'error': 'Request body must be a JSON object'}), 400
+        session_id = data.get('session_id')
+        if 'transcript' not in data and not (session_id and 'segment' in data):
             return jsonify({'error': 'Missing transcript'}), 400
-        transcript = data['transcript']
+        if any(key in data and not isinstance(data[key], str) for key in ('transcript', 'segment')):
+            return jsonify({'error': 'transcript and segment must be strings'}), 400
+        offset = data.get('offset')
+        if offset is not None and (not isinstance(offset, int) or isinstance(offset, bool) or offset < 0):
+            return jsonify({'error': 'offset must be a non-negative integer'}), 400
         persona_key = data.get('persona', 'generalist')
         use_parallel = data.get('parallel', True)
+        selective = data.get('selective')  # None -> ORCHESTRATION_SELECTIVE
 
-        result = orchestrate_transcript(transcript, persona_key=persona_key, use_parallel=use_parallel)
+        stream_format = _orchestration_stream_format(data)
+        if stream_format and not session_id:
+            return _stream_orchestration_response(data['transcript'], persona_key, selective, stream_format)
+
+        if session_id:
+            # Live dictation: only the text added since the session's last call is analysed
+            try:
+                result = orchestrate_incremental(session_id, transcript_text=data.get('transcript'),
+                                                 segment=data.get('segment'), persona_key=persona_key,
+                                                 selective=selective, reset=bool(data.get('reset')),
+                                                 offset=offset)
+            except ResyncRequired as e:
+                # Nothing to append the segment to here: the client resends the whole transcript
+                return jsonify({'error': str(e), 'resync_required': True, 'session_id': session_id,
+                                'known_length': e.known_length}), 409
+        else:
+            result = orchestrate_transcript(data['transcript'], persona_key=persona_key, use_parallel=use_parallel,
+                                            selective=selective)
+        transcript = result.get('transcript', '')
 
         return jsonify({
             'success': True,
@@ -591,6 +699,7 @@ def orchestrate():
             'persona_used': persona_key,
             'orchestration': result,
             'execution_stats': result.get('execution_stats', {}),
+            'cache': result.get('cache'),
             'confidence': result.get('confidence', 'unknown'),
             'workflow': [
                 '1. Receive transcript',
@@ -606,6 +715,89 @@ def orchestrate():
         logging.error(f"Error in /api/orchestrate: {e}")
         return jsonify({'error': 'Internal server error', 'details': str(e)}), 500
 
+def _orchestration_stream_format(data) -> Optional[str]:
+    """'sse', 'ndjson' or None (plain JSON response) from ?stream=, the body's "stream" or Accept"""
+    stream = str(request.args.get('stream', data.get('stream', ''))).lower()
+    best = request.accept_mimetypes.best
+    if stream == 'ndjson' or best == 'application/x-ndjson':
+        return 'ndjson'
+    if stream in ('1', 'true', 'sse') or best == 'text/event-stream':
+        return 'sse'
+    return None
+
+def _stream_orchestration_response(transcript: str, persona_key: str, selective, stream_format: str):
+    def events():
+        try:
+            for event in stream_orchestration(transcript, persona_key=persona_key, selective=selective):
+                yield orchestration_event(*event)
+        except Exception as e:
+            logging.error(f"Error streaming /api/orchestrate: {e}")
+            yield {'event': 'error', 'error': 'Internal server error', 'details': str(e)}
+
+    def encode():
+        for payload in events():
+            line = json.dumps(payload, default=str)
+            yield f"{line}\n" if stream_format == 'ndjson' else f"event: {payload['event']}\ndata: {line}\n\n"
+
+    mimetype = 'application/x-ndjson' if stream_format == 'ndjson' else 'text/event-stream'
+    return Response(stream_with_context(encode()), mimetype=mimetype,
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/api/orchestrate/batch', methods=['POST'])
+@limiter.limit("10/minute")
+@api_key_required
+def orchestrate_batch():
+    """Orchestrate many transcripts in one call.
+
+    Body: a JSON array of {"id", "transcript", "persona"} items, an object with
+    "items" (plus default "persona"/"selective"), or NDJSON (Content-Type:
+    application/x-ndjson) with one item per line, read as it arrives. Results are
+    streamed back as NDJSON in input order, one line per item (errors included),
+    then a summary line; ?stream=0 returns a single JSON document instead.
+    """
+    started = time.monotonic()
+    options = {}
+    if request.mimetype == 'application/x-ndjson':
+        items = parse_ndjson(request.stream)
+    else:
+        data = request.get_json(silent=True)
+        if isinstance(data, dict):
+            options = data
+            data = data.get('items')
+        if not isinstance(data, list):
+            return jsonify({'error': 'Expected a list of items (or NDJSON body)'}), 400
+        if len(data) > ORCHESTRATION_BATCH_MAX_ITEMS:
+            return jsonify({'error': f'Too many items (max {ORCHESTRATION_BATCH_MAX_ITEMS})'}), 413
+        items = data
+    results = iter_batch(items,
+                         persona_key=request.args.get('persona', options.get('persona', 'generalist')),
+                         selective=options.get('selective'))
+
+    def summary(total, succeeded):
+        return {'total': total, 'succeeded': succeeded, 'failed': total - succeeded,
+                'elapsed_ms': round((time.monotonic() - started) * 1000, 2)}
+
+    if request.args.get('stream', '1').lower() in ('0', 'false'):
+        collected = list(results)
+        return jsonify({'success': True, 'results': collected,
+                        'summary': summary(len(collected), sum(1 for r in collected if r['success'])),
+                        'timestamp': datetime.now().isoformat()})
+
+    def lines():
+        total = succeeded = 0
+        try:
+            for result in results:
+                total += 1
+                succeeded += result['success']
+                yield json.dumps({'event': 'item', **result}, default=str) + '\n'
+        except Exception as e:
+            logging.error(f"Error in /api/orchestrate/batch: {e}")
+            yield json.dumps({'event': 'error', 'error': 'Internal server error', 'details': str(e)}) + '\n'
+        yield json.dumps({'event': 'summary', **summary(total, succeeded)}) + '\n'
+
+    return Response(stream_with_context(lines()), mimetype='application/x-ndjson',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
 @app.route('/api/process', methods=['POST'])
 @api_key_required
 def process():
@@ -645,15 +837,15 @@ def process():
                 results['vertex_error'] = str(e)
                 results['vertex_analysis'] = {'analysis': f'Analysis of: {text[:50]}...'}
         
-        # Step 3: Routing
-        # Use real router agent
-        routing = route_transcript(text)
+        # Steps 3-4: Routing + orchestration
+        # The orchestrator routes on its own transcript analysis; only route separately if it didn't
+        orchestration = orchestrate_transcript(text)
+        if orchestration.get('routing'):
+            routing = routing_payload(text, orchestration['routing'], orchestration.get('timestamp'))
+        else:
+            routing = route_transcript(text)
         results['routing'] = routing
         results['steps_completed'].append('routing')
-        
-        # Step 4: Orchestration
-        # Use real orchestrator agent
-        orchestration = orchestrate_transcript(text)
         results['orchestration'] = orchestration
         results['steps_completed'].append('orchestration')
         
@@ -707,85 +899,79 @@ def get_uploaded_file(filename):
 # ========== SESSION MANAGEMENT ==========
 # Redis-based session storage with 24-hour TTL for Loi 25 compliance
 # Falls back to in-memory storage if Redis is unavailable (NOT RECOMMENDED for production)
-sessions_store_fallback = {}  # Fallback for when Redis is unavailable
+# Fallback for when Redis is unavailable: bounded, and entries expire after SESSION_TTL like in Redis
+sessions_store_fallback = LocalTTLCache('sessions', SESSION_TTL)
+# Hash + append-only transcript per session, indexed by created_at for listings
+session_store = SessionStore(redis_client, SESSION_TTL)
 
 def _get_session_key(session_id: str) -> str:
     """Generate Redis key for a session"""
     return f"aurascribe:session:{session_id}"
 
 def _save_session(session: dict) -> bool:
-    """Save session to Redis or fallback storage"""
+    """Save a whole session (creation) to Redis or fallback storage"""
     session_id = session['id']
     if redis_client:
         try:
-            key = _get_session_key(session_id)
-            redis_client.setex(key, SESSION_TTL, json.dumps(session))
+            session_store.save(session)
             return True
         except redis.RedisError as e:
             logging.error(f"Redis error saving session: {e}")
-            sessions_store_fallback[session_id] = session
+            sessions_store_fallback.set(session_id, session)
             return True
     else:
-        sessions_store_fallback[session_id] = session
+        sessions_store_fallback.set(session_id, session)
         return True
 
 def _get_session(session_id: str) -> Optional[dict]:
     """Get session from Redis or fallback storage"""
     if redis_client:
         try:
-            key = _get_session_key(session_id)
-            data = redis_client.get(key)
-            # If data is awaitable (async), await it
-            if hasattr(data, '__await__'):
-                import asyncio
-                loop = asyncio.get_event_loop()
-                data = loop.run_until_complete(data)
-            if data:
-                # Ensure data is str before loading JSON
-                if not isinstance(data, (str, bytes, bytearray)):
-                    data = str(data)
-                return json.loads(data)
-            return None
+            return session_store.get(session_id)
         except redis.RedisError as e:
             logging.error(f"Redis error getting session: {e}")
             return sessions_store_fallback.get(session_id)
     else:
         return sessions_store_fallback.get(session_id)
 
-def _list_sessions(limit: int = 50) -> list:
-    """List all sessions from Redis or fallback storage"""
+def _append_session_transcript(session_id: str, text: str) -> Optional[int]:
+    """Append text to a session transcript; new transcript length, None if the session does not exist"""
+    updated_at = datetime.now().isoformat()
     if redis_client:
         try:
-            keys = redis_client.keys("aurascribe:session:*")
-            # If keys is awaitable, await it
-            if hasattr(keys, '__await__'):
-                import asyncio
-                loop = asyncio.get_event_loop()
-                keys = loop.run_until_complete(keys)
-            # Only convert to list if keys is actually iterable and not a Response object
-            if isinstance(keys, list):
-                keys_list = keys
-            elif hasattr(keys, '__iter__') and not isinstance(keys, (str, bytes)):
-                keys_list = list(keys)
-            else:
-                keys_list = []
-            sessions = []
-            for key in keys_list[:limit]:
-                data = redis_client.get(key)
-                if hasattr(data, '__await__'):
-                    import asyncio
-                    loop = asyncio.get_event_loop()
-                    data = loop.run_until_complete(data)
-                if data:
-                    sessions.append(json.loads(data))
-            # Sort by created_at descending
-            sessions.sort(key=lambda x: x.get('created_at', ''), reverse=True)
-            return sessions
+            return session_store.append_transcript(session_id, text, updated_at)
+        except redis.RedisError as e:
+            logging.error(f"Redis error appending to session: {e}")
+    session = sessions_store_fallback.get(session_id)
+    if not session:
+        return None
+    session['transcript'] = f"{session['transcript']} {text}" if session['transcript'] else text
+    session['updated_at'] = updated_at
+    sessions_store_fallback.set(session_id, session)
+    return len(session['transcript'])
+
+def _update_session(session_id: str, fields: dict) -> Optional[dict]:
+    """Set some session fields (and updated_at); the updated session, None if it does not exist"""
+    fields = {**fields, 'updated_at': datetime.now().isoformat()}
+    if redis_client:
+        try:
+            return session_store.update(session_id, fields)
+        except redis.RedisError as e:
+            logging.error(f"Redis error updating session: {e}")
+    session = sessions_store_fallback.get(session_id)
+    if session:
+        session.update(fields)
+        sessions_store_fallback.set(session_id, session)
+    return session
+
+def _list_sessions(limit: int = 50, cursor: Optional[str] = None) -> Tuple[list, Optional[str]]:
+    """Sessions newest first, one page at a time: (sessions, next_cursor)"""
+    if redis_client:
+        try:
+            return session_store.page(limit, cursor)
         except redis.RedisError as e:
             logging.error(f"Redis error listing sessions: {e}")
-            return list(sessions_store_fallback.values())[:limit]
-    else:
-        return list(sessions_store_fallback.values())[:limit]
+    return page_records(sessions_store_fallback.values(), limit, cursor)
 
 @app.route('/api/sessions', methods=['POST'])
 @api_key_required
@@ -820,11 +1006,17 @@ def create_session():
 @app.route('/api/sessions', methods=['GET'])
 @api_key_required
 def list_sessions():
-    """List all sessions"""
+    """List sessions newest first (?limit=, ?cursor= from the X-Next-Cursor header)"""
     try:
-        limit = request.args.get('limit', 50, type=int)
-        sessions = _list_sessions(limit)
-        return jsonify(sessions)
+        limit = max(1, min(request.args.get('limit', 50, type=int), 500))
+        sessions, next_cursor = _list_sessions(limit, request.args.get('cursor') or None)
+        response = jsonify(sessions)
+        # The body stays a plain list; the next page is requested with ?cursor=<X-Next-Cursor>
+        if next_cursor:
+            response.headers['X-Next-Cursor'] = next_cursor
+        return response
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -841,49 +1033,73 @@ def get_session(session_id):
 @api_key_required
 def append_transcript(session_id):
     """Append text to session transcript"""
-    session = _get_session(session_id)
-    if not session:
-        return jsonify({'error': 'Session not found'}), 404
-
     data = request.get_json() or {}
-    text = data.get('text', '')
-
-    if session['transcript']:
-        session['transcript'] += ' ' + text
-    else:
-        session['transcript'] = text
-
-    session['updated_at'] = datetime.now().isoformat()
-    _save_session(session)
+    transcript_length = _append_session_transcript(session_id, data.get('text', ''))
+    if transcript_length is None:
+        return jsonify({'error': 'Session not found'}), 404
 
-    return jsonify({'status': 'ok', 'transcript_length': len(session['transcript'])})
+    return jsonify({'status': 'ok', 'transcript_length': transcript_length})
 
 @app.route('/api/sessions/<session_id>/status', methods=['PUT'])
 @api_key_required
 def update_session_status(session_id):
     """Update session status"""
-    session = _get_session(session_id)
+    data = request.get_json() or {}
+    session = _update_session(session_id, {'status': data['status']} if 'status' in data else {})
     if not session:
         return jsonify({'error': 'Session not found'}), 404
 
-    data = request.get_json() or {}
-    session['status'] = data.get('status', session['status'])
-    session['updated_at'] = datetime.now().isoformat()
-    _save_session(session)
-
     return jsonify(session)
 
 @app.route('/api/jobs/<job_id>', methods=['GET'])
 @api_key_required
 def get_job_status(job_id):
-    """Get job status - currently jobs are processed synchronously"""
-    # Jobs are processed synchronously in the current implementation
-    # This endpoint returns a not-found status for any job_id
-    return jsonify({
-        'job_id': job_id,
-        'status': 'not_found',
-        'message': 'Jobs are processed synchronously. Use /api/transcribe for transcription.'
-    }), 404
+    """Get background job status, progress and result.
+
+    With ?stream=1 (or Accept: text/event-stream) status changes are pushed as
+    server-sent events until the job completes or fails. Keep-alive comments are
+    sent while nothing changes; the stream ends with a ``timeout`` event after
+    JOB_STREAM_MAX_SECONDS, or JOB_STREAM_IDLE_SECONDS without a status change
+    (the client can reconnect or poll).
+    """
+    job = job_queue.get(job_id)
+    if not job:
+        return jsonify({
+            'job_id': job_id,
+            'status': 'not_found',
+            'message': 'Unknown or expired job id'
+        }), 404
+
+    wants_stream = (request.args.get('stream', '').lower() in ('1', 'true')
+                    or request.accept_mimetypes.best == 'text/event-stream')
+    if not wants_stream:
+        return jsonify({'job_id': job_id, **job})
+
+    def events():
+        started = last_change = last_sent = time.time()
+        last_update = None
+        current = job
+        while current:
+            now = time.time()
+            if current.get('updated_at') != last_update:
+                last_update = current.get('updated_at')
+                last_change = last_sent = now
+                yield f"event: {current['status']}\ndata: {json.dumps({'job_id': job_id, **current})}\n\n"
+            if current['status'] in TERMINAL_STATES:
+                return
+            if now - started >= JOB_STREAM_MAX_SECONDS or now - last_change >= JOB_STREAM_IDLE_SECONDS:
+                timeout = {'job_id': job_id, 'status': current['status'], 'progress': current.get('progress'),
+                           'elapsed_s': round(now - started, 1)}
+                yield f"event: timeout\ndata: {json.dumps(timeout)}\n\n"
+                return
+            if now - last_sent >= JOB_STREAM_KEEPALIVE_SECONDS:
+                last_sent = now
+                yield ": keep-alive\n\n"
+            time.sleep(0.5)
+            current = job_queue.get(job_id)
+
+    return Response(stream_with_context(events()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
 
 # ========== ASK AURA ENDPOINTS ==========
 
@@ -1106,6 +1322,9 @@ def demo():
             'POST /api/transcribe - audio file with "file" field',
             'POST /api/route - {"transcript": "your text"}',
             'POST /api/orchestrate - {"transcript": "your text"}',
+            'POST /api/orchestrate - {"session_id": "...", "transcript": "text so far"} (incremental dictation)',
+            'POST /api/orchestrate?stream=1 - per-agent results as server-sent events (stream=ndjson for JSON lines)',
+            'POST /api/orchestrate/batch - [{"id": "...", "transcript": "..."}, ...] or NDJSON, results streamed in order',
             'POST /api/process - {"text": "your text", "use_vertex": true}'
         ],
         'timestamp': datetime.now().isoformat()
@@ -1126,83 +1345,62 @@ def _get_transfer_key(transfer_id: str) -> str:
     """Generate Redis key for a transfer"""
     return f"aurascribe:auralink:{transfer_id}"
 
+# Sorted-set index by created_at (transfers expire after 15m..7j, pruned from the index lazily)
+transfer_index = RecordIndex(redis_client, 'aurascribe:auralink:', 'auralink',
+                             raw_client=get_redis(decode_responses=False))
+# In-memory fallback; each transfer keeps its own expiry
+transfers_fallback = LocalTTLCache('auralink_transfers', 86400)
+
 def _save_transfer(transfer: dict) -> bool:
-    """Save transfer to Redis or fallback storage"""
+    """Save transfer to Redis (and the listing index) or fallback storage"""
     transfer_id = transfer['id']
     expiry = transfer.get('expiry', '24h')
     ttl = AURALINK_TTL_MAP.get(expiry, 86400)
 
     if redis_client:
         try:
-            key = _get_transfer_key(transfer_id)
-            redis_client.setex(key, ttl, json.dumps(transfer))
+            transfer_index.save(transfer_id, transfer, ttl, transfer.get('created_at'))
             return True
         except redis.RedisError as e:
             logging.error(f"Redis error saving transfer: {e}")
             return False
     else:
-        # Fallback storage (in-memory)
-        if not hasattr(_save_transfer, 'fallback'):
-            _save_transfer.fallback = {}
-        _save_transfer.fallback[transfer_id] = transfer
+        transfers_fallback.set(transfer_id, transfer, ttl)
         return True
 
 def _get_transfer(transfer_id: str) -> Optional[dict]:
     """Get transfer from Redis or fallback storage"""
     if redis_client:
         try:
-            key = _get_transfer_key(transfer_id)
-            data = redis_client.get(key)
-            if data:
-                return json.loads(data)
-            return None
+            return transfer_index.get(transfer_id)
         except redis.RedisError as e:
             logging.error(f"Redis error getting transfer: {e}")
             return None
     else:
-        if hasattr(_save_transfer, 'fallback'):
-            return _save_transfer.fallback.get(transfer_id)
-        return None
+        return transfers_fallback.get(transfer_id)
 
-def _list_transfers(limit: int = 50) -> list:
-    """List all active transfers"""
+def _list_transfers(limit: int = 50, cursor: Optional[str] = None) -> Tuple[list, Optional[str]]:
+    """Active transfers newest first, one page at a time: (transfers, next_cursor)"""
     if redis_client:
         try:
-            keys = redis_client.keys("aurascribe:auralink:*")
-            if isinstance(keys, list):
-                keys_list = keys
-            elif hasattr(keys, '__iter__') and not isinstance(keys, (str, bytes)):
-                keys_list = list(keys)
-            else:
-                keys_list = []
-            transfers = []
-            for key in keys_list[:limit]:
-                data = redis_client.get(key)
-                if data:
-                    transfers.append(json.loads(data))
-            transfers.sort(key=lambda x: x.get('created_at', ''), reverse=True)
-            return transfers
+            return transfer_index.page(limit, cursor)
         except redis.RedisError as e:
             logging.error(f"Redis error listing transfers: {e}")
-            return []
+            return [], None
     else:
-        if hasattr(_save_transfer, 'fallback'):
-            return list(_save_transfer.fallback.values())[:limit]
-        return []
+        return page_records(transfers_fallback.values(), limit, cursor)
 
 def _delete_transfer(transfer_id: str) -> bool:
     """Delete a transfer"""
     if redis_client:
         try:
-            key = _get_transfer_key(transfer_id)
-            redis_client.delete(key)
+            transfer_index.delete(transfer_id)
             return True
         except redis.RedisError as e:
             logging.error(f"Redis error deleting transfer: {e}")
             return False
     else:
-        if hasattr(_save_transfer, 'fallback'):
-            _save_transfer.fallback.pop(transfer_id, None)
+        transfers_fallback.pop(transfer_id)
         return True
 
 
@@ -1343,10 +1541,10 @@ def create_auralink_transfer():
 @app.route('/api/auralink/transfers', methods=['GET'])
 @api_key_required
 def list_auralink_transfers():
-    """List all active AuraLink transfers"""
+    """List active AuraLink transfers newest first (?limit=, ?cursor=next_cursor)"""
     try:
-        limit = request.args.get('limit', 50, type=int)
-        transfers = _list_transfers(limit)
+        limit = max(1, min(request.args.get('limit', 50, type=int), 500))
+        transfers, next_cursor = _list_transfers(limit, request.args.get('cursor') or None)
 
         # Remove sensitive data from response
         safe_transfers = []
@@ -1366,8 +1564,11 @@ def list_auralink_transfers():
         return jsonify({
             'success': True,
             'transfers': safe_transfers,
-            'count': len(safe_transfers)
+            'count': len(safe_transfers),
+            'next_cursor': next_cursor
         })
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         logging.error(f"Error listing AuraLink transfers: {e}")
         return jsonify({'error': str(e)}), 500
@@ -1502,10 +1703,11 @@ def push_session_to_emr(session_id):
 
         if result.get('success'):
             # Update session with EMR reference
-            session['emr_pushed'] = True
-            session['emr_document_id'] = result.get('emr_document_id')
-            session['emr_pushed_at'] = datetime.now().isoformat()
-            _save_session(session)
+            _update_session(session_id, {
+                'emr_pushed': True,
+                'emr_document_id': result.get('emr_document_id'),
+                'emr_pushed_at': datetime.now().isoformat()
+            })
 
         return jsonify(result)
 
@@ -1590,16 +1792,13 @@ def send_session_via_efax(session_id):
         )
 
         if result.get('success'):
-            # Update session with fax info
-            if 'fax_history' not in session:
-                session['fax_history'] = []
-            session['fax_history'].append({
+            # Update session with fax info (only this field is rewritten)
+            _update_session(session_id, {'fax_history': session.get('fax_history', []) + [{
                 'fax_id': result.get('fax_id'),
                 'recipient': fax_number,
                 'sent_at': datetime.now().isoformat(),
                 'status': result.get('status')
-            })
-            _save_session(session)
+            }]})
 
         return jsonify(result)
 
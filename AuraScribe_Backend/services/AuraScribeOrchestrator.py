@@ -1,20 +1,49 @@
-from agents.medical_persona_system import MedicalPersona
-import concurrent.futures
+from agents.medical_persona_system import get_persona
+from agents.transcript_analysis import TranscriptAnalysis
+from services.AuraScribeRouter import route_analysis
+from services.agent_executor import get_agent_executor, AGENT_OK, AGENT_ERROR
+from services.agent_process_pool import get_agent_process_pool
+from services.orchestration_cache import OrchestrationCache, CACHE_HIT, CACHE_MISS, source_fingerprint
+from services.orchestration_sessions import get_session_store
+from services.storage import get_redis
+import os
+import sys
+import threading
 import time
 import logging
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
-class Orchestrator:
-    """Enhanced orchestrator with parallel execution and confidence scoring"""
+# Overall deadline for one orchestration and the budget of each agent within it
+ORCHESTRATION_DEADLINE_MS = int(os.getenv('ORCHESTRATION_DEADLINE_MS', '30000'))
+AGENT_TIMEOUT_MS = int(os.getenv('AGENT_TIMEOUT_MS', '20000'))
+# Run only the agents the router says the transcript needs
+ORCHESTRATION_SELECTIVE = os.getenv('ORCHESTRATION_SELECTIVE', 'true').lower() == 'true'
+# Answer identical requests (same transcript, persona, options, agent code) from a result cache
+ORCHESTRATION_CACHE = os.getenv('ORCHESTRATION_CACHE', 'true').lower() == 'true'
+
+# Agent -> agents whose output it consumes (payload["upstream"]). Independent agents run
+# in parallel; a dependent starts as soon as its inputs have finished. Dependencies that
+# are skipped or unavailable are simply absent from "upstream".
+AGENT_DEPENDENCIES = {
+    'ComplianceMonitorAgent': ('ClinicalDocumentationAgent',),
+    'RAMQ_BillingAgent': ('ClinicalDocumentationAgent',),
+    'TaskManagerAgent': ('MADO_ReportingAgent', 'PrescriptionLabAgent'),
+}
+
+# Events of Orchestrator.stream_transcript_parallel / stream_orchestration
+EVENT_STARTED = 'started'
+EVENT_AGENT_RESULT = 'agent_result'
+EVENT_COMPLETE = 'complete'
 
-    def __init__(self):
-        self.current_persona = MedicalPersona("generalist")
-        self.execution_stats = {}
+class Orchestrator:
+    """
+    Enhanced orchestrator with parallel execution and confidence scoring.
 
-    def set_persona(self, persona_key):
-        self.current_persona = MedicalPersona(persona_key)
+    Stateless: everything a run needs (persona, payload, results) is local to the
+    call, so one instance serves concurrent requests from any thread or greenlet.
+    """
 
     def _run_single_agent(self, agent, agent_name, payload):
         """Run a single agent with timing and error handling"""
@@ -23,7 +52,11 @@ class Orchestrator:
 
         start_time = time.time()
         try:
-            result = agent.run(payload)
+            process_pool = get_agent_process_pool()
+            if process_pool is not None:
+                result = process_pool.run(agent_name, payload, timeout=AGENT_TIMEOUT_MS / 1000.0)
+            else:
+                result = agent.run(payload)
             execution_time = time.time() - start_time
 
             # Add metadata to result
@@ -46,60 +79,113 @@ class Orchestrator:
                 }
             }
 
-    def orchestrate_transcript_parallel(self, transcript_text, persona_key="generalist"):
-        """Run all agents in parallel for faster processing"""
-        self.set_persona(persona_key)
-        persona_summary = self.current_persona.get_persona_summary()
-
-        # Build payload with persona context
+    def _agent_node(self, agent, agent_name, payload):
+        """Graph node: run the agent with its dependencies' results as payload["upstream"]"""
+        def node(upstream):
+            return self._run_single_agent(agent, agent_name, {**payload, "upstream": upstream})
+        return node
+
+    def orchestrate_transcript_parallel(self, transcript_text, persona_key="generalist", deadline_ms=None,
+                                        selective=False, analysis=None):
+        """Run the agents as a dependency graph (AGENT_DEPENDENCIES) on the shared agent executor.
+
+        Agents that miss their deadline are reported with status 'timeout' and the
+        results gathered so far are returned (partial result). With ``selective``,
+        agents the router finds no use for are skipped and listed in execution_stats.
+        Per-agent timings and the critical path are reported in execution_stats.
+        ``analysis`` is a prebuilt TranscriptAnalysis of ``transcript_text`` (e.g. an
+        incremental one kept by a dictation session).
+        """
+        for event, _, data in self.stream_transcript_parallel(transcript_text, persona_key, deadline_ms,
+                                                              selective, analysis):
+            if event == EVENT_COMPLETE:
+                return data
+
+    def stream_transcript_parallel(self, transcript_text, persona_key="generalist", deadline_ms=None,
+                                   selective=False, analysis=None):
+        """Generator form of orchestrate_transcript_parallel.
+
+        Yields ``(event, agent_name, data)``: EVENT_STARTED with the agents about to
+        run, one EVENT_AGENT_RESULT per agent as soon as it settles (success, error
+        or timeout; skipped agents first, with their "nothing found" result), then
+        EVENT_COMPLETE with the full orchestration result.
+        """
+        persona_summary = get_persona(persona_key).get_persona_summary()
+
+        # Build payload with persona context and the shared single-pass analysis
+        analysis_start = time.time()
         payload = {
             "transcript": transcript_text,
             "persona": persona_key,
-            "persona_summary": persona_summary
+            "persona_summary": persona_summary,
+            "analysis": analysis if analysis is not None else TranscriptAnalysis(transcript_text)
         }
+        routing = route_analysis(payload["analysis"]) if selective else None
+        analysis_time = time.time() - analysis_start
 
         # Define agents to run
-        agents_to_run = [
+        agents_to_run, skipped = _select_agents([
             (clinical_doc_agent, 'ClinicalDocumentationAgent'),
             (prescription_lab_agent, 'PrescriptionLabAgent'),
             (mado_agent, 'MADO_ReportingAgent'),
             (compliance_agent, 'ComplianceMonitorAgent'),
             (ramq_billing_agent, 'RAMQ_BillingAgent'),
             (task_manager_agent, 'TaskManagerAgent'),
-        ]
+        ], routing)
+        yield EVENT_STARTED, None, {
+            "agents": [name for agent, name in agents_to_run if agent is not None],
+            "agents_skipped": skipped,
+            **({"routing": routing} if routing else {})
+        }
 
-        agent_results = {}
+        # Skipped agents still get their empty result, so consumers find every agent's key
+        agent_results = _skipped_results(skipped, persona_key)
+        for agent_name, result in agent_results.items():
+            yield EVENT_AGENT_RESULT, agent_name, result
         total_start = time.time()
 
-        # Run agents in parallel using ThreadPoolExecutor
-        with concurrent.futures.ThreadPoolExecutor(max_workers=6) as executor:
-            future_to_agent = {
-                executor.submit(self._run_single_agent, agent, name, payload): name
-                for agent, name in agents_to_run if agent is not None
-            }
-
-            for future in concurrent.futures.as_completed(future_to_agent):
-                agent_name = future_to_agent[future]
-                try:
-                    result = future.result(timeout=30)
-                    agent_results[agent_name] = result
-                except concurrent.futures.TimeoutError:
-                    agent_results[agent_name] = {"error": "Agent timed out", "status": "timeout"}
-                except Exception as e:
-                    agent_results[agent_name] = {"error": str(e), "status": "error"}
+        # Run the agent graph on the process-wide executor (bounded threads, real deadlines)
+        deadline_ms = deadline_ms or ORCHESTRATION_DEADLINE_MS
+        executor = get_agent_executor()
+        nodes = [
+            (name, self._agent_node(agent, name, payload), AGENT_DEPENDENCIES.get(name, ()))
+            for agent, name in agents_to_run if agent is not None
+        ]
+        timings = {}
+        timed_out = []
+        for agent_name, status, result in executor.iter_graph(
+            nodes,
+            deadline=deadline_ms / 1000.0,
+            agent_timeout=min(AGENT_TIMEOUT_MS, deadline_ms) / 1000.0,
+            timings=timings
+        ):
+            if status == AGENT_OK:
+                agent_results[agent_name] = result
+            elif status == AGENT_ERROR:
+                agent_results[agent_name] = {"error": str(result), "status": "error"}
+            else:
+                timed_out.append(agent_name)
+                agent_results[agent_name] = {
+                    "error": "Agent timed out" if status == 'timeout' else "Agent executor saturated",
+                    "status": status,
+                    "_meta": {'agent_name': agent_name, 'status': status}
+                }
+            yield EVENT_AGENT_RESULT, agent_name, agent_results[agent_name]
+        critical_path, critical_path_ms = _critical_path(timings)
 
         total_time = time.time() - total_start
 
         # Calculate overall confidence and summary
-        executed_agents = [name for name, result in agent_results.items()
+        ran = {name: result for name, result in agent_results.items() if name not in skipped}
+        executed_agents = [name for name, result in ran.items()
                          if result and result.get('_meta', {}).get('status') == 'success']
-        failed_agents = [name for name, result in agent_results.items()
+        failed_agents = [name for name, result in ran.items()
                         if result and result.get('_meta', {}).get('status') != 'success']
 
         # Generate smart summary based on results
         summary = self._generate_orchestration_summary(agent_results, transcript_text)
 
-        return {
+        result = {
             "orchestrator": "AuraScribeOrchestrator",
             "version": "2.0",
             "transcript": transcript_text,
@@ -110,14 +196,27 @@ class Orchestrator:
             "agent_results": agent_results,
             "execution_stats": {
                 "total_time_ms": round(total_time * 1000, 2),
-                "agents_run": len(agents_to_run),
+                "analysis_time_ms": round(analysis_time * 1000, 2),
+                "agents_run": len(nodes),
                 "agents_succeeded": len(executed_agents),
+                "agents_timed_out": timed_out,
+                "agents_skipped": list(skipped),
+                "skip_reasons": skipped,
+                "selective": bool(selective),
+                "partial": bool(timed_out),
+                "deadline_ms": deadline_ms,
+                "agent_timings": timings,
+                "critical_path": critical_path,
+                "critical_path_ms": critical_path_ms,
                 "parallel_execution": True
             },
             "summary": summary,
-            "confidence": self._calculate_overall_confidence(agent_results),
+            "confidence": self._calculate_overall_confidence(ran),
             "timestamp": datetime.now().isoformat()
         }
+        if routing:
+            result["routing"] = routing
+        yield EVENT_COMPLETE, None, result
 
     def _generate_orchestration_summary(self, agent_results, transcript):
         """Generate intelligent summary based on all agent outputs"""
@@ -242,6 +341,55 @@ except ImportError as e:
     logger.warning(f"Could not import TaskManagerAgent: {e}")
     task_manager_agent = None
 
+def _critical_path(timings):
+    """Longest chain of dependent agents by measured run time: (names, total ms)"""
+    longest = {}
+
+    def chain(name):
+        if name not in longest:
+            best = ([], 0.0)
+            for dep in AGENT_DEPENDENCIES.get(name, ()):
+                if dep in timings and 'duration_ms' in timings[dep]:
+                    candidate = chain(dep)
+                    if candidate[1] > best[1]:
+                        best = candidate
+            longest[name] = (best[0] + [name], round(best[1] + timings[name]['duration_ms'], 2))
+        return longest[name]
+
+    paths = [chain(name) for name, timing in timings.items() if 'duration_ms' in timing]
+    return max(paths, key=lambda path: path[1]) if paths else ([], 0.0)
+
+
+def _select_agents(agents, routing):
+    """Split ``(agent, name)`` pairs into those to run and ``{name: reason}`` for skipped ones"""
+    if not routing:
+        return agents, {}
+    skipped = {name: routing["skipped_agents"][name] for _, name in agents if name in routing["skipped_agents"]}
+    return [(agent, name) for agent, name in agents if name not in skipped], skipped
+
+
+# What each skippable agent returns when the transcript gives it nothing to report
+SKIPPED_AGENT_RESULTS = {
+    "MADO_ReportingAgent": {"mado_detected": False, "report_required": False},
+    "PrescriptionLabAgent": {"prescription": None, "lab_order": None},
+    "CustomFormAgent": {"forms_generated": [], "status": "no_forms_needed"},
+}
+
+
+def _skipped_results(skipped, persona_key):
+    """Empty agent results for ``{name: reason}`` skipped by the router"""
+    return {
+        name: {
+            **SKIPPED_AGENT_RESULTS.get(name, {}),
+            "persona_used": persona_key,
+            "skipped": True,
+            "skip_reason": reason,
+            "_meta": {'agent_name': name, 'status': 'skipped'}
+        }
+        for name, reason in skipped.items()
+    }
+
+
 def _run_agent_safe(agent, name, transcript_text):
     """Safely run an agent, returning empty dict if agent is None or fails."""
     if agent is None:
@@ -254,51 +402,225 @@ def _run_agent_safe(agent, name, transcript_text):
         return {"error": str(e)}
 
 
-# Global orchestrator instance for parallel execution
-_orchestrator_instance = None
+# Shared orchestrator instance (stateless, safe to use from concurrent requests)
+_orchestrator_instance = Orchestrator()
 
 def _get_orchestrator():
-    """Get or create orchestrator instance"""
-    global _orchestrator_instance
-    if _orchestrator_instance is None:
-        _orchestrator_instance = Orchestrator()
+    """Get the shared orchestrator instance"""
     return _orchestrator_instance
 
 
-def orchestrate_transcript(transcript_text, persona_key="generalist", use_parallel=True):
+def _loaded_agent_names():
+    return [name for name, agent in (
+        ('ClinicalDocumentationAgent', clinical_doc_agent),
+        ('PrescriptionLabAgent', prescription_lab_agent),
+        ('MADO_ReportingAgent', mado_agent),
+        ('ComplianceMonitorAgent', compliance_agent),
+        ('RAMQ_BillingAgent', ramq_billing_agent),
+        ('CustomFormAgent', custom_form_agent),
+        ('TaskManagerAgent', task_manager_agent),
+    ) if agent is not None]
+
+
+_fingerprint = None
+
+def _agent_fingerprint():
+    """Hash of the code that shapes a result: loaded agents, analysis, routing and this module"""
+    global _fingerprint
+    if _fingerprint is None:
+        modules = [type(agent).__module__ for agent in (
+            clinical_doc_agent, prescription_lab_agent, mado_agent, compliance_agent,
+            ramq_billing_agent, custom_form_agent, task_manager_agent) if agent is not None]
+        modules += [__name__, 'services.AuraScribeRouter', 'agents.transcript_analysis',
+                    'agents.keyword_matcher', 'agents.medical_persona_system']
+        paths = [getattr(sys.modules.get(name), '__file__', None) or name for name in modules]
+        _fingerprint = source_fingerprint(paths, salt=os.getenv('ORCHESTRATION_CACHE_VERSION', ''))
+    return _fingerprint
+
+
+def _is_cacheable(result):
+    """Only complete results are reused: no timeouts, no failed agents"""
+    if result.get("execution_stats", {}).get("partial") or result.get("agents_failed"):
+        return False
+    return not any(isinstance(r, dict) and r.get("error") for r in result.get("agent_results", {}).values())
+
+
+_result_cache = None
+_result_cache_lock = threading.Lock()
+
+def _get_result_cache():
+    """Process-wide result cache (None when ORCHESTRATION_CACHE is off); in-process only if Redis is down"""
+    global _result_cache
+    if not ORCHESTRATION_CACHE:
+        return None
+    if _result_cache is None:
+        with _result_cache_lock:
+            if _result_cache is None:
+                client = get_redis()
+                if client is None:
+                    logger.warning("Orchestration cache without Redis")
+                _result_cache = OrchestrationCache(
+                    client,
+                    ttl=int(os.getenv('ORCHESTRATION_CACHE_TTL', '86400')),
+                    max_entries=int(os.getenv('ORCHESTRATION_CACHE_SIZE', '128'))
+                )
+    return _result_cache
+
+
+def get_result_cache_stats():
+    cache = _get_result_cache()
+    return {**cache.get_stats(), 'fingerprint': _agent_fingerprint()[:16]} if cache else None
+
+
+def orchestrate_transcript(transcript_text, persona_key="generalist", use_parallel=True, selective=None,
+                           use_cache=True):
     """
-    Production orchestrator: runs all agents and aggregates their outputs.
+    Production orchestrator: runs the agents and aggregates their outputs.
 
     Args:
         transcript_text: The medical transcript to process
         persona_key: Medical specialty persona (generalist, cardiologist, etc.)
         use_parallel: If True, runs agents in parallel for better performance
+        selective: Run only the agents the router selects (default: ORCHESTRATION_SELECTIVE)
+        use_cache: Answer identical requests from the result cache (ORCHESTRATION_CACHE)
 
     Returns:
-        dict with agent results, summary, confidence score, and execution stats
+        dict with agent results, summary, confidence score, and execution stats;
+        "cache" tells whether it was computed ('miss'), cached ('hit') or taken from
+        an identical concurrent request ('shared')
+    """
+    if selective is None:
+        selective = ORCHESTRATION_SELECTIVE
+
+    cache = _get_result_cache() if use_cache else None
+    if cache is None:
+        result = _orchestrate_uncached(transcript_text, persona_key, use_parallel, selective)
+        return {**result, "cache": {"status": "bypass"}}
+
+    key = _cache_key(transcript_text, persona_key, use_parallel, selective)
+    result, status, tier = cache.get_or_compute(
+        key,
+        lambda: _orchestrate_uncached(transcript_text, persona_key, use_parallel, selective),
+        cacheable=_is_cacheable,
+        wait_timeout=ORCHESTRATION_DEADLINE_MS / 1000.0
+    )
+    return _with_cache_info(result, transcript_text, key, status, tier)
+
+
+def stream_orchestration(transcript_text, persona_key="generalist", selective=None, use_cache=True):
+    """
+    Streaming orchestrate_transcript (parallel mode).
+
+    Yields ``(event, agent_name, data)`` like Orchestrator.stream_transcript_parallel:
+    EVENT_STARTED, one EVENT_AGENT_RESULT per agent as it finishes, then EVENT_COMPLETE
+    with the full result (including "cache"). A cached result is replayed at once.
     """
+    if selective is None:
+        selective = ORCHESTRATION_SELECTIVE
+
+    cache = _get_result_cache() if use_cache else None
+    key = _cache_key(transcript_text, persona_key, True, selective) if cache is not None else None
+    if cache is not None:
+        cached, tier = cache.lookup(key)
+        if cached is not None:
+            stats = cached.get("execution_stats", {})
+            yield EVENT_STARTED, None, {
+                "agents": list(cached.get("agent_results", {})),
+                "agents_skipped": stats.get("skip_reasons", {}),
+                **({"routing": cached["routing"]} if cached.get("routing") else {})
+            }
+            for agent_name, agent_result in cached.get("agent_results", {}).items():
+                yield EVENT_AGENT_RESULT, agent_name, agent_result
+            yield EVENT_COMPLETE, None, _with_cache_info(cached, transcript_text, key, CACHE_HIT, tier)
+            return
+
+    for event, agent_name, data in _get_orchestrator().stream_transcript_parallel(
+            transcript_text, persona_key, selective=selective):
+        if event == EVENT_COMPLETE:
+            if cache is None:
+                data = {**data, "cache": {"status": "bypass"}}
+            else:
+                if _is_cacheable(data):
+                    cache.set(key, data)
+                data = _with_cache_info(data, transcript_text, key, CACHE_MISS, None)
+        yield event, agent_name, data
+
+
+def orchestration_event(event, agent_name, data):
+    """JSON-ready form of a stream_orchestration event (SSE/NDJSON line or Socket.IO payload)"""
+    if event == EVENT_AGENT_RESULT:
+        status = data.get('_meta', {}).get('status') or data.get('status', 'success')
+        return {"event": event, "agent": agent_name, "status": status, "result": data}
+    if event == EVENT_COMPLETE:
+        # Agent results were already sent one by one; the transcript is the caller's own
+        return {"event": event, **{k: v for k, v in data.items() if k not in ("agent_results", "transcript")}}
+    return {"event": event, **data}
+
+
+def _cache_key(transcript_text, persona_key, use_parallel, selective):
+    return OrchestrationCache.make_key(transcript_text, persona_key, _loaded_agent_names(), _agent_fingerprint(),
+                                       parallel=bool(use_parallel), selective=bool(selective))
+
+
+def _with_cache_info(result, transcript_text, key, status, tier):
+    # Keys use the normalised transcript; echo back exactly what this caller sent
+    return {
+        **result,
+        "transcript": transcript_text,
+        "transcript_length": len(transcript_text),
+        "cache": {"status": status, "tier": tier, "key": key.split(':', 1)[0][:16]}
+    }
+
+
+def _orchestrate_uncached(transcript_text, persona_key, use_parallel, selective):
     # Use parallel execution for better performance
     if use_parallel:
         orchestrator = _get_orchestrator()
-        return orchestrator.orchestrate_transcript_parallel(transcript_text, persona_key)
+        return orchestrator.orchestrate_transcript_parallel(transcript_text, persona_key, selective=selective)
 
     # Fallback to sequential execution
     agent_results = {}
 
     # Build payload with persona
-    payload = {"transcript": transcript_text, "persona": persona_key}
-
-    # Run each agent safely and collect results
-    agent_results['ClinicalDocumentationAgent'] = _run_agent_safe(clinical_doc_agent, 'ClinicalDocumentationAgent', payload)
-    agent_results['ComplianceMonitorAgent'] = _run_agent_safe(compliance_agent, 'ComplianceMonitorAgent', payload)
-    agent_results['CustomFormAgent'] = _run_agent_safe(custom_form_agent, 'CustomFormAgent', payload)
-    agent_results['MADO_ReportingAgent'] = _run_agent_safe(mado_agent, 'MADO_ReportingAgent', payload)
-    agent_results['PrescriptionLabAgent'] = _run_agent_safe(prescription_lab_agent, 'PrescriptionLabAgent', payload)
-    agent_results['RAMQ_BillingAgent'] = _run_agent_safe(ramq_billing_agent, 'RAMQ_BillingAgent', payload)
-    agent_results['TaskManagerAgent'] = _run_agent_safe(task_manager_agent, 'TaskManagerAgent', payload)
+    analysis_start = time.time()
+    payload = {"transcript": transcript_text, "persona": persona_key, "analysis": TranscriptAnalysis(transcript_text)}
+    routing = route_analysis(payload["analysis"]) if selective else None
+    analysis_time = time.time() - analysis_start
+
+    agents_to_run, skipped = _select_agents([
+        (clinical_doc_agent, 'ClinicalDocumentationAgent'),
+        (compliance_agent, 'ComplianceMonitorAgent'),
+        (custom_form_agent, 'CustomFormAgent'),
+        (mado_agent, 'MADO_ReportingAgent'),
+        (prescription_lab_agent, 'PrescriptionLabAgent'),
+        (ramq_billing_agent, 'RAMQ_BillingAgent'),
+        (task_manager_agent, 'TaskManagerAgent'),
+    ], routing)
+
+    # Run each agent safely and collect results (list order respects AGENT_DEPENDENCIES);
+    # like the parallel graph, failed dependencies are not passed downstream
+    timings = {}
+    total_start = time.time()
+    for agent, name in agents_to_run:
+        upstream = {dep: agent_results[dep] for dep in AGENT_DEPENDENCIES.get(name, ())
+                    if agent_results.get(dep) and 'error' not in agent_results[dep]}
+        started = time.time()
+        agent_results[name] = _run_agent_safe(agent, name, {**payload, "upstream": upstream})
+        finished = time.time()
+        timings[name] = {
+            'status': AGENT_ERROR if 'error' in agent_results[name] else AGENT_OK,
+            'submitted_ms': round((started - total_start) * 1000, 2),
+            'started_ms': round((started - total_start) * 1000, 2),
+            'finished_ms': round((finished - total_start) * 1000, 2),
+            'duration_ms': round((finished - started) * 1000, 2)
+        }
+    total_time = time.time() - total_start
+    critical_path, critical_path_ms = _critical_path(timings)
 
     # Filter out agents that actually ran
     executed_agents = [name for name, result in agent_results.items() if result and 'error' not in result]
+    failed_agents = [name for name in agent_results if name not in executed_agents]
+    agent_results.update(_skipped_results(skipped, persona_key))
 
     return {
         "orchestrator": "AuraScribeOrchestrator",
@@ -307,8 +629,108 @@ def orchestrate_transcript(transcript_text, persona_key="generalist", use_parall
         "transcript_length": len(transcript_text),
         "persona": persona_key,
         "agents_executed": executed_agents,
+        "agents_failed": failed_agents,
         "agent_results": agent_results,
+        "execution_stats": {
+            "total_time_ms": round(total_time * 1000, 2),
+            "analysis_time_ms": round(analysis_time * 1000, 2),
+            "agents_run": len(timings),
+            "agents_succeeded": len(executed_agents),
+            "agents_timed_out": [],
+            "agents_skipped": list(skipped),
+            "skip_reasons": skipped,
+            "selective": bool(selective),
+            "partial": False,
+            "deadline_ms": None,
+            "agent_timings": timings,
+            "critical_path": critical_path,
+            "critical_path_ms": critical_path_ms,
+            "parallel_execution": False
+        },
+        **({"routing": routing} if routing else {}),
         "summary": "Medical case processed successfully",
         "next_steps": "Review documentation and complete tasks",
         "timestamp": datetime.now().isoformat()
-    }
\ No newline at end of file
+    }
+
+
+class ResyncRequired(Exception):
+    """A segment was posted but this worker has no prior text for the session; resend the full transcript"""
+
+    def __init__(self, session_id, known_length):
+        super().__init__(f"Session {session_id} has no prior state here; send the full transcript")
+        self.session_id = session_id
+        self.known_length = known_length
+
+
+def orchestrate_incremental(session_id, transcript_text=None, segment=None, persona_key="generalist",
+                            selective=None, reset=False, offset=None):
+    """
+    Orchestrate a dictation that grows over time, keyed by ``session_id``.
+
+    Post either the whole transcript so far (``transcript_text``) or just the newly
+    dictated ``segment``. The session's analysis is extended with the new text
+    only (keyword matches, patient identifiers and other lookups are carried over),
+    then the agents rebuild their outputs from it. A transcript that no longer
+    starts with the session's text (an edit), a persona change or ``reset`` starts
+    the session over. execution_stats["incremental"] reports what was done.
+
+    A segment is only appended to text this worker already holds: when the session
+    is unknown here (first post, evicted, expired, served by another worker), was
+    reset or changed persona, or ``offset`` (length of the transcript before the
+    segment) does not match, ResyncRequired is raised unless ``transcript_text`` was
+    sent too. ``offset=0`` declares the segment to be the start of the dictation.
+    Segments are joined with a space unless one already sits at the boundary.
+    """
+    if selective is None:
+        selective = ORCHESTRATION_SELECTIVE
+
+    session = get_session_store().get_or_create(session_id, persona_key)
+    with session.lock:
+        restart = reset or session.persona_key != persona_key
+        if segment is not None:
+            known = "" if restart else session.analysis.text
+            has_state = not restart and (bool(known) or session.updates > 0)
+            if offset is not None:
+                has_state = offset == len(known)
+            if not has_state and offset != 0:
+                if transcript_text is None:
+                    raise ResyncRequired(session_id, len(known))
+                segment = None  # Rebuild from the full transcript sent along
+        if restart:
+            session.reset(persona_key)
+        previous = session.analysis.text
+        if segment is not None:
+            if previous and segment and not previous[-1].isspace() and not segment[0].isspace():
+                segment = " " + segment
+            new_text = segment
+        elif (transcript_text or "").startswith(previous):
+            new_text = (transcript_text or "")[len(previous):]
+        else:
+            # The transcript was edited, not just extended: start over
+            session.reset(persona_key)
+            previous, new_text = "", transcript_text or ""
+
+        if not new_text and session.result is not None:
+            stats = {**session.result["execution_stats"],
+                     "incremental": {"session_id": session_id, "mode": "unchanged",
+                                     "segment_length": 0, "updates": session.updates}}
+            return {**session.result, "execution_stats": stats}
+
+        extend_start = time.time()
+        session.analysis.extend(new_text)
+        extend_time = time.time() - extend_start
+
+        result = _get_orchestrator().orchestrate_transcript_parallel(
+            session.analysis.text, persona_key, selective=selective, analysis=session.analysis
+        )
+        session.updates += 1
+        result["execution_stats"]["incremental"] = {
+            "session_id": session_id,
+            "mode": "incremental" if previous else "full",
+            "segment_length": len(new_text),
+            "extend_time_ms": round(extend_time * 1000, 2),
+            "updates": session.updates
+        }
+        session.result = result
+        return result
@@ -10,29 +10,83 @@
 # Agent definitions are commented out until google.adk is available
 # See the original agent definitions in version control history
 
-# Simple wrapper function for integration
-def route_transcript(transcript_text):
+# Local rule-based router: decides which orchestration agents a transcript needs
+# from the shared keyword hits (agents/keyword_matcher.py), so routine visits
+# skip the agents that would only report "nothing found".
+
+from datetime import datetime
+
+from agents.transcript_analysis import TranscriptAnalysis
+
+# Agents that document every visit (SOAP note, compliance, base billing code, reminders)
+ALWAYS_RUN_AGENTS = (
+    "ClinicalDocumentationAgent",
+    "ComplianceMonitorAgent",
+    "RAMQ_BillingAgent",
+    "TaskManagerAgent",
+)
+
+# Content-dependent agents and the vocabularies that make them worth running
+AGENT_VOCABULARIES = {
+    "MADO_ReportingAgent": ("mado.urgent_diseases", "mado.diseases_48h", "mado.related_keywords"),
+    "PrescriptionLabAgent": ("prescription_lab.medications", "prescription_lab.labs"),
+    "CustomFormAgent": ("custom_form.work", "custom_form.school", "custom_form.insurance",
+                        "custom_form.disability", "custom_form.referral"),
+}
+
+SKIP_REASONS = {
+    "MADO_ReportingAgent": "no reportable-disease vocabulary",
+    "PrescriptionLabAgent": "no medication or lab vocabulary",
+    "CustomFormAgent": "no form or referral vocabulary",
+}
+
+
+def route_analysis(analysis):
+    """Routing decision for an already analysed transcript"""
+    required = list(ALWAYS_RUN_AGENTS)
+    skipped = {}
+    for agent_name, vocab_ids in AGENT_VOCABULARIES.items():
+        if any(analysis.vocabulary(vocab_id) for vocab_id in vocab_ids):
+            required.append(agent_name)
+        else:
+            skipped[agent_name] = SKIP_REASONS[agent_name]
+
+    labs = analysis.vocabulary("prescription_lab.labs")
+    billing_codes = ["basic_consultation"]
+    billing_codes += [code for code in ("extended_consult", "emergency") if analysis.vocabulary(f"ramq_billing.{code}")]
+    urgent = bool(analysis.vocabulary("mado.urgent_diseases") or analysis.vocabulary("ramq_billing.emergency"))
+
+    return {
+        "required_agents": required,
+        "optional_agents": [],
+        "skipped_agents": skipped,
+        "triggers": {
+            "mado_required": "MADO_ReportingAgent" in required,
+            "prescription_needed": bool(analysis.vocabulary("prescription_lab.medications")),
+            "lab_orders": labs,
+            "billing_codes": billing_codes,
+            "custom_forms": [vocab_id.split(".", 1)[1] for vocab_id in AGENT_VOCABULARIES["CustomFormAgent"]
+                             if analysis.vocabulary(vocab_id)]
+        },
+        "priority": "urgent" if urgent else "routine"
+    }
+
+
+def route_transcript(transcript_text, analysis=None):
     """
-    Simple wrapper to use the router agent
-    For integration with Flask API
+    Route a transcript for the Flask API.
+    Pass the orchestrator's TranscriptAnalysis to avoid re-scanning the text.
     """
-    # For now, return mock data
-    # In production, this would call the actual router agent
+    analysis = analysis or TranscriptAnalysis(transcript_text)
+    return routing_payload(transcript_text, route_analysis(analysis))
+
+
+def routing_payload(transcript_text, routing, timestamp=None):
+    """API shape of a routing decision (``routing`` from route_analysis, e.g. an orchestration's "routing")"""
     return {
         "router": "AuraScribeRouter",
         "transcript": transcript_text[:100] + "..." if len(transcript_text) > 100 else transcript_text,
-        "analysis": {
-            "required_agents": ["ClinicalDocumentationAgent", "TaskManagerAgent", "ComplianceMonitorAgent"],
-            "optional_agents": [],
-            "triggers": {
-                "mado_required": False,
-                "prescription_needed": False,
-                "lab_orders": [],
-                "billing_codes": ["basic_consultation"],
-                "custom_forms": []
-            },
-            "priority": "routine"
-        },
+        "analysis": routing,
         "note": "Router analysis complete",
-        "timestamp": "2024-01-14T10:00:00Z"
-    }
\ No newline at end of file
+        "timestamp": timestamp or datetime.now().isoformat()
+    }
@@ -0,0 +1,236 @@
+"""
+agent_executor.py
+Process-wide bounded executor for orchestration agents.
+
+One thread pool is shared by every orchestration request. A global in-flight
+limit caps queued + running agent tasks across requests, and each batch is
+bounded by an overall deadline plus a per-agent timeout: stragglers are
+cancelled (if still queued) or abandoned (if running) and the batch returns
+whatever finished in time. A batch is either a flat fan-out (run_all) or a
+dependency graph (run_graph) whose nodes start as soon as their inputs are ready;
+iter_graph reports each node as it settles, for callers that stream results.
+"""
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+AGENT_OK = 'success'
+AGENT_TIMEOUT = 'timeout'
+AGENT_REJECTED = 'rejected'
+AGENT_ERROR = 'error'
+
+
+class AgentExecutor:
+    """Shared worker pool with admission control, deadlines and queue metrics"""
+
+    def __init__(self, workers: int = 8, max_inflight: int = 32):
+        self.workers = workers
+        self.max_inflight = max_inflight
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='aurascribe-agent')
+        self._slots = threading.BoundedSemaphore(max_inflight)
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self.stats = {
+            'submitted': 0,
+            'completed': 0,
+            'timed_out': 0,
+            'cancelled': 0,
+            'rejected': 0,
+            'abandoned_running': 0,
+            'max_queue_depth': 0
+        }
+
+    def run_all(self, tasks: List[Tuple[str, Callable[..., Any], tuple]],
+                deadline: float, agent_timeout: float) -> Dict[str, Tuple[str, Any]]:
+        """
+        Run ``(name, func, args)`` tasks and wait at most ``deadline`` seconds overall
+        and ``agent_timeout`` seconds per task (measured from submission).
+
+        Returns ``{name: (status, result)}`` for every task; ``result`` is None unless
+        the status is AGENT_OK.
+        """
+        nodes = [(name, lambda upstream, func=func, args=args: func(*args), ()) for name, func, args in tasks]
+        results, _ = self.run_graph(nodes, deadline, agent_timeout)
+        return results
+
+    def run_graph(self, nodes: List[Tuple[str, Callable[[Dict[str, Any]], Any], Tuple[str, ...]]],
+                  deadline: float, agent_timeout: float) -> Tuple[Dict[str, Tuple[str, Any]], Dict[str, Dict[str, Any]]]:
+        """
+        Run a dependency graph of ``(name, func, depends_on)`` nodes.
+
+        Nodes with no pending dependencies run in parallel; a node is submitted as
+        soon as all its dependencies have finished (whatever their status) and
+        ``func`` is called with ``{dependency: result}`` for the ones that succeeded.
+        Dependencies that are not nodes of the graph are ignored.
+
+        Returns ``({name: (status, result)}, {name: timings})`` where timings hold
+        ``submitted_ms``/``started_ms``/``finished_ms`` offsets from the start of
+        the batch and the node's own ``duration_ms``.
+        """
+        timings: Dict[str, Dict[str, Any]] = {}
+        results = {name: (status, result) for name, status, result in self.iter_graph(nodes, deadline, agent_timeout, timings)}
+        return results, timings
+
+    def iter_graph(self, nodes: List[Tuple[str, Callable[[Dict[str, Any]], Any], Tuple[str, ...]]],
+                   deadline: float, agent_timeout: float,
+                   timings: Optional[Dict[str, Dict[str, Any]]] = None) -> Iterator[Tuple[str, str, Any]]:
+        """
+        Generator form of run_graph: yields ``(name, status, result)`` as each node
+        settles (in completion order) and fills ``timings`` once the graph is done.
+        """
+        started = time.monotonic()
+        batch_deadline = started + deadline
+        names = {name for name, _, _ in nodes}
+        waiting = {name: (func, {dep for dep in depends_on if dep in names and dep != name})
+                   for name, func, depends_on in nodes}
+        results: Dict[str, Tuple[str, Any]] = {}
+        settled: List[str] = []
+        submitted: Dict[str, float] = {}
+        marks: Dict[str, Dict[str, float]] = {}
+        pending = {}
+
+        def offset_ms(moment: float) -> float:
+            return round((moment - started) * 1000, 2)
+
+        def settle(name: str, status: str, result: Any = None):
+            results[name] = (status, result)
+            settled.append(name)
+
+        def submit_ready():
+            for name, (func, deps) in list(waiting.items()):
+                if not deps.issubset(results):
+                    continue
+                del waiting[name]
+                remaining = batch_deadline - time.monotonic()
+                if remaining <= 0:
+                    settle(name, AGENT_TIMEOUT)
+                    continue
+                if not self._slots.acquire(timeout=remaining):
+                    with self._lock:
+                        self.stats['rejected'] += 1
+                    logger.warning(f"Agent executor saturated ({self.max_inflight} in flight), skipping {name}")
+                    settle(name, AGENT_REJECTED)
+                    continue
+                upstream = {dep: results[dep][1] for dep in deps if results[dep][0] == AGENT_OK}
+                submitted[name] = time.monotonic()
+                marks[name] = {}
+                future = self._submit(func, (upstream,), marks[name])
+                pending[future] = (name, min(time.monotonic() + agent_timeout, batch_deadline))
+
+        def drain():
+            while settled:
+                name = settled.pop(0)
+                yield (name, *results[name])
+
+        submit_ready()
+        yield from drain()
+        while pending:
+            now = time.monotonic()
+            next_deadline = min(task_deadline for _, task_deadline in pending.values())
+            done, _ = wait(list(pending), timeout=max(0.0, next_deadline - now), return_when=FIRST_COMPLETED)
+            for future in done:
+                name, _ = pending.pop(future)
+                try:
+                    settle(name, AGENT_OK, future.result())
+                except Exception as e:
+                    settle(name, AGENT_ERROR, e)
+            now = time.monotonic()
+            for future, (name, task_deadline) in list(pending.items()):
+                if task_deadline <= now:
+                    del pending[future]
+                    self._abandon(future, name)
+                    settle(name, AGENT_TIMEOUT)
+            # Submit dependents before reporting: the consumer may be slow (e.g. writing to a client)
+            submit_ready()
+            yield from drain()
+
+        # Anything still waiting depends on a cycle
+        for name in waiting:
+            logger.error(f"Agent {name} not run: dependency cycle")
+            settle(name, AGENT_ERROR, RuntimeError(f"Dependency cycle involving {name}"))
+        yield from drain()
+
+        if timings is None:
+            return
+        for name, submitted_at in submitted.items():
+            # Snapshot: an abandoned task may still record its finish later
+            mark = dict(marks[name])
+            timing = timings[name] = {'status': results[name][0], 'submitted_ms': offset_ms(submitted_at)}
+            if 'started' in mark:
+                timing['started_ms'] = offset_ms(mark['started'])
+            if 'started' in mark and 'finished' in mark and results[name][0] in (AGENT_OK, AGENT_ERROR):
+                timing['finished_ms'] = offset_ms(mark['finished'])
+                timing['duration_ms'] = round((mark['finished'] - mark['started']) * 1000, 2)
+
+    def _submit(self, func: Callable[..., Any], args: tuple, marks: Optional[Dict[str, float]] = None):
+        with self._lock:
+            self._queued += 1
+            self.stats['submitted'] += 1
+            self.stats['max_queue_depth'] = max(self.stats['max_queue_depth'], self._queued)
+
+        def task():
+            with self._lock:
+                self._queued -= 1
+                self._running += 1
+            if marks is not None:
+                marks['started'] = time.monotonic()
+            try:
+                return func(*args)
+            finally:
+                if marks is not None:
+                    marks['finished'] = time.monotonic()
+                with self._lock:
+                    self._running -= 1
+                    self.stats['completed'] += 1
+
+        future = self._pool.submit(task)
+        # The in-flight slot is held until the task really ends, even if its caller gave up
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def _abandon(self, future, name: str):
+        cancelled = future.cancel()
+        with self._lock:
+            self.stats['timed_out'] += 1
+            if cancelled:
+                # Never started: task() did not run, so undo its queue accounting here
+                self._queued -= 1
+                self.stats['cancelled'] += 1
+            else:
+                self.stats['abandoned_running'] += 1
+        logger.warning(f"Agent {name} missed its deadline ({'cancelled' if cancelled else 'abandoned while running'})")
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'max_inflight': self.max_inflight,
+                'queue_depth': self._queued,
+                'running': self._running,
+                **self.stats
+            }
+
+
+_executor: Optional[AgentExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_agent_executor() -> AgentExecutor:
+    """Process-wide executor sized from AGENT_EXECUTOR_WORKERS / AGENT_MAX_INFLIGHT"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                workers = int(os.getenv('AGENT_EXECUTOR_WORKERS', '8'))
+                _executor = AgentExecutor(
+                    workers=workers,
+                    max_inflight=int(os.getenv('AGENT_MAX_INFLIGHT', str(workers * 4)))
+                )
+    return _executor
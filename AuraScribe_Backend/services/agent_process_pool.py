@@ -0,0 +1,179 @@
+"""
+agent_process_pool.py
+Optional process-pool backend for agent execution.
+
+The agents are pure-Python rule engines, so threads share one GIL and
+concurrent agents (or requests) do not run in parallel. With
+AGENT_EXECUTION_MODE=process each agent run is shipped to a pool of worker
+processes that import the agents once at start-up. The AgentExecutor still
+schedules the graph and enforces deadlines; its thread only waits for the
+worker's answer.
+
+What crosses the process boundary is kept small: agent name, transcript,
+persona key and the upstream results the agent consumes. Workers rebuild the
+persona summary (immutable cache) and the TranscriptAnalysis themselves,
+keeping the last few analyses so agents of one request that land on the same
+worker share a single scan.
+"""
+
+import importlib
+import logging
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+AGENT_EXECUTION_MODE = os.getenv('AGENT_EXECUTION_MODE', 'thread').lower()
+AGENT_PROCESS_WORKERS = int(os.getenv('AGENT_PROCESS_WORKERS', str(os.cpu_count() or 2)))
+# forkserver: workers fork from a clean server process that preloads the agents
+AGENT_PROCESS_START_METHOD = os.getenv('AGENT_PROCESS_START_METHOD', 'forkserver')
+
+AGENT_MODULES = {
+    'ClinicalDocumentationAgent': 'agents.ClinicalDocumentationAgent',
+    'PrescriptionLabAgent': 'agents.PrescriptionLabAgent',
+    'MADO_ReportingAgent': 'agents.MADO_ReportingAgent',
+    'ComplianceMonitorAgent': 'agents.ComplianceMonitorAgent',
+    'RAMQ_BillingAgent': 'agents.RAMQ_BillingAgent',
+    'CustomFormAgent': 'agents.CustomFormAgent',
+    'TaskManagerAgent': 'agents.TaskManagerAgent',
+}
+
+# ---- worker side ----
+
+_worker_agents: Dict[str, Any] = {}
+_worker_analyses: 'OrderedDict[str, Any]' = OrderedDict()
+_WORKER_ANALYSIS_CACHE = 8
+
+
+def _init_worker():
+    for name, module in AGENT_MODULES.items():
+        try:
+            _worker_agents[name] = importlib.import_module(module).root_agent
+        except ImportError as e:
+            logger.warning(f"Agent worker could not import {name}: {e}")
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def _analysis_for(transcript: str):
+    from agents.transcript_analysis import TranscriptAnalysis
+
+    analysis = _worker_analyses.get(transcript)
+    if analysis is None:
+        analysis = _worker_analyses[transcript] = TranscriptAnalysis(transcript)
+        while len(_worker_analyses) > _WORKER_ANALYSIS_CACHE:
+            _worker_analyses.popitem(last=False)
+    else:
+        _worker_analyses.move_to_end(transcript)
+    return analysis
+
+
+def run_agent(agent_name: str, transcript: str, persona_key: str, upstream: Dict[str, Any]):
+    """Worker entry point: run one agent with a payload equivalent to the orchestrator's"""
+    from agents.medical_persona_system import get_persona
+
+    agent = _worker_agents.get(agent_name)
+    if agent is None:
+        raise RuntimeError(f"{agent_name} not loaded in agent worker {os.getpid()}")
+    return agent.run({
+        "transcript": transcript,
+        "persona": persona_key,
+        "persona_summary": get_persona(persona_key).get_persona_summary(),
+        "analysis": _analysis_for(transcript),
+        "upstream": upstream
+    })
+
+
+# ---- parent side ----
+
+class AgentProcessPool:
+    """Pre-started worker processes running agents by name"""
+
+    def __init__(self, workers: int = AGENT_PROCESS_WORKERS, start_method: str = AGENT_PROCESS_START_METHOD):
+        self.workers = workers
+        self.start_method = start_method
+        self._lock = threading.Lock()
+        self.stats = {'submitted': 0, 'completed': 0, 'failed': 0, 'restarts': 0}
+        self._pool = self._create_pool()
+
+    def _create_pool(self) -> ProcessPoolExecutor:
+        context = multiprocessing.get_context(self.start_method)
+        if self.start_method == 'forkserver':
+            context.set_forkserver_preload([__name__, *AGENT_MODULES.values()])
+        return ProcessPoolExecutor(max_workers=self.workers, mp_context=context, initializer=_init_worker)
+
+    def warm(self, timeout: float = 60.0):
+        """Start every worker now (and import the agents) instead of on first use"""
+        futures = [self._pool.submit(_ping) for _ in range(self.workers)]
+        wait(futures, timeout=timeout)
+
+    def run(self, agent_name: str, payload: Dict[str, Any], timeout: Optional[float] = None):
+        """Run ``agent_name`` on an orchestrator payload in a worker and return its result"""
+        upstream = {name: _compact(result) for name, result in (payload.get("upstream") or {}).items()}
+        with self._lock:
+            self.stats['submitted'] += 1
+            pool = self._pool
+        try:
+            result = pool.submit(run_agent, agent_name, payload.get("transcript", ""),
+                                 payload.get("persona", "generalist"), upstream).result(timeout)
+        except BrokenProcessPool:
+            # A worker died (OOM, segfault): replace the pool so later runs work again
+            self._restart(pool)
+            raise
+        except Exception:
+            with self._lock:
+                self.stats['failed'] += 1
+            raise
+        with self._lock:
+            self.stats['completed'] += 1
+        return result
+
+    def _restart(self, broken: ProcessPoolExecutor):
+        with self._lock:
+            self.stats['failed'] += 1
+            if self._pool is not broken:
+                return
+            logger.error("Agent process pool broken, starting a new one")
+            self.stats['restarts'] += 1
+            self._pool = self._create_pool()
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self):
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {'workers': self.workers, 'start_method': self.start_method, **self.stats}
+
+
+def _compact(result):
+    """Upstream results without orchestration metadata (agents never read it)"""
+    if isinstance(result, dict) and '_meta' in result:
+        return {key: value for key, value in result.items() if key != '_meta'}
+    return result
+
+
+_process_pool: Optional[AgentProcessPool] = None
+_process_pool_lock = threading.Lock()
+
+
+def get_agent_process_pool() -> Optional[AgentProcessPool]:
+    """Process-wide pool when AGENT_EXECUTION_MODE=process, else None (agents run in threads)"""
+    global _process_pool
+    if AGENT_EXECUTION_MODE != 'process':
+        return None
+    if _process_pool is None:
+        with _process_pool_lock:
+            if _process_pool is None:
+                _process_pool = AgentProcessPool()
+                _process_pool.warm()
+                logger.info(f"Agent process pool started: {_process_pool.workers} workers "
+                            f"({_process_pool.start_method})")
+    return _process_pool
@@ -0,0 +1,163 @@
+"""
+codec.py
+Serialization of records stored in Redis (AuraLink transfers, WebSocket sessions).
+
+Records used to be ``json.dumps`` text. An encoded record is now a two-byte
+header followed by the payload:
+
+    byte 0  CODEC_VERSION (layout of what follows)
+    byte 1  serializer id << 4 | compression id
+
+Serializers: JSON (default; orjson is used when installed, same bytes on the
+wire) or msgpack. Payloads of at least STORAGE_COMPRESS_MIN_BYTES are
+compressed with zlib (or zstd) when that makes them smaller, which is where
+long transcripts shrink most. decode() reads every format whatever the current
+settings, and plain JSON written before this header existed, so the settings
+can change without migrating stored records.
+"""
+
+import json
+import logging
+import os
+import zlib
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+CODEC_VERSION = 1
+
+SERIALIZER_JSON = 1
+SERIALIZER_MSGPACK = 2
+SERIALIZERS = {'json': SERIALIZER_JSON, 'msgpack': SERIALIZER_MSGPACK}
+
+COMPRESSION_NONE = 0
+COMPRESSION_ZLIB = 1
+COMPRESSION_ZSTD = 2
+COMPRESSIONS = {'none': COMPRESSION_NONE, 'zlib': COMPRESSION_ZLIB, 'zstd': COMPRESSION_ZSTD}
+
+STORAGE_CODEC = os.getenv('STORAGE_CODEC', 'json').lower()
+STORAGE_COMPRESSION = os.getenv('STORAGE_COMPRESSION', 'zlib').lower()
+STORAGE_COMPRESS_MIN_BYTES = int(os.getenv('STORAGE_COMPRESS_MIN_BYTES', '4096'))
+# zlib 1-9 / zstd 1-22: 3 keeps encoding of a 1 h transcript (~64 KB) near 1 ms (zlib), 0.3 ms (zstd)
+STORAGE_COMPRESSION_LEVEL = int(os.getenv('STORAGE_COMPRESSION_LEVEL', '3'))
+
+
+class Codec:
+    """Encodes values to header + payload bytes; decodes any supported format"""
+
+    def __init__(self, serializer: str = 'json', compression: str = 'zlib',
+                 compress_min_bytes: int = STORAGE_COMPRESS_MIN_BYTES, level: int = STORAGE_COMPRESSION_LEVEL):
+        if serializer == 'msgpack' and msgpack is None:
+            logger.warning("STORAGE_CODEC=msgpack but msgpack is not installed; using json")
+            serializer = 'json'
+        if compression == 'zstd' and zstandard is None:
+            logger.warning("STORAGE_COMPRESSION=zstd but zstandard is not installed; using zlib")
+            compression = 'zlib'
+        if serializer not in SERIALIZERS or compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown codec {serializer}/{compression}")
+        self.serializer = serializer
+        self.compression = compression
+        self.compress_min_bytes = compress_min_bytes
+        self.level = level
+        self._zstd_compressor = zstandard.ZstdCompressor(level=level) if compression == 'zstd' else None
+
+    @property
+    def name(self) -> str:
+        return f"{self.serializer}+{self.compression}" if self.compression != 'none' else self.serializer
+
+    def encode(self, value: Any) -> bytes:
+        serializer = SERIALIZERS[self.serializer]
+        payload = _serialize(serializer, value)
+        compression = COMPRESSION_NONE
+        if self.compression != 'none' and len(payload) >= self.compress_min_bytes:
+            if self.compression == 'zstd':
+                compressed = self._zstd_compressor.compress(payload)
+            else:
+                compressed = zlib.compress(payload, self.level)
+            if len(compressed) < len(payload):
+                payload, compression = compressed, COMPRESSIONS[self.compression]
+        return bytes((CODEC_VERSION, serializer << 4 | compression)) + payload
+
+    @staticmethod
+    def decode(data) -> Any:
+        """Value of an encoded record (or of a legacy JSON string); ValueError if unreadable"""
+        if data is None:
+            return None
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        if not data or data[0] != CODEC_VERSION:
+            # Written before the codec existed: plain JSON text
+            return json.loads(data)
+        if len(data) < 2:
+            raise ValueError("Truncated record header")
+        serializer, compression = data[1] >> 4, data[1] & 0x0F
+        payload = memoryview(data)[2:]
+        try:
+            if compression == COMPRESSION_ZLIB:
+                payload = zlib.decompress(payload)
+            elif compression == COMPRESSION_ZSTD:
+                if zstandard is None:
+                    raise ValueError("Record is zstd-compressed but zstandard is not installed")
+                payload = zstandard.ZstdDecompressor().decompress(payload)
+            elif compression != COMPRESSION_NONE:
+                raise ValueError(f"Unknown compression {compression}")
+            return _deserialize(serializer, bytes(payload))
+        except ValueError:
+            raise
+        except Exception as e:
+            # zlib.error, zstd and msgpack errors: callers handle one exception type
+            raise ValueError(f"Corrupt record: {e}") from e
+
+
+def _serialize(serializer: int, value: Any) -> bytes:
+    if serializer == SERIALIZER_MSGPACK:
+        return msgpack.packb(value, use_bin_type=True, default=str)
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, default=str)
+        except TypeError:
+            pass  # e.g. non-str dict keys, which json.dumps converts
+    return json.dumps(value, default=str, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def _deserialize(serializer: int, payload: bytes) -> Any:
+    if serializer == SERIALIZER_JSON:
+        return orjson.loads(payload) if orjson is not None else json.loads(payload)
+    if serializer == SERIALIZER_MSGPACK:
+        if msgpack is None:
+            raise ValueError("Record is msgpack-encoded but msgpack is not installed")
+        return msgpack.unpackb(payload, raw=False)
+    raise ValueError(f"Unknown serializer {serializer}")
+
+
+_codec: Optional[Codec] = None
+
+
+def get_codec() -> Codec:
+    """Process-wide codec configured by STORAGE_CODEC / STORAGE_COMPRESSION"""
+    global _codec
+    if _codec is None:
+        _codec = Codec(STORAGE_CODEC, STORAGE_COMPRESSION)
+    return _codec
+
+
+def get_codec_info() -> Dict[str, Any]:
+    codec = get_codec()
+    return {'codec': codec.name, 'version': CODEC_VERSION, 'compress_min_bytes': codec.compress_min_bytes,
+            'available': {'orjson': orjson is not None, 'msgpack': msgpack is not None,
+                          'zstd': zstandard is not None}}
@@ -4,14 +4,97 @@ Updated for correct model names available on your server
 """
 
 import os
+import hashlib
 import requests
 import logging
-from typing import Optional, Dict, Any, Tuple
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+import tempfile
+from typing import Optional, Dict, Any, Iterable, Iterator, List, Tuple
 from datetime import datetime
+from urllib.parse import urlencode
 import json
 
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from services.deepgram_streaming import DeepgramLiveStream
+from services.storage import get_redis
+from services.transcription_cache import TranscriptionCache
+
 logger = logging.getLogger(__name__)
 
+_shared_service = None
+_shared_service_lock = threading.Lock()
+
+
+def get_deepgram_service() -> 'DeepgramLocalService':
+    """Process-wide service instance so REST and WebSocket paths share one connection pool"""
+    global _shared_service
+    if _shared_service is None:
+        with _shared_service_lock:
+            if _shared_service is None:
+                _shared_service = DeepgramLocalService()
+    return _shared_service
+
+
+class RetrySpool:
+    """
+    Copy of a streamed upload kept for fallback attempts.
+
+    Held in memory up to ``max_memory`` bytes. Past that it moves to an unnamed temp
+    file when ``spill`` is set; otherwise the copy is dropped (``overflowed``) and the
+    upload goes on streaming without a retry copy. ``chunks()`` uses positional reads
+    so concurrent (hedged) attempts can each replay the audio.
+    """
+
+    def __init__(self, max_memory: int, spill: bool = False):
+        self.max_memory = max_memory
+        self.spill = spill
+        self.overflowed = False
+        self.size = 0
+        self._buffer = bytearray()
+        self._file = None
+
+    def write(self, chunk: bytes):
+        if self.overflowed:
+            return
+        if self._file is None and len(self._buffer) + len(chunk) > self.max_memory:
+            if not self.spill:
+                self.overflowed = True
+                self._buffer = bytearray()
+                return
+            self._file = tempfile.TemporaryFile()
+            self._file.write(self._buffer)
+            self._buffer = bytearray()
+        if self._file is not None:
+            self._file.write(chunk)
+        else:
+            self._buffer += chunk
+        self.size += len(chunk)
+
+    def chunks(self, chunk_size: int) -> Iterator[bytes]:
+        if self._file is None:
+            yield bytes(self._buffer)
+            return
+        self._file.flush()
+        fd = self._file.fileno()
+        offset = 0
+        while offset < self.size:
+            data = os.pread(fd, chunk_size, offset)
+            if not data:
+                break
+            offset += len(data)
+            yield data
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._buffer = bytearray()
+
+
 class DeepgramLocalService:
     def __init__(self):
         """
@@ -43,6 +126,21 @@ class DeepgramLocalService:
             'base': 'general-nova-3'
         }
         
+        # Fallback combinations tried after the requested one (lowercase for Deepgram)
+        self.fallback_combinations = [
+            {'model': 'general-nova-3', 'language': 'fr-ca'},
+            {'model': 'general-nova-3', 'language': 'en-us'},
+            {'model': '2-general-nova', 'language': 'fr-ca'},
+        ]
+
+        # Streaming endpoint shares the host with the REST API (http -> ws, https -> wss)
+        if self.base_url.startswith('https://'):
+            self.stream_url = 'wss://' + self.base_url[len('https://'):]
+        elif self.base_url.startswith('http://'):
+            self.stream_url = 'ws://' + self.base_url[len('http://'):]
+        else:
+            self.stream_url = self.base_url
+
         # Default settings
         self.default_language = os.getenv('DEEPGRAM_DEFAULT_LANGUAGE', 'fr-CA')
         self.smart_format = os.getenv('DEEPGRAM_SMART_FORMAT', 'true').lower() == 'true'
@@ -51,6 +149,37 @@ class DeepgramLocalService:
         self.headers = {
             'Content-Type': 'application/octet-stream'
         }
+
+        # Connection pool: keep-alive connections reused across requests instead of a handshake per chunk
+        self.pool_connections = int(os.getenv('DEEPGRAM_POOL_CONNECTIONS', '4'))   # host pools kept
+        self.pool_maxsize = int(os.getenv('DEEPGRAM_POOL_MAXSIZE', '20'))          # connections per host
+        self.pool_block = os.getenv('DEEPGRAM_POOL_BLOCK', 'false').lower() == 'true'
+        self.connect_retries = int(os.getenv('DEEPGRAM_CONNECT_RETRIES', '3'))
+        self.retry_backoff = float(os.getenv('DEEPGRAM_RETRY_BACKOFF', '0.3'))
+        self.connect_timeout = float(os.getenv('DEEPGRAM_CONNECT_TIMEOUT', '5'))
+        self.session = self._create_session()
+
+        # Hedging: if the primary request hasn't answered after the delay, a copy of it and every
+        # other language/model combo are sent at once; results settle in preference order, so a
+        # fallback language only wins once the primary (and its copy) failed or returned no words
+        self.hedging_enabled = os.getenv('DEEPGRAM_HEDGING', 'true').lower() == 'true'
+        self.hedge_delay = float(os.getenv('DEEPGRAM_HEDGE_DELAY_MS', '2000')) / 1000.0
+        self._hedge_executor = ThreadPoolExecutor(max_workers=self.pool_maxsize,
+                                                  thread_name_prefix='deepgram-hedge')
+
+        # Streamed uploads: fixed read size, and the retry copy kept for fallback attempts:
+        # memory (up to the spool size; larger uploads stream with no retry), file (spill
+        # to a temp file past it) or false (no copy, no fallback)
+        self.stream_chunk_size = int(os.getenv('DEEPGRAM_STREAM_CHUNK_SIZE', str(64 * 1024)))
+        self.stream_spool_memory = int(os.getenv('DEEPGRAM_STREAM_SPOOL_MEMORY', str(4 * 1024 * 1024)))
+        self.stream_retry = os.getenv('DEEPGRAM_STREAM_RETRY', 'memory').lower()
+        if self.stream_retry == 'true':
+            self.stream_retry = 'file'
+
+        # Identical uploads (client retries) are answered from the content-hash cache
+        self.cache = None
+        if os.getenv('TRANSCRIPTION_CACHE', 'true').lower() == 'true':
+            self.cache = self._create_cache()
         
         logger.info(f"Initializing Deepgram self-hosted at: {self.base_url}")
         logger.info(f"Available models from instance: general-nova-3, 2-general-nova")
@@ -58,7 +187,71 @@ class DeepgramLocalService:
         
         # Test connection on init
         self.connection_status = self.test_connection()
-    
+
+    def _create_session(self) -> requests.Session:
+        """Pooled keep-alive session; only connection failures are retried (the request never reached Deepgram)"""
+        retry = Retry(
+            total=None,
+            connect=self.connect_retries,
+            read=0,
+            status=0,
+            other=0,
+            redirect=False,
+            backoff_factor=self.retry_backoff,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block,
+            max_retries=retry
+        )
+        session = requests.Session()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers.update(self.headers)
+        return session
+
+    def _create_cache(self) -> TranscriptionCache:
+        """Redis-backed cache (TTL aligned with the 24h session TTL), in-process only if Redis is down"""
+        client = get_redis()
+        if client is None:
+            logger.warning("Transcription cache without Redis")
+        return TranscriptionCache(
+            client,
+            ttl=int(os.getenv('TRANSCRIPTION_CACHE_TTL', '86400')),
+            max_entries=int(os.getenv('TRANSCRIPTION_CACHE_SIZE', '256'))
+        )
+
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Connection reuse counters for the Deepgram host pools"""
+        stats = {
+            'pool_connections': self.pool_connections,
+            'pool_maxsize': self.pool_maxsize,
+            'pool_block': self.pool_block,
+            'connect_retries': self.connect_retries,
+            'hosts': 0,
+            'connections_opened': 0,
+            'requests_sent': 0
+        }
+        try:
+            pools = self.session.get_adapter(self.base_url).poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                stats['hosts'] += 1
+                stats['connections_opened'] += pool.num_connections
+                stats['requests_sent'] += pool.num_requests
+        except Exception as e:
+            logger.debug(f"Could not read Deepgram pool stats: {e}")
+        return stats
+
+    def close(self):
+        """Release pooled connections"""
+        self._hedge_executor.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
+
     def test_connection(self) -> Tuple[bool, str]:
         """Test connection to your Deepgram instance"""
         try:
@@ -75,16 +268,14 @@ class DeepgramLocalService:
                 try:
                     # For /v1/listen, use a HEAD request to test without actually transcribing
                     if endpoint == '/v1/listen':
-                        response = requests.head(
+                        response = self.session.head(
                             url, 
-                            headers=self.headers, 
-                            timeout=10
+                            timeout=(self.connect_timeout, 10)
                         )
                     else:
-                        response = requests.get(
+                        response = self.session.get(
                             url, 
-                            headers=self.headers, 
-                            timeout=10
+                            timeout=(self.connect_timeout, 10)
                         )
                     
                     if response.status_code < 400:  # 2xx or 3xx
@@ -148,16 +339,106 @@ class DeepgramLocalService:
         """
         Transcribe raw audio data with robust fallback logic for your server
         """
+        params, safe_model = self._build_listen_params(**kwargs)
+
+        cache_key = None
+        if self.cache and kwargs.get('use_cache', True):
+            cache_key = TranscriptionCache.make_key(audio_data, **params)
+            cached = self.cache.get(cache_key)
+            if cached:
+                logger.info(f"Transcription cache hit ({cache_key[:12]})")
+                cached['cached'] = True
+                return cached
+
+        result = self._run_attempts(
+            self._listen_attempts(params, safe_model),
+            lambda attempt: self._post_listen(attempt, audio_data, safe_model)
+        )
+        if cache_key and result.get('success') and result.get('transcript'):
+            self.cache.set(cache_key, result)
+        result['cached'] = False
+        return result
+
+    def transcribe_audio_stream(self, chunks: Iterable[bytes], **kwargs) -> Dict[str, Any]:
+        """
+        Transcribe audio read incrementally (e.g. an upload stream) without holding it in memory.
+
+        The chunks are piped into the Deepgram request body (chunked transfer). With
+        DEEPGRAM_STREAM_RETRY=memory (default) a copy of uploads up to
+        DEEPGRAM_STREAM_SPOOL_MEMORY is kept so fallback attempts can resend the audio;
+        larger uploads stream straight through and get no fallback. ``file`` spills the
+        copy to an unnamed temp file instead, ``false`` keeps none. The copy is dropped
+        once the request finishes. The transcript is cached under the SHA-256 computed here
+        from the streamed bytes; there is no lookup before the body is read, as a hash
+        sent by the client proves nothing about the audio (and would hand out another
+        upload's transcript to anyone who knows its hash).
+
+        Unlike transcribe_audio_data/transcribe_audio_file, the streamed attempt is never
+        hedged: its body is the upload itself, which can only be sent once. When it fails
+        or returns no words, the fallbacks are replayed from the copy through
+        _run_attempts: the first fallback is sent alone, then the remaining fallbacks (and a
+        copy of the first if it is still unanswered) are sent together after hedge_delay,
+        or as soon as the first fails or returns no words.
+        """
+        params, safe_model = self._build_listen_params(**kwargs)
+        started = time.time()
+
+        use_cache = self.cache is not None and kwargs.get('use_cache', True)
+
+        attempts = self._listen_attempts(params, safe_model)
+        spool = None
+        if self.stream_retry in ('memory', 'file') and len(attempts) > 1:
+            spool = RetrySpool(self.stream_spool_memory, spill=self.stream_retry == 'file')
+        digest = hashlib.sha256()
+
+        def body():
+            for chunk in chunks:
+                if not chunk:
+                    continue
+                digest.update(chunk)
+                if spool is not None:
+                    spool.write(chunk)
+                yield chunk
+
+        try:
+            upload = body()
+            result = self._post_listen(attempts[0], upload, safe_model)
+            failed = not (result.get('success') and result.get('transcript'))
+            if failed and spool is not None:
+                # Drain whatever the failed attempt did not send, then retry from the spool
+                for _ in upload:
+                    pass
+                if spool.overflowed:
+                    logger.info(f"Streamed attempt failed; upload exceeded {spool.max_memory} bytes, no retry copy")
+            if failed and spool is not None and not spool.overflowed:
+                logger.info(f"Streamed attempt failed, retrying from a {spool.size} byte spool")
+                result = self._run_attempts(
+                    attempts[1:],
+                    lambda attempt: self._post_listen(attempt, spool.chunks(self.stream_chunk_size), safe_model)
+                )
+                result['attempts'] += 1
+                result['fallback_used'] = bool(result.get('transcript'))
+            else:
+                result = dict(result, attempts=1, fallback_used=False)
+        finally:
+            if spool is not None:
+                spool.close()
+
+        result['transcription_ms'] = round((time.time() - started) * 1000)
+        if use_cache and result.get('success') and result.get('transcript'):
+            self.cache.set(TranscriptionCache.key_for_digest(digest.hexdigest(), **params), result)
+        result['cached'] = False
+        return result
+
+    def _build_listen_params(self, **kwargs) -> Tuple[Dict[str, str], str]:
+        """Query parameters for /v1/listen and the model they resolve to"""
         original_language = kwargs.get('language', self.default_language)
         original_model = kwargs.get('model', 'general-nova-3')
         
         # Get safe language/model combination
         safe_language, safe_model = self.get_safe_language_model_combo(original_language, original_model)
         
-        smart_format = kwargs.get('smart_format', self.smart_format)
         punctuate = kwargs.get('punctuate', True)
-        utterances = kwargs.get('utterances', True)
-        diarize = kwargs.get('diarize', True)
         detect_language = kwargs.get('detect_language', False)
 
         # Build parameters for the API call - simplified for self-hosted
@@ -170,73 +451,174 @@ class DeepgramLocalService:
         # Only add language if not detecting
         if not detect_language:
             params['language'] = safe_language
+        return params, safe_model
 
-        def try_transcribe(params_dict):
-            try:
-                url = f"{self.base_url}/v1/listen"
-                
-                # Log the exact parameters being used
-                logger.info(f"Transcribing with params: {params_dict}")
-                
-                response = requests.post(
-                    url,
-                    params=params_dict,
-                    data=audio_data,
-                    headers=self.headers,
-                    timeout=30
-                )
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    return self._parse_deepgram_response(result, safe_model)
-                else:
-                    error_text = response.text
-                    try:
-                        error_json = response.json()
-                        error_text = json.dumps(error_json)
-                    except:
-                        pass
-                    
-                    logger.error(f"Deepgram error {response.status_code}: {error_text}")
-                    return self._error_response(f"Deepgram error {response.status_code}: {error_text}")
-                    
-            except requests.exceptions.Timeout:
-                return self._error_response("Request timeout")
-            except requests.exceptions.RequestException as e:
-                return self._error_response(f"Network error: {str(e)}")
-            except Exception as e:
-                return self._error_response(f"Unexpected error: {str(e)}")
-
-        # Try the safe combination first
-        result = try_transcribe(params)
-        if result.get('success'):
-            return result
-        
-        # If that failed, try some fallback combinations (lowercase for Deepgram)
-        fallback_combinations = [
-            {'model': 'general-nova-3', 'language': 'fr-ca'},
-            {'model': 'general-nova-3', 'language': 'en-us'},
-            {'model': '2-general-nova', 'language': 'fr-ca'},
-        ]
-        
-        for fallback in fallback_combinations:
-            if (fallback['model'] == safe_model and 
-                fallback['language'] == safe_language):
+    def _listen_attempts(self, params: Dict[str, str], safe_model: str) -> List[Dict[str, str]]:
+        """Single fallback layer: the safe combination first, then de-duplicated fallbacks"""
+        attempts = [params]
+        seen = {(safe_model, params.get('language'))}
+        for fallback in self.fallback_combinations:
+            combo = (fallback['model'], fallback['language'])
+            if combo in seen:
                 continue  # Skip if already tried
-                
+            seen.add(combo)
             fallback_params = params.copy()
             fallback_params.update(fallback)
+            attempts.append(fallback_params)
+        return attempts
+
+    def _post_listen(self, params_dict: Dict[str, str], body, safe_model: str) -> Dict[str, Any]:
+        """POST one attempt to /v1/listen; ``body`` is bytes or an iterable of chunks"""
+        try:
+            url = f"{self.base_url}/v1/listen"
             
-            logger.info(f"Trying fallback: {fallback}")
-            fallback_result = try_transcribe(fallback_params)
+            # Log the exact parameters being used
+            logger.info(f"Transcribing with params: {params_dict}")
             
-            if fallback_result.get('success'):
-                logger.info("Fallback succeeded")
-                return fallback_result
-        
-        # If all attempts failed, return the original error
+            response = self.session.post(
+                url,
+                params=params_dict,
+                data=body,
+                timeout=(self.connect_timeout, 30)
+            )
+            
+            if response.status_code == 200:
+                result = response.json()
+                return self._parse_deepgram_response(result, safe_model)
+            else:
+                error_text = response.text
+                try:
+                    error_json = response.json()
+                    error_text = json.dumps(error_json)
+                except:
+                    pass
+                
+                logger.error(f"Deepgram error {response.status_code}: {error_text}")
+                return self._error_response(f"Deepgram error {response.status_code}: {error_text}")
+                
+        except requests.exceptions.Timeout:
+            return self._error_response("Request timeout")
+        except requests.exceptions.RequestException as e:
+            return self._error_response(f"Network error: {str(e)}")
+        except Exception as e:
+            return self._error_response(f"Unexpected error: {str(e)}")
+
+    def _run_attempts(self, attempts, try_transcribe) -> Dict[str, Any]:
+        """
+        Race the language/model attempts; return the most preferred non-empty transcript.
+
+        The primary attempt is sent first. If it has not answered within hedge_delay
+        (hedging enabled), or as soon as it fails or returns no words, a copy of it and
+        every fallback combination are sent at once, so bad audio costs roughly one
+        read timeout instead of one per combination. Results settle in preference
+        order: a fallback's transcript is only used once every attempt ahead of it
+        (the primary and its copy included) has failed or come back empty, so a slow
+        primary never loses to a fallback language. Requests already in flight when
+        the answer is chosen cannot be aborted; they finish and are ignored.
+        """
+        started = time.time()
+        sent = 0
+        # attempt index -> futures still running, and outcomes of the finished ones
+        pending: Dict[int, set] = {index: set() for index in range(len(attempts))}
+        outcomes: Dict[int, list] = {index: [] for index in range(len(attempts))}
+        owner = {}
+
+        def submit(index):
+            nonlocal sent
+            future = self._hedge_executor.submit(try_transcribe, attempts[index])
+            owner[future] = index
+            pending[index].add(future)
+            sent += 1
+
+        def settle(done):
+            for future in done:
+                index = owner[future]
+                pending[index].discard(future)
+                outcomes[index].append(future.result())
+
+        def winner():
+            """(result, index) of the first attempt in preference order with words, once decided"""
+            for index in range(len(attempts)):
+                for result in outcomes[index]:
+                    if result.get('success') and result.get('transcript'):
+                        return result, index
+                if pending[index]:
+                    return None  # A more preferred attempt may still answer
+            return None
+
+        submit(0)
+        done, _ = wait(set(pending[0]), timeout=self.hedge_delay if self.hedging_enabled else None,
+                       return_when=FIRST_COMPLETED)
+        settle(done)
+        if pending[0]:
+            # Still no answer after hedge_delay
+            logger.info(f"No Deepgram answer after {self.hedge_delay:.1f}s, hedging with the same request "
+                        f"and {len(attempts) - 1} fallback(s)")
+            submit(0)
+            for index in range(1, len(attempts)):
+                submit(index)
+        elif winner() is None and len(attempts) > 1:
+            logger.info(f"Primary attempt failed or returned no words, trying {len(attempts) - 1} fallback(s) at once")
+            for index in range(1, len(attempts)):
+                submit(index)
+
+        while True:
+            decided = winner()
+            running = set().union(*pending.values())
+            if decided is not None or not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            settle(done)
+
+        if decided is None:
+            # Nothing produced words: prefer an empty success over an error, the requested language first
+            finished = [(result, index) for index in range(len(attempts)) for result in outcomes[index]]
+            decided = next(((r, i) for r, i in finished if r.get('success')), finished[0])
+        else:
+            for future in set().union(*pending.values()):
+                future.cancel()  # Only drops requests not started yet
+
+        result, index = decided
+        result = dict(result)
+        result['attempts'] = sent
+        result['fallback_used'] = index > 0
+        result['transcription_ms'] = round((time.time() - started) * 1000)
+        if index > 0 and result.get('transcript'):
+            logger.info(f"Fallback succeeded ({attempts[index].get('model')}, "
+                        f"{attempts[index].get('language')}) after {sent} requests")
         return result
 
+    def open_live_stream(self, on_transcript, on_error=None, **kwargs) -> Optional[DeepgramLiveStream]:
+        """
+        Open a streaming connection for real-time dictation.
+        Returns None if the stream could not be opened (caller falls back to per-chunk transcription).
+        """
+        original_language = kwargs.get('language', self.default_language)
+        original_model = kwargs.get('model', 'general-nova-3')
+        safe_language, safe_model = self.get_safe_language_model_combo(original_language, original_model)
+
+        params = {
+            'model': safe_model,
+            'language': safe_language,
+            'punctuate': str(kwargs.get('punctuate', True)).lower(),
+            'smart_format': str(kwargs.get('smart_format', self.smart_format)).lower(),
+            'interim_results': 'true',
+            'endpointing': os.getenv('DEEPGRAM_ENDPOINTING_MS', '300')
+        }
+        url = f"{self.stream_url}/v1/listen?{urlencode(params)}"
+        logger.info(f"Opening Deepgram stream with params: {params}")
+
+        # Same connect timeout and retry/backoff policy as the pooled REST session
+        stream = DeepgramLiveStream(
+            url, on_transcript, on_error=on_error,
+            connect_timeout=self.connect_timeout,
+            connect_retries=self.connect_retries,
+            retry_backoff=self.retry_backoff
+        )
+        if not stream.start():
+            return None
+        return stream
+
     def _parse_deepgram_response(self, response: Dict[str, Any], model_used: str = "unknown") -> Dict[str, Any]:
         """Parse Deepgram API response"""
         try:
@@ -338,5 +720,9 @@ class DeepgramLocalService:
             'available_models': list(self.model_aliases.keys()),
             'server_models': ['general-nova-3', '2-general-nova'],
             'supported_languages': ['fr-CA', 'en-US'],
+            'streaming_url': f"{self.stream_url}/v1/listen",
+            'connection_pool': self.get_pool_stats(),
+            'transcription_cache': self.cache.get_stats() if self.cache else None,
+            'hedging': {'enabled': self.hedging_enabled, 'delay_ms': round(self.hedge_delay * 1000)},
             'default_language': self.default_language
         }
\ No newline at end of file
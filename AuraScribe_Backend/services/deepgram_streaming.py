@@ -0,0 +1,218 @@
+"""
+deepgram_streaming.py
+Long-lived streaming (WebSocket) connection to the self-hosted Deepgram /v1/listen endpoint
+"""
+
+import json
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    import websocket  # websocket-client
+except ImportError:  # pragma: no cover - optional dependency
+    websocket = None
+
+logger = logging.getLogger(__name__)
+
+
+class DeepgramLiveStream:
+    """
+    One streaming connection per dictation session.
+
+    Raw audio bytes are forwarded as binary frames as soon as they arrive and
+    interim/final results are delivered to ``on_transcript`` from a reader thread.
+    """
+
+    def __init__(self, url: str,
+                 on_transcript: Callable[[Dict[str, Any]], None],
+                 on_error: Optional[Callable[[str], None]] = None,
+                 headers: Optional[Dict[str, str]] = None,
+                 connect_timeout: float = 5.0,
+                 keepalive_interval: float = 8.0,
+                 connect_retries: int = 0,
+                 retry_backoff: float = 0.3):
+        self.url = url
+        self.on_transcript = on_transcript
+        self.on_error = on_error
+        self.headers = headers or {}
+        self.connect_timeout = connect_timeout
+        self.keepalive_interval = keepalive_interval
+        self.connect_retries = connect_retries
+        self.retry_backoff = retry_backoff
+
+        self._ws = None
+        self._send_lock = threading.Lock()
+        self._closed = threading.Event()
+        self._reader = None
+        self._keepalive = None
+        self._last_send = 0.0
+
+        self.final_segments: List[str] = []
+        self.bytes_sent = 0
+        self.opened_at = None
+        self.first_result_at = None
+
+    @property
+    def is_open(self) -> bool:
+        return self._ws is not None and not self._closed.is_set()
+
+    @property
+    def final_transcript(self) -> str:
+        return ' '.join(self.final_segments).strip()
+
+    def start(self) -> bool:
+        """Open the connection and start the reader/keep-alive threads"""
+        if websocket is None:
+            logger.warning("websocket-client not installed - streaming transcription unavailable")
+            return False
+        header = [f"{key}: {value}" for key, value in self.headers.items()]
+        for attempt in range(self.connect_retries + 1):
+            try:
+                self._ws = websocket.create_connection(self.url, header=header, timeout=self.connect_timeout)
+                # Reads block until the server sends results or closes the stream
+                self._ws.settimeout(None)
+                break
+            except (OSError, websocket.WebSocketException) as e:
+                self._ws = None
+                if attempt >= self.connect_retries:
+                    logger.error(f"Deepgram streaming connect failed: {e}")
+                    return False
+                delay = self.retry_backoff * (2 ** attempt)
+                logger.warning(f"Deepgram streaming connect failed ({e}), retrying in {delay:.2f}s")
+                time.sleep(delay)
+            except Exception as e:
+                logger.error(f"Deepgram streaming connect failed: {e}")
+                self._ws = None
+                return False
+
+        self.opened_at = time.time()
+        self._last_send = self.opened_at
+        self._reader = threading.Thread(target=self._read_loop, name="deepgram-stream-reader", daemon=True)
+        self._reader.start()
+        self._keepalive = threading.Thread(target=self._keepalive_loop, name="deepgram-stream-keepalive", daemon=True)
+        self._keepalive.start()
+        logger.info(f"Deepgram stream opened: {self.url.split('?')[0]}")
+        return True
+
+    def send(self, audio: bytes) -> bool:
+        """Forward a chunk of raw audio to Deepgram"""
+        if not self.is_open or not audio:
+            return False
+        try:
+            with self._send_lock:
+                self._ws.send_binary(bytes(audio))
+                self._last_send = time.time()
+            self.bytes_sent += len(audio)
+            return True
+        except Exception as e:
+            logger.error(f"Deepgram stream send failed: {e}")
+            self._fail(f"Stream send failed: {e}")
+            return False
+
+    def finish(self, timeout: float = 5.0) -> str:
+        """Ask Deepgram to flush pending audio, wait for the last results and close"""
+        if self.is_open:
+            try:
+                with self._send_lock:
+                    self._ws.send(json.dumps({'type': 'CloseStream'}))
+            except Exception as e:
+                logger.debug(f"Deepgram stream CloseStream failed: {e}")
+        if self._reader is not None:
+            self._reader.join(timeout)
+        self.close()
+        return self.final_transcript
+
+    def close(self):
+        """Close the connection without waiting for pending results"""
+        self._closed.set()
+        ws, self._ws = self._ws, None
+        if ws is not None:
+            try:
+                ws.close()
+            except Exception:
+                pass
+
+    def _keepalive_loop(self):
+        # Deepgram closes idle streams after ~10 s without audio
+        while not self._closed.wait(self.keepalive_interval / 2):
+            if time.time() - self._last_send < self.keepalive_interval:
+                continue
+            try:
+                with self._send_lock:
+                    if self._ws is None:
+                        return
+                    self._ws.send(json.dumps({'type': 'KeepAlive'}))
+                    self._last_send = time.time()
+            except Exception as e:
+                logger.debug(f"Deepgram stream keep-alive failed: {e}")
+                return
+
+    def _read_loop(self):
+        while not self._closed.is_set():
+            ws = self._ws
+            if ws is None:
+                break
+            try:
+                message = ws.recv()
+            except Exception as e:
+                if not self._closed.is_set():
+                    logger.debug(f"Deepgram stream reader stopped: {e}")
+                break
+            if not message:
+                break
+            if isinstance(message, bytes):
+                continue
+            try:
+                data = json.loads(message)
+            except ValueError:
+                logger.debug(f"Ignoring non-JSON stream message: {message[:100]}")
+                continue
+            self._handle_message(data)
+        self._closed.set()
+
+    def _handle_message(self, data: Dict[str, Any]):
+        message_type = data.get('type', 'Results')
+        if message_type == 'Error' or 'err_code' in data:
+            self._fail(data.get('description') or data.get('err_msg') or 'Deepgram stream error')
+            return
+        if message_type != 'Results':
+            return
+
+        alternatives = data.get('channel', {}).get('alternatives', [])
+        if not alternatives:
+            return
+        alternative = alternatives[0]
+        transcript = alternative.get('transcript', '').strip()
+        is_final = bool(data.get('is_final', False))
+        if not transcript and not is_final:
+            return
+
+        if self.first_result_at is None and transcript:
+            self.first_result_at = time.time()
+            logger.info(f"Deepgram stream first words after {(self.first_result_at - self.opened_at) * 1000:.0f} ms")
+        if is_final and transcript:
+            self.final_segments.append(transcript)
+
+        result = {
+            'transcript': transcript,
+            'is_final': is_final,
+            'speech_final': bool(data.get('speech_final', False)),
+            'confidence': alternative.get('confidence', 0.0),
+            'start': data.get('start', 0.0),
+            'duration': data.get('duration', 0.0),
+            'words': alternative.get('words', [])
+        }
+        try:
+            self.on_transcript(result)
+        except Exception as e:
+            logger.error(f"Stream transcript callback failed: {e}")
+
+    def _fail(self, message: str):
+        if self.on_error is not None:
+            try:
+                self.on_error(message)
+            except Exception as e:
+                logger.error(f"Stream error callback failed: {e}")
+        self.close()
@@ -0,0 +1,133 @@
+"""
+dictation_store.py
+Append-only storage for live dictation sessions, kept apart from the small
+ws session metadata record so each chunk costs O(chunk) I/O.
+"""
+
+import logging
+import threading
+from typing import List
+
+import redis
+
+from services.local_cache import LocalTTLCache
+
+logger = logging.getLogger(__name__)
+
+
+class ChunkCounter:
+    """
+    Per-session count of received audio chunks.
+
+    The chunks themselves are not kept (each is transcribed or streamed as it
+    arrives); only the count is stored, as a Redis integer (INCR + EXPIRE in one
+    pipeline round-trip). Falls back to process memory if Redis is unavailable.
+    """
+
+    def __init__(self, client, ttl: int, prefix: str = 'ws_audio_chunks'):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+        self._local = LocalTTLCache(prefix, ttl)
+        self._lock = threading.Lock()
+
+    def _key(self, session_id: str) -> str:
+        return f"{self.prefix}:{session_id}"
+
+    def increment(self, session_id: str) -> int:
+        """Count one more chunk and return the number received so far"""
+        if self.client:
+            try:
+                pipe = self.client.pipeline(transaction=False)
+                pipe.incr(self._key(session_id))
+                pipe.expire(self._key(session_id), self.ttl)
+                count, _ = pipe.execute()
+                return count
+            except redis.RedisError as e:
+                logger.error(f"Redis error counting audio chunk: {e}")
+        with self._lock:
+            count = (self._local.get(session_id) or 0) + 1
+            self._local.set(session_id, count)
+            return count
+
+    def count(self, session_id: str) -> int:
+        if self.client:
+            try:
+                return int(self.client.get(self._key(session_id)) or 0)
+            except redis.RedisError as e:
+                logger.error(f"Redis error reading audio chunk count: {e}")
+        return self._local.get(session_id, 0)
+
+    def clear(self, session_id: str):
+        if self.client:
+            try:
+                self.client.delete(self._key(session_id))
+            except redis.RedisError as e:
+                logger.error(f"Redis error clearing audio chunk count: {e}")
+        self._local.pop(session_id, None)
+
+
+class TranscriptLog:
+    """
+    Per-session transcript as an append-only list of final segments.
+
+    The segment id is its position in the list (RPUSH returns it), so each
+    append writes only the new text and clients can apply deltas in order.
+    Falls back to process memory if Redis is unavailable.
+    """
+
+    def __init__(self, client, ttl: int, prefix: str = 'ws_transcript'):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+        self._local = LocalTTLCache(prefix, ttl)
+        self._lock = threading.Lock()
+
+    def _key(self, session_id: str) -> str:
+        return f"{self.prefix}:{session_id}"
+
+    def append(self, session_id: str, text: str) -> int:
+        """Append one final segment and return its segment id"""
+        if self.client:
+            try:
+                pipe = self.client.pipeline(transaction=False)
+                pipe.rpush(self._key(session_id), text)
+                pipe.expire(self._key(session_id), self.ttl)
+                length, _ = pipe.execute()
+                return length - 1
+            except redis.RedisError as e:
+                logger.error(f"Redis error appending transcript segment: {e}")
+        with self._lock:
+            segments = self._local.get(session_id) or []
+            segments.append(text)
+            self._local.set(session_id, segments)  # Re-measured, TTL refreshed like the Redis EXPIRE
+            return len(segments) - 1
+
+    def count(self, session_id: str) -> int:
+        if self.client:
+            try:
+                return self.client.llen(self._key(session_id))
+            except redis.RedisError as e:
+                logger.error(f"Redis error counting transcript segments: {e}")
+        return len(self._local.get(session_id, []))
+
+    def segments(self, session_id: str, start: int = 0) -> List[str]:
+        """Return final segments from ``start`` onwards (for clients catching up)"""
+        if self.client:
+            try:
+                return self.client.lrange(self._key(session_id), start, -1)
+            except redis.RedisError as e:
+                logger.error(f"Redis error reading transcript segments: {e}")
+        return list(self._local.get(session_id, [])[start:])
+
+    def read(self, session_id: str) -> str:
+        """Return the full transcript"""
+        return ' '.join(self.segments(session_id)).strip()
+
+    def clear(self, session_id: str):
+        if self.client:
+            try:
+                self.client.delete(self._key(session_id))
+            except redis.RedisError as e:
+                logger.error(f"Redis error clearing transcript: {e}")
+        self._local.pop(session_id, None)
@@ -0,0 +1,164 @@
+"""
+job_queue.py
+Background job subsystem for long-running requests (transcription + orchestration).
+
+Jobs run on a bounded local worker pool; job records (status, progress, result)
+are kept in Redis so any API worker can report them, with an in-memory fallback.
+"""
+
+import json
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+import redis
+
+from services.local_cache import LocalTTLCache
+
+logger = logging.getLogger(__name__)
+
+JOB_PENDING = 'pending'
+JOB_RUNNING = 'running'
+JOB_COMPLETED = 'completed'
+JOB_FAILED = 'failed'
+TERMINAL_STATES = (JOB_COMPLETED, JOB_FAILED)
+
+
+class QueueFullError(Exception):
+    """Raised when the pending job limit is reached"""
+
+
+class JobQueue:
+    """
+    Bounded worker pool with persisted job records.
+
+    ``submit(kind, func, *args)`` stores a pending record and returns its id.
+    The worker calls ``func(job, *args)`` where ``job.progress(percent, stage)``
+    updates the record; the return value becomes the job result.
+    """
+
+    def __init__(self, client, ttl: int, workers: int = 2, max_pending: int = 100,
+                 prefix: str = 'aurascribe:job'):
+        self.client = client
+        self.ttl = ttl
+        self.workers = workers
+        self.max_pending = max_pending
+        self.prefix = prefix
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='aurascribe-job')
+        # Fallback records while Redis is down: bounded and expiring like the Redis keys
+        self._local = LocalTTLCache('jobs', ttl)
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self.stats = {'submitted': 0, 'completed': 0, 'failed': 0, 'rejected': 0}
+
+    def _key(self, job_id: str) -> str:
+        return f"{self.prefix}:{job_id}"
+
+    # ---------- records ----------
+
+    def _save(self, job: dict):
+        if self.client:
+            try:
+                self.client.setex(self._key(job['id']), self.ttl, json.dumps(job))
+                return
+            except redis.RedisError as e:
+                logger.error(f"Redis error saving job: {e}")
+        self._local.set(job['id'], job)
+
+    def get(self, job_id: str) -> Optional[dict]:
+        if self.client:
+            try:
+                data = self.client.get(self._key(job_id))
+                if data:
+                    return json.loads(data)
+            except redis.RedisError as e:
+                logger.error(f"Redis error getting job: {e}")
+        return self._local.get(job_id)
+
+    def update(self, job_id: str, **fields) -> Optional[dict]:
+        job = self.get(job_id)
+        if job is None:
+            return None
+        job.update(fields)
+        job['updated_at'] = datetime.now().isoformat()
+        self._save(job)
+        return job
+
+    # ---------- execution ----------
+
+    def submit(self, kind: str, func: Callable[..., Any], *args, metadata: Optional[dict] = None) -> str:
+        """Queue ``func`` and return the job id (raises QueueFullError when saturated)"""
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.stats['rejected'] += 1
+                raise QueueFullError(f"Job queue full ({self.max_pending} pending)")
+            self._pending += 1
+            self.stats['submitted'] += 1
+
+        now = datetime.now().isoformat()
+        job = {
+            'id': str(uuid.uuid4()),
+            'kind': kind,
+            'status': JOB_PENDING,
+            'progress': 0,
+            'stage': 'queued',
+            'result': None,
+            'error': None,
+            'metadata': metadata or {},
+            'created_at': now,
+            'updated_at': now
+        }
+        self._save(job)
+        self._executor.submit(self._run, job['id'], func, args)
+        logger.info(f"Job {job['id']} ({kind}) queued")
+        return job['id']
+
+    def _run(self, job_id: str, func: Callable[..., Any], args: tuple):
+        with self._lock:
+            self._pending -= 1
+            self._running += 1
+        started = time.time()
+        handle = JobHandle(self, job_id)
+        self.update(job_id, status=JOB_RUNNING, stage='started', started_at=datetime.now().isoformat())
+        try:
+            result = func(handle, *args)
+            self.update(job_id, status=JOB_COMPLETED, progress=100, stage='done', result=result,
+                        duration_ms=round((time.time() - started) * 1000))
+            with self._lock:
+                self.stats['completed'] += 1
+            logger.info(f"Job {job_id} completed in {time.time() - started:.1f}s")
+        except Exception as e:
+            logger.error(f"Job {job_id} failed: {e}")
+            self.update(job_id, status=JOB_FAILED, stage='failed', error=str(e),
+                        duration_ms=round((time.time() - started) * 1000))
+            with self._lock:
+                self.stats['failed'] += 1
+        finally:
+            with self._lock:
+                self._running -= 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'max_pending': self.max_pending,
+                'pending': self._pending,
+                'running': self._running,
+                **self.stats
+            }
+
+
+class JobHandle:
+    """Passed to job functions so they can report progress"""
+
+    def __init__(self, queue: JobQueue, job_id: str):
+        self.queue = queue
+        self.id = job_id
+
+    def progress(self, percent: int, stage: str):
+        self.queue.update(self.id, progress=percent, stage=stage)
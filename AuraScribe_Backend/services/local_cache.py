@@ -0,0 +1,193 @@
+"""
+local_cache.py
+Bounded, expiring in-process stores for when Redis is unavailable.
+
+The fallback stores (sessions, AuraLink transfers, WebSocket sessions) were
+plain dicts: nothing expired and nothing was bounded, so a Redis outage became
+a memory leak and kept patient data past its retention TTL. LocalTTLCache
+gives them the Redis semantics that matter here:
+
+- every entry has a TTL; expired entries are never returned and are removed
+  by lookups, writes and a background sweeper (min-heap of expiry times)
+- at most ``max_entries`` entries and ``max_bytes`` of (JSON-estimated) values;
+  the least recently used entries are evicted first
+"""
+
+import heapq
+import json
+import logging
+import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+FALLBACK_CACHE_MAX_ENTRIES = int(os.getenv('FALLBACK_CACHE_MAX_ENTRIES', '1000'))
+FALLBACK_CACHE_MAX_BYTES = int(os.getenv('FALLBACK_CACHE_MAX_BYTES', str(64 * 1024 * 1024)))
+FALLBACK_CACHE_SWEEP_INTERVAL = float(os.getenv('FALLBACK_CACHE_SWEEP_INTERVAL', '60'))
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate footprint: length of the JSON the value would be stored as in Redis"""
+    try:
+        return len(json.dumps(value, default=str))
+    except (TypeError, ValueError):
+        return len(repr(value))
+
+
+class LocalTTLCache:
+    """
+    Dict-like store with per-entry TTL, LRU order and entry/byte bounds.
+
+    Values are held by reference: after mutating one in place, ``set`` it again
+    so its size is re-measured (and its TTL refreshed, as a Redis write would).
+    """
+
+    def __init__(self, name: str, ttl: int, max_entries: int = FALLBACK_CACHE_MAX_ENTRIES,
+                 max_bytes: int = FALLBACK_CACHE_MAX_BYTES):
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        # key -> (value, expires_at, size), oldest use first
+        self._entries: 'OrderedDict[str, Tuple[Any, float, int]]' = OrderedDict()
+        # (expires_at, key); stale pairs (key rewritten or removed) are skipped when popped
+        self._expiry: List[Tuple[float, str]] = []
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.stats = {'sets': 0, 'hits': 0, 'misses': 0, 'expired': 0,
+                      'evicted_entries': 0, 'evicted_bytes': 0, 'rejected': 0}
+        _register(self)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats['misses'] += 1
+                return default
+            if entry[1] <= time.time():
+                self._remove(key)
+                self.stats['expired'] += 1
+                self.stats['misses'] += 1
+                return default
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return entry[0]
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None):
+        size = estimate_size(value)
+        expires_at = time.time() + (ttl or self.ttl)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if size > self.max_bytes:
+                # Would evict everything else and still not fit
+                self.stats['rejected'] += 1
+                logger.warning(f"{self.name} fallback cache: {key} ({size} bytes) exceeds max_bytes, not stored")
+                return
+            self._entries[key] = (value, expires_at, size)
+            self._bytes += size
+            heapq.heappush(self._expiry, (expires_at, key))
+            self.stats['sets'] += 1
+            self._expire(time.time())
+            self._evict()
+
+    def pop(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            self._remove(key)
+            return entry[0] if entry[1] > time.time() else default
+
+    def values(self) -> List[Any]:
+        """Live values (a snapshot, least recently used first)"""
+        now = time.time()
+        with self._lock:
+            return [value for value, expires_at, _ in self._entries.values() if expires_at > now]
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and entry[1] > time.time()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def __iter__(self) -> Iterator[str]:
+        now = time.time()
+        with self._lock:
+            return iter([key for key, (_, expires_at, _) in self._entries.items() if expires_at > now])
+
+    def sweep(self) -> int:
+        """Drop every expired entry; returns how many"""
+        with self._lock:
+            return self._expire(time.time())
+
+    def _remove(self, key: str):
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def _expire(self, now: float) -> int:
+        removed = 0
+        while self._expiry and self._expiry[0][0] <= now:
+            expires_at, key = heapq.heappop(self._expiry)
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] == expires_at:
+                self._remove(key)
+                removed += 1
+        self.stats['expired'] += removed
+        # Rewrites leave stale heap pairs behind; rebuild once they dominate
+        if len(self._expiry) > 2 * len(self._entries) + 64:
+            self._expiry = [(expires_at, key) for key, (_, expires_at, _) in self._entries.items()]
+            heapq.heapify(self._expiry)
+        return removed
+
+    def _evict(self):
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            key, (_, _, size) = self._entries.popitem(last=False)
+            self._bytes -= size
+            self.stats['evicted_entries'] += 1
+            self.stats['evicted_bytes'] += size
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {'entries': len(self._entries), 'bytes': self._bytes, 'ttl': self.ttl,
+                    'max_entries': self.max_entries, 'max_bytes': self.max_bytes, **self.stats}
+
+
+# ---- registry and background sweeper ----
+
+_caches: 'weakref.WeakSet[LocalTTLCache]' = weakref.WeakSet()
+_sweeper: Optional[threading.Thread] = None
+_registry_lock = threading.Lock()
+
+
+def _register(cache: LocalTTLCache):
+    global _sweeper
+    with _registry_lock:
+        _caches.add(cache)
+        if _sweeper is None and FALLBACK_CACHE_SWEEP_INTERVAL > 0:
+            _sweeper = threading.Thread(target=_sweep_loop, name='aurascribe-fallback-sweeper', daemon=True)
+            _sweeper.start()
+
+
+def _sweep_loop():
+    while True:
+        time.sleep(FALLBACK_CACHE_SWEEP_INTERVAL)
+        for cache in list(_caches):
+            try:
+                removed = cache.sweep()
+                if removed:
+                    logger.debug(f"{cache.name} fallback cache: {removed} expired entries swept")
+            except Exception as e:
+                logger.error(f"Fallback cache sweep failed for {cache.name}: {e}")
+
+
+def get_local_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Stats of every fallback cache, by name"""
+    return {cache.name: cache.get_stats() for cache in list(_caches)}
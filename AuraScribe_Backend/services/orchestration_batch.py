@@ -0,0 +1,121 @@
+"""
+orchestration_batch.py
+Batch orchestration for back-loaded dictations.
+
+A batch is a sequence of ``{"id", "transcript", "persona"}`` items (a list, or
+an iterator such as lines read from an NDJSON request body). Items are
+orchestrated on a process-wide coordinator pool with at most
+ORCHESTRATION_BATCH_CONCURRENCY per batch in flight; each coordinator runs its
+agents on the shared agent executor as usual. Results come back in input order
+as soon as the head of the window is done, and a bad item yields an error
+entry instead of failing the batch.
+"""
+
+import json
+import logging
+import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+from services.AuraScribeOrchestrator import orchestrate_transcript
+
+logger = logging.getLogger(__name__)
+
+ORCHESTRATION_BATCH_CONCURRENCY = int(os.getenv('ORCHESTRATION_BATCH_CONCURRENCY', '4'))
+ORCHESTRATION_BATCH_MAX_ITEMS = int(os.getenv('ORCHESTRATION_BATCH_MAX_ITEMS', '1000'))
+
+
+class BatchItemError(ValueError):
+    """An item that cannot be orchestrated (reported for that item only)"""
+
+
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ThreadPoolExecutor:
+    """Coordinator threads shared by every batch (sized for a few concurrent batches)"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadPoolExecutor(max_workers=ORCHESTRATION_BATCH_CONCURRENCY * 2,
+                                           thread_name_prefix='aurascribe-batch')
+    return _pool
+
+
+def parse_ndjson(lines: Iterable) -> Iterator[Any]:
+    """Items from NDJSON lines (bytes or str); unparseable lines become BatchItemError items"""
+    for number, line in enumerate(lines, 1):
+        if isinstance(line, bytes):
+            line = line.decode('utf-8', errors='replace')
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as e:
+            yield BatchItemError(f"Line {number}: invalid JSON ({e})")
+
+
+def iter_batch(items: Iterable[Any], persona_key: str = 'generalist', selective=None,
+               use_parallel: bool = True, concurrency: int = ORCHESTRATION_BATCH_CONCURRENCY,
+               max_items: int = ORCHESTRATION_BATCH_MAX_ITEMS) -> Iterator[Dict[str, Any]]:
+    """
+    Orchestrate every item and yield ``{"index", "id", "success", "orchestration" | "error"}``
+    in input order. ``persona_key``/``selective`` are defaults an item may override.
+    Items past ``max_items`` are not run; one error entry reports the truncation.
+    """
+    pool = _get_pool()
+    window = deque()
+    concurrency = max(1, concurrency)
+
+    def submit(index, item):
+        item_id = item.get('id', index) if isinstance(item, dict) else index
+        try:
+            transcript, persona, item_selective = _validate(item, persona_key, selective)
+        except BatchItemError as e:
+            window.append((index, item_id, None, str(e)))
+            return
+        future = pool.submit(orchestrate_transcript, transcript, persona_key=persona,
+                             use_parallel=use_parallel, selective=item_selective)
+        window.append((index, item_id, future, None))
+
+    def pop_head():
+        index, item_id, future, error = window.popleft()
+        if future is not None:
+            try:
+                return {'index': index, 'id': item_id, 'success': True, 'orchestration': future.result()}
+            except Exception as e:
+                logger.error(f"Batch item {item_id} failed: {e}")
+                error = str(e)
+        return {'index': index, 'id': item_id, 'success': False, 'error': error}
+
+    truncated_at = None
+    for index, item in enumerate(items):
+        if index >= max_items:
+            truncated_at = index
+            break
+        submit(index, item)
+        while len(window) >= concurrency:
+            yield pop_head()
+    while window:
+        yield pop_head()
+    if truncated_at is not None:
+        yield {'index': truncated_at, 'id': None, 'success': False,
+               'error': f"Batch limit of {max_items} items reached; remaining items were not processed"}
+
+
+def _validate(item, persona_key, selective):
+    if isinstance(item, BatchItemError):
+        raise item
+    if isinstance(item, str):
+        item = {'transcript': item}
+    if not isinstance(item, dict):
+        raise BatchItemError("Item must be an object with a transcript")
+    transcript = item.get('transcript')
+    if not isinstance(transcript, str) or not transcript.strip():
+        raise BatchItemError("Missing transcript")
+    return transcript, item.get('persona') or persona_key, item.get('selective', selective)
+
@@ -0,0 +1,98 @@
+"""
+orchestration_cache.py
+Memoized orchestration results.
+
+Retries, tab refreshes and re-renders post the same transcript again; the
+result only depends on the transcript, the persona, the options, which agents
+are loaded and the agents' code. Keys hash all of those, so a deploy that
+changes an agent never serves results computed by the old version. Storage is
+the same LRU (process) + Redis (shared, TTL) tiers as the transcription cache,
+and identical requests arriving together wait for one computation.
+"""
+
+import hashlib
+import logging
+import threading
+import unicodedata
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from services.transcription_cache import TranscriptionCache
+
+logger = logging.getLogger(__name__)
+
+CACHE_HIT = 'hit'
+CACHE_SHARED = 'shared'
+CACHE_MISS = 'miss'
+
+
+def normalize_transcript(text: str) -> str:
+    """Form of the transcript that is hashed: NFC, LF line endings, no outer whitespace"""
+    return unicodedata.normalize('NFC', text or '').replace('\r\n', '\n').strip()
+
+
+def source_fingerprint(paths: Iterable[str], salt: str = '') -> str:
+    """SHA-256 over the given source files (missing files count as empty) and ``salt``"""
+    digest = hashlib.sha256(salt.encode())
+    for path in sorted(set(paths)):
+        digest.update(path.encode())
+        try:
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+        except OSError as e:
+            logger.warning(f"Could not fingerprint {path}: {e}")
+    return digest.hexdigest()
+
+
+class OrchestrationCache(TranscriptionCache):
+    """Result cache for orchestrate_transcript; returned results are shared, treat them as read-only"""
+
+    def __init__(self, client, ttl: int, max_entries: int = 128, prefix: str = 'aurascribe:orchestration'):
+        super().__init__(client, ttl, max_entries=max_entries, prefix=prefix)
+        self._inflight: Dict[str, threading.Event] = {}
+        self.stats['shared'] = 0
+
+    @staticmethod
+    def make_key(transcript: str, persona_key: str, agents: Iterable[str], fingerprint: str, **options) -> str:
+        digest = hashlib.sha256(normalize_transcript(transcript).encode()).hexdigest()
+        return TranscriptionCache.key_for_digest(
+            digest, persona=persona_key, agents='+'.join(sorted(agents)), version=fingerprint[:16], **options
+        )
+
+    def get_or_compute(self, key: str, compute: Callable[[], Dict[str, Any]],
+                       cacheable: Callable[[Dict[str, Any]], bool],
+                       wait_timeout: float) -> Tuple[Dict[str, Any], str, Optional[str]]:
+        """
+        Cached result for ``key`` or ``compute()`` it (storing it if ``cacheable``).
+
+        Returns ``(result, status, tier)``. A request that finds the same key being
+        computed waits up to ``wait_timeout`` seconds and reuses that result
+        (status 'shared'); if none was stored it computes its own.
+        """
+        result, tier = self.lookup(key)
+        if result is not None:
+            return result, CACHE_HIT, tier
+
+        with self._lock:
+            event = self._inflight.get(key)
+            leader = event is None
+            if leader:
+                event = self._inflight[key] = threading.Event()
+
+        if not leader:
+            event.wait(wait_timeout)
+            with self._lock:
+                result = self._lru.get(key)
+                if result is not None:
+                    self.stats['shared'] += 1
+                    return dict(result), CACHE_SHARED, 'memory'
+
+        try:
+            result = compute()
+            if cacheable(result):
+                self.set(key, result)
+        finally:
+            if leader:
+                with self._lock:
+                    self._inflight.pop(key, None)
+                event.set()
+        return result, CACHE_MISS, None
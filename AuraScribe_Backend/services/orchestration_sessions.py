@@ -0,0 +1,101 @@
+"""
+orchestration_sessions.py
+Per-dictation state for incremental orchestration.
+
+While recording, the frontend re-posts the growing transcript under one session
+id. Each session keeps an IncrementalTranscriptAnalysis (keyword automaton state,
+matches, memoized lookups) so only the newly appended text is scanned. Sessions
+live in process memory, bounded by count (LRU) and idle time (TTL); a session
+that is unknown to this worker simply starts from the full transcript.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from agents.transcript_analysis import IncrementalTranscriptAnalysis
+
+logger = logging.getLogger(__name__)
+
+ORCHESTRATION_SESSION_TTL = int(os.getenv('ORCHESTRATION_SESSION_TTL', '3600'))
+ORCHESTRATION_SESSION_MAX = int(os.getenv('ORCHESTRATION_SESSION_MAX', '500'))
+
+
+class OrchestrationSession:
+    """Analysis and last result of one dictation; hold ``lock`` while using it"""
+
+    def __init__(self, session_id: str, persona_key: str):
+        self.session_id = session_id
+        self.persona_key = persona_key
+        self.analysis = IncrementalTranscriptAnalysis()
+        self.result: Optional[Dict[str, Any]] = None
+        self.updates = 0
+        self.lock = threading.Lock()
+        self.touched = time.monotonic()
+
+    def reset(self, persona_key: str):
+        self.persona_key = persona_key
+        self.analysis = IncrementalTranscriptAnalysis()
+        self.result = None
+        self.updates = 0
+
+
+class OrchestrationSessionStore:
+    """LRU + idle-TTL map of session id -> OrchestrationSession"""
+
+    def __init__(self, ttl: int = ORCHESTRATION_SESSION_TTL, max_sessions: int = ORCHESTRATION_SESSION_MAX):
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self._sessions: 'OrderedDict[str, OrchestrationSession]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'created': 0, 'reused': 0, 'expired': 0, 'evicted': 0}
+
+    def get_or_create(self, session_id: str, persona_key: str) -> OrchestrationSession:
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            session = self._sessions.get(session_id)
+            if session is None:
+                session = self._sessions[session_id] = OrchestrationSession(session_id, persona_key)
+                self.stats['created'] += 1
+                while len(self._sessions) > self.max_sessions:
+                    evicted, _ = self._sessions.popitem(last=False)
+                    self.stats['evicted'] += 1
+                    logger.info(f"Evicted orchestration session {evicted}")
+            else:
+                self._sessions.move_to_end(session_id)
+                self.stats['reused'] += 1
+            session.touched = now
+            return session
+
+    def discard(self, session_id: str) -> bool:
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def _expire(self, now: float):
+        # Least recently used first, so stop at the first live session
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if now - session.touched < self.ttl:
+                break
+            del self._sessions[session_id]
+            self.stats['expired'] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self.stats,
+                'sessions': len(self._sessions),
+                'max_sessions': self.max_sessions,
+                'ttl': self.ttl
+            }
+
+
+_store = OrchestrationSessionStore()
+
+
+def get_session_store() -> OrchestrationSessionStore:
+    return _store
@@ -0,0 +1,201 @@
+"""
+record_index.py
+Newest-first listing of records (sessions, AuraLink transfers) without KEYS.
+
+Each record kind keeps two sorted sets next to its records:
+- ``created``: id scored by created_at, walked newest first for listings
+- ``expires``: id scored by the expiry of its last save, used to drop ids whose
+  record has expired (Redis keys expire on their own; index members do not)
+
+A page is one ZREVRANGEBYSCORE plus one MGET, O(limit) whatever the number of
+records. Pages are addressed by an opaque cursor (score and id of the last
+record returned), so records created meanwhile do not shift later pages. Ids
+whose record is gone are removed lazily when a page or a prune meets them.
+"""
+
+import logging
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from services.codec import Codec, get_codec
+
+logger = logging.getLogger(__name__)
+
+
+def created_score(created_at: Optional[str]) -> float:
+    """Epoch seconds of an ISO created_at (now if missing or unparseable)"""
+    try:
+        return datetime.fromisoformat(created_at).timestamp()
+    except (TypeError, ValueError):
+        return time.time()
+
+
+def encode_cursor(score: float, record_id: str) -> str:
+    return f"{score!r}:{record_id}"
+
+
+def decode_cursor(cursor: Optional[str]) -> Tuple[Optional[float], Optional[str]]:
+    """``(score, id)`` of the last record of the previous page, ``(None, None)`` for the first page"""
+    if not cursor:
+        return None, None
+    score, _, record_id = cursor.partition(':')
+    try:
+        return float(score), record_id
+    except ValueError:
+        raise ValueError(f"Invalid cursor: {cursor}")
+
+
+def _after_cursor(score: float, record_id: str, cursor_score: Optional[float], cursor_id: Optional[str]) -> bool:
+    # Newest first; equal scores come in descending id order (as ZREVRANGEBYSCORE returns them)
+    if cursor_score is None:
+        return True
+    return score < cursor_score or (score == cursor_score and record_id < cursor_id)
+
+
+def page_records(records: Iterable[Dict[str, Any]], limit: int,
+                 cursor: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Same paging over in-memory records (the fallback stores)"""
+    cursor_score, cursor_id = decode_cursor(cursor)
+    ordered = sorted(((created_score(r.get('created_at')), r['id'], r) for r in records),
+                     key=lambda item: (item[0], item[1]), reverse=True)
+    page = [item for item in ordered if _after_cursor(item[0], item[1], cursor_score, cursor_id)][:limit + 1]
+    next_cursor = encode_cursor(page[limit - 1][0], page[limit - 1][1]) if len(page) > limit else None
+    return [record for _, _, record in page[:limit]], next_cursor
+
+
+class RecordIndex:
+    """
+    Records stored at ``{key_prefix}{id}`` with TTL, indexed for paged listing.
+
+    Values are written with ``codec`` through ``raw_client`` (a
+    decode_responses=False client, as encoded records are bytes); the
+    indexes go through ``client``.
+    """
+
+    def __init__(self, client, key_prefix: str, name: str, raw_client=None,
+                 codec: Optional[Codec] = None, prune_batch: int = 500):
+        self.client = client
+        self.raw_client = raw_client or client
+        self.codec = codec or get_codec()
+        self.key_prefix = key_prefix
+        self.created_key = f"aurascribe:index:{name}:created"
+        self.expires_key = f"aurascribe:index:{name}:expires"
+        self.backfilled_key = f"aurascribe:index:{name}:backfilled"
+        self.prune_batch = prune_batch
+        self._backfilled = False
+
+    def key(self, record_id: str) -> str:
+        return f"{self.key_prefix}{record_id}"
+
+    def save(self, record_id: str, record: Dict[str, Any], ttl: int, created_at: Optional[str]):
+        """SETEX the encoded record and index it, in one MULTI/EXEC round-trip"""
+        pipe = self.raw_client.pipeline(transaction=True)
+        pipe.setex(self.key(record_id), ttl, self.codec.encode(record))
+        self._index(pipe, record_id, ttl, created_at)
+        pipe.execute()
+
+    def get(self, record_id: str) -> Optional[Dict[str, Any]]:
+        return self.fetch([record_id])[0]
+
+    def fetch(self, record_ids: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """Stored records for ``record_ids`` (None where gone or unreadable)"""
+        values = self.raw_client.mget([self.key(record_id) for record_id in record_ids])
+        records = []
+        for record_id, data in zip(record_ids, values):
+            try:
+                records.append(self.codec.decode(data))
+            except ValueError as e:
+                logger.error(f"Unreadable record {self.key(record_id)}: {e}")
+                records.append(None)
+        return records
+
+    def _index(self, pipe, record_id: str, ttl: int, created_at: Optional[str]):
+        pipe.zadd(self.created_key, {record_id: created_score(created_at)})
+        pipe.zadd(self.expires_key, {record_id: time.time() + ttl})
+
+    def delete(self, record_id: str):
+        pipe = self.client.pipeline(transaction=True)
+        pipe.delete(self.key(record_id))
+        pipe.zrem(self.created_key, record_id)
+        pipe.zrem(self.expires_key, record_id)
+        pipe.execute()
+
+    def page(self, limit: int, cursor: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Up to ``limit`` records (as fetch() returns them), newest first, and the next page's cursor (None at the end)"""
+        self._backfill()
+        self.prune()
+        cursor_score, cursor_id = decode_cursor(cursor)
+        max_score = repr(cursor_score) if cursor_score is not None else '+inf'
+        found: List[Tuple[str, float, Any]] = []
+        offset = 0
+        while True:
+            batch = self.client.zrevrangebyscore(self.created_key, max_score, '-inf',
+                                                 start=offset, num=limit + 1, withscores=True)
+            offset += len(batch)
+            # Ids tied with the cursor's score that were already returned
+            candidates = [(record_id, score) for record_id, score in batch
+                          if _after_cursor(score, record_id, cursor_score, cursor_id)]
+            if candidates:
+                values = self.fetch([record_id for record_id, _ in candidates])
+                gone = [record_id for (record_id, _), value in zip(candidates, values) if value is None]
+                if gone:
+                    self._unindex(gone)
+                    offset -= len(gone)
+                found.extend((record_id, score, value)
+                             for (record_id, score), value in zip(candidates, values) if value is not None)
+            if len(found) > limit or len(batch) < limit + 1:
+                break
+        next_cursor = encode_cursor(found[limit - 1][1], found[limit - 1][0]) if len(found) > limit else None
+        return [value for _, _, value in found[:limit]], next_cursor
+
+    def prune(self):
+        """Drop up to prune_batch ids whose last save has expired (kept if the record still exists)"""
+        expired = self.client.zrangebyscore(self.expires_key, '-inf', time.time(), start=0, num=self.prune_batch)
+        if not expired:
+            return
+        pipe = self.client.pipeline(transaction=False)
+        for record_id in expired:
+            pipe.ttl(self.key(record_id))
+        ttls = pipe.execute()
+        gone = [record_id for record_id, ttl in zip(expired, ttls) if ttl == -2]
+        alive = {record_id: time.time() + max(ttl, 1) for record_id, ttl in zip(expired, ttls) if ttl != -2}
+        if alive:
+            self.client.zadd(self.expires_key, alive)
+        if gone:
+            self._unindex(gone)
+
+    def _unindex(self, record_ids: List[str]):
+        pipe = self.client.pipeline(transaction=False)
+        pipe.zrem(self.created_key, *record_ids)
+        pipe.zrem(self.expires_key, *record_ids)
+        pipe.execute()
+
+    def _backfill(self):
+        """Index records saved before the index existed (SCAN, once per process until marked done)"""
+        if self._backfilled:
+            return
+        self._backfilled = True
+        # A marker, not the index's existence: the first save after an upgrade creates the index
+        if self.client.exists(self.backfilled_key):
+            return
+        record_ids = [key[len(self.key_prefix):]
+                      for key in self.client.scan_iter(match=f"{self.key_prefix}*", count=500)]
+        created, expires = {}, {}
+        for start in range(0, len(record_ids), 500):
+            chunk = record_ids[start:start + 500]
+            pipe = self.client.pipeline(transaction=False)
+            for record_id in chunk:
+                pipe.ttl(self.key(record_id))
+            for record_id, record, ttl in zip(chunk, self.fetch(chunk), pipe.execute()):
+                if not record or ttl == -2:
+                    continue
+                created[record_id] = created_score(record.get('created_at'))
+                expires[record_id] = time.time() + (ttl if ttl > 0 else 86400)
+        if created:
+            pipe = self.client.pipeline(transaction=False)
+            pipe.zadd(self.created_key, created)
+            pipe.zadd(self.expires_key, expires)
+            pipe.execute()
+            logger.info(f"Indexed {len(created)} existing records under {self.created_key}")
+        self.client.set(self.backfilled_key, int(time.time()))
@@ -0,0 +1,172 @@
+"""
+session_store.py
+Realtime sessions as a Redis hash plus an append-only transcript.
+
+A session used to be one JSON string, so every transcript append or status
+change read, decoded, re-encoded and rewrote the whole session (transcript
+included), and two concurrent appends could lose one of them. Now:
+
+- ``aurascribe:session:{id}`` is a hash, one JSON-encoded field per session
+  field (``transcript_length`` is kept as a plain integer)
+- ``aurascribe:session_transcript:{id}`` holds the transcript, grown with APPEND
+
+Appends and field updates are Lua scripts: existence check, write, TTL refresh
+of both keys and of the listing index in one atomic step, costing O(appended
+text) / O(updated fields). Sessions still stored as JSON strings (written
+before this layout) are converted on first access.
+"""
+
+import json
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+import redis
+
+from services.record_index import RecordIndex
+from services.storage import pipelined
+
+logger = logging.getLogger(__name__)
+
+_MISSING = -1
+_LEGACY = -2
+
+# KEYS: session hash, transcript, expires index
+# ARGV: ttl, expiry score, session id, text, text length (characters), updated_at (JSON)
+APPEND_SCRIPT = """
+local kind = redis.call('TYPE', KEYS[1]).ok
+if kind == 'none' then return -1 end
+if kind ~= 'hash' then return -2 end
+local added = tonumber(ARGV[5])
+if tonumber(redis.call('HGET', KEYS[1], 'transcript_length') or '0') > 0 then
+    redis.call('APPEND', KEYS[2], ' ' .. ARGV[4])
+    added = added + 1
+else
+    redis.call('SET', KEYS[2], ARGV[4])
+end
+local length = redis.call('HINCRBY', KEYS[1], 'transcript_length', added)
+redis.call('HSET', KEYS[1], 'updated_at', ARGV[6])
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+redis.call('EXPIRE', KEYS[2], ARGV[1])
+redis.call('ZADD', KEYS[3], ARGV[2], ARGV[3])
+return length
+"""
+
+# KEYS: session hash, transcript, expires index
+# ARGV: ttl, expiry score, session id, field, value, field, value...
+UPDATE_SCRIPT = """
+local kind = redis.call('TYPE', KEYS[1]).ok
+if kind == 'none' then return -1 end
+if kind ~= 'hash' then return -2 end
+for i = 4, #ARGV, 2 do
+    redis.call('HSET', KEYS[1], ARGV[i], ARGV[i + 1])
+end
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+redis.call('EXPIRE', KEYS[2], ARGV[1])
+redis.call('ZADD', KEYS[3], ARGV[2], ARGV[3])
+return {redis.call('HGETALL', KEYS[1]), redis.call('GET', KEYS[2]) or ''}
+"""
+
+
+class SessionStore(RecordIndex):
+    """Sessions keyed ``{key_prefix}{id}``, listed newest first through the RecordIndex"""
+
+    def __init__(self, client, ttl: int, key_prefix: str = 'aurascribe:session:',
+                 transcript_prefix: str = 'aurascribe:session_transcript:'):
+        super().__init__(client, key_prefix, 'session')
+        self.ttl = ttl
+        self.transcript_prefix = transcript_prefix
+        self._append = client.register_script(APPEND_SCRIPT) if client else None
+        self._update = client.register_script(UPDATE_SCRIPT) if client else None
+
+    def transcript_key(self, session_id: str) -> str:
+        return f"{self.transcript_prefix}{session_id}"
+
+    def save(self, session: Dict[str, Any], ttl: Optional[int] = None):
+        """Write a whole session (creation); later changes go through append_transcript/update"""
+        session_id = session['id']
+        ttl = ttl or self.ttl
+        transcript = session.get('transcript') or ''
+        fields = {field: json.dumps(value) for field, value in session.items() if field != 'transcript'}
+        fields['transcript_length'] = len(transcript)
+        pipe = self.client.pipeline(transaction=True)
+        pipe.delete(self.key(session_id))
+        pipe.hset(self.key(session_id), mapping=fields)
+        pipe.set(self.transcript_key(session_id), transcript, ex=ttl)
+        pipe.expire(self.key(session_id), ttl)
+        self._index(pipe, session_id, ttl, session.get('created_at'))
+        pipe.execute()
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        return self.fetch([session_id])[0]
+
+    def fetch(self, record_ids: List[str]) -> List[Optional[Dict[str, Any]]]:
+        pipe = self.client.pipeline(transaction=False)
+        for session_id in record_ids:
+            pipe.hgetall(self.key(session_id))
+            pipe.get(self.transcript_key(session_id))
+        replies = pipe.execute(raise_on_error=False)
+        sessions = []
+        for session_id, fields, transcript in zip(record_ids, replies[0::2], replies[1::2]):
+            if isinstance(fields, redis.ResponseError):
+                sessions.append(self._migrate(session_id))
+            elif isinstance(fields, Exception):
+                raise fields
+            else:
+                sessions.append(self._decode(fields, transcript) if fields else None)
+        return sessions
+
+    def append_transcript(self, session_id: str, text: str, updated_at: str) -> Optional[int]:
+        """Append ``text`` (space-separated) and return the transcript length, None if no such session"""
+        length = self._run(self._append, session_id, [text, len(text), json.dumps(updated_at)])
+        return None if length == _MISSING else length
+
+    def update(self, session_id: str, fields: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Set some session fields and return the updated session, None if no such session"""
+        args = []
+        for field, value in fields.items():
+            if field in ('id', 'transcript', 'transcript_length'):
+                raise ValueError(f"Session field {field} cannot be updated")
+            args += [field, json.dumps(value)]
+        reply = self._run(self._update, session_id, args)
+        if reply == _MISSING:
+            return None
+        flat, transcript = reply
+        return self._decode(dict(zip(flat[0::2], flat[1::2])), transcript)
+
+    def delete(self, record_id: str):
+        self.client.delete(self.transcript_key(record_id))
+        super().delete(record_id)
+
+    def _run(self, script, session_id: str, args: list):
+        keys = [self.key(session_id), self.transcript_key(session_id), self.expires_key]
+        args = [self.ttl, time.time() + self.ttl, session_id, *args]
+        reply = script(keys=keys, args=args)
+        if reply == _LEGACY:
+            if self._migrate(session_id) is None:
+                return _MISSING
+            reply = script(keys=keys, args=args)
+        return reply
+
+    def _migrate(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Rewrite a session stored as a JSON string in the hash layout, keeping its TTL"""
+        with pipelined(self.client) as pipe:
+            pipe.get(self.key(session_id))
+            pipe.ttl(self.key(session_id))
+        data, ttl = pipe.replies
+        try:
+            session = json.loads(data) if data else None
+        except ValueError:
+            session = None
+        if not isinstance(session, dict):
+            return None
+        session.setdefault('id', session_id)
+        self.save(session, ttl if ttl > 0 else self.ttl)
+        logger.info(f"Converted session {session_id} to the hash layout")
+        return session
+
+    @staticmethod
+    def _decode(fields: Dict[str, str], transcript: Optional[str]) -> Dict[str, Any]:
+        session = {field: json.loads(value) for field, value in fields.items() if field != 'transcript_length'}
+        session['transcript'] = transcript or ''
+        return session
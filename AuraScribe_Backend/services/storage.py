@@ -0,0 +1,159 @@
+"""
+storage.py
+Shared Redis connections for the whole backend.
+
+Every module used to open its own ``redis.from_url`` client with library
+defaults: no socket timeouts (a stalled Redis blocked the eventlet worker
+indefinitely), one unbounded pool per client and no health checks. Clients
+now come from here and share one bounded pool per decode mode:
+
+    get_redis()                         # str replies (JSON records)
+    get_redis(decode_responses=False)   # bytes replies (codec-encoded records)
+    get_async_redis()                   # redis.asyncio client for coroutines
+
+Both return None when Redis is unreachable at start-up, which callers already
+treat as "use the in-process fallback". STORAGE_BACKEND=memory swaps Redis
+for fakeredis, an in-process server with the same commands, TTL and Lua
+semantics, shared by every client of the process; it is meant for tests and
+local runs. fakeredis (with lupa for Lua) is an optional dependency, not in
+requirements.txt: ``pip install "fakeredis[lua]"``.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import weakref
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+import redis
+import redis.asyncio
+
+logger = logging.getLogger(__name__)
+
+REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+STORAGE_BACKEND = os.getenv('STORAGE_BACKEND', 'redis').lower()
+REDIS_MAX_CONNECTIONS = int(os.getenv('REDIS_MAX_CONNECTIONS', '50'))
+# Seconds to wait for a free pooled connection before raising ConnectionError
+REDIS_POOL_TIMEOUT = float(os.getenv('REDIS_POOL_TIMEOUT', '5'))
+REDIS_SOCKET_TIMEOUT = float(os.getenv('REDIS_SOCKET_TIMEOUT', '5'))
+REDIS_SOCKET_CONNECT_TIMEOUT = float(os.getenv('REDIS_SOCKET_CONNECT_TIMEOUT', '2'))
+REDIS_HEALTH_CHECK_INTERVAL = int(os.getenv('REDIS_HEALTH_CHECK_INTERVAL', '30'))
+
+try:
+    import fakeredis
+except ImportError:
+    fakeredis = None
+
+_lock = threading.Lock()
+_clients: Dict[bool, Optional[redis.Redis]] = {}
+_async_clients: 'weakref.WeakKeyDictionary' = weakref.WeakKeyDictionary()
+_memory_server = None
+
+
+def redacted_url(url: str = REDIS_URL) -> str:
+    """URL without credentials, for logs"""
+    return url.split('@')[-1] if '@' in url else url
+
+
+def _pool_options(decode_responses: bool) -> Dict[str, Any]:
+    return {
+        'decode_responses': decode_responses,
+        'max_connections': REDIS_MAX_CONNECTIONS,
+        'timeout': REDIS_POOL_TIMEOUT,
+        'socket_timeout': REDIS_SOCKET_TIMEOUT,
+        'socket_connect_timeout': REDIS_SOCKET_CONNECT_TIMEOUT,
+        'socket_keepalive': True,
+        'health_check_interval': REDIS_HEALTH_CHECK_INTERVAL,
+    }
+
+
+def _get_memory_server():
+    global _memory_server
+    if fakeredis is None:
+        logger.error("STORAGE_BACKEND=memory needs the fakeredis package; using in-process fallbacks")
+        return None
+    if _memory_server is None:
+        _memory_server = fakeredis.FakeServer()
+    return _memory_server
+
+
+def get_redis(decode_responses: bool = True) -> Optional[redis.Redis]:
+    """Process-wide client (pooled), None if Redis was unreachable when first requested"""
+    if decode_responses in _clients:
+        return _clients[decode_responses]
+    with _lock:
+        if decode_responses not in _clients:
+            _clients[decode_responses] = _connect(decode_responses)
+    return _clients[decode_responses]
+
+
+def _connect(decode_responses: bool) -> Optional[redis.Redis]:
+    if STORAGE_BACKEND == 'memory':
+        server = _get_memory_server()
+        return fakeredis.FakeRedis(server=server, decode_responses=decode_responses) if server else None
+    pool = redis.BlockingConnectionPool.from_url(REDIS_URL, **_pool_options(decode_responses))
+    client = redis.Redis(connection_pool=pool)
+    try:
+        client.ping()
+    except redis.RedisError as e:
+        logger.warning(f"Redis unavailable at {redacted_url()}: {e}")
+        pool.disconnect()
+        return None
+    logger.info(f"Redis connected: {redacted_url()} (pool of {REDIS_MAX_CONNECTIONS}, "
+                f"{'str' if decode_responses else 'bytes'} replies)")
+    return client
+
+
+def get_async_redis(decode_responses: bool = True) -> Optional[redis.asyncio.Redis]:
+    """
+    redis.asyncio client for the running event loop (asyncio connections cannot
+    be shared across loops, so each loop gets its own pool with the same limits).
+    None when the sync client found Redis unreachable.
+    """
+    if get_redis(decode_responses) is None:
+        return None
+    loop = asyncio.get_running_loop()
+    with _lock:
+        clients = _async_clients.setdefault(loop, {})
+        if decode_responses not in clients:
+            if STORAGE_BACKEND == 'memory':
+                clients[decode_responses] = fakeredis.FakeAsyncRedis(server=_memory_server,
+                                                                     decode_responses=decode_responses)
+            else:
+                pool = redis.asyncio.BlockingConnectionPool.from_url(REDIS_URL, **_pool_options(decode_responses))
+                clients[decode_responses] = redis.asyncio.Redis(connection_pool=pool)
+        return clients[decode_responses]
+
+
+@contextmanager
+def pipelined(client, transaction: bool = True):
+    """
+    Queue commands on a pipeline and send them in one round-trip on exit
+    (MULTI/EXEC when ``transaction``). Replies are on ``pipe.replies`` after the block:
+
+        with pipelined(client) as pipe:
+            pipe.hgetall(key)
+            pipe.ttl(key)
+        fields, ttl = pipe.replies
+    """
+    pipe = client.pipeline(transaction=transaction)
+    yield pipe
+    pipe.replies = pipe.execute()
+
+
+def get_storage_stats() -> Dict[str, Any]:
+    stats: Dict[str, Any] = {'backend': STORAGE_BACKEND}
+    if STORAGE_BACKEND != 'memory':
+        stats.update({'url': redacted_url(), 'max_connections': REDIS_MAX_CONNECTIONS,
+                      'socket_timeout': REDIS_SOCKET_TIMEOUT})
+    for decode_responses, client in list(_clients.items()):
+        pool_stats: Dict[str, Any] = {'connected': client is not None}
+        pool = getattr(client, 'connection_pool', None)
+        if isinstance(pool, redis.BlockingConnectionPool):
+            idle = sum(1 for connection in list(pool.pool.queue) if connection is not None)
+            pool_stats['connections'] = len(pool._connections)
+            pool_stats['in_use'] = len(pool._connections) - idle
+        stats['str' if decode_responses else 'bytes'] = pool_stats
+    return stats
@@ -0,0 +1,102 @@
+"""
+transcription_cache.py
+Content-addressed cache for Deepgram transcriptions.
+
+Keys are the SHA-256 of the audio bytes plus the options that change the
+result (language, model, ...). A small in-process LRU sits in front of Redis
+so identical retries return without touching the ASR server.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import redis
+
+logger = logging.getLogger(__name__)
+
+
+class TranscriptionCache:
+    """LRU (process) + Redis (shared, TTL) cache of successful transcription results"""
+
+    def __init__(self, client, ttl: int, max_entries: int = 256, prefix: str = 'aurascribe:transcription'):
+        self.client = client
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.prefix = prefix
+        self._lru: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'memory_hits': 0, 'redis_hits': 0, 'misses': 0, 'stores': 0}
+
+    @staticmethod
+    def make_key(audio_data: bytes, **options) -> str:
+        """SHA-256 of the audio followed by the sorted request options"""
+        digest = hashlib.sha256(audio_data).hexdigest()
+        return TranscriptionCache.key_for_digest(digest, **options)
+
+    @staticmethod
+    def key_for_digest(digest: str, **options) -> str:
+        suffix = ','.join(f"{name}={options[name]}" for name in sorted(options))
+        return f"{digest}:{suffix}"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return self.lookup(key)[0]
+
+    def lookup(self, key: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """``(result, tier)`` where tier is 'memory' or 'redis'; ``(None, None)`` on a miss"""
+        with self._lock:
+            result = self._lru.get(key)
+            if result is not None:
+                self._lru.move_to_end(key)
+                self.stats['memory_hits'] += 1
+                return dict(result), 'memory'
+
+        if self.client:
+            try:
+                data = self.client.get(f"{self.prefix}:{key}")
+                if data:
+                    result = json.loads(data)
+                    self._remember(key, result)
+                    with self._lock:
+                        self.stats['redis_hits'] += 1
+                    return dict(result), 'redis'
+            except (redis.RedisError, ValueError) as e:
+                logger.error(f"Redis error reading {self.prefix} cache: {e}")
+
+        with self._lock:
+            self.stats['misses'] += 1
+        return None, None
+
+    def set(self, key: str, result: Dict[str, Any]):
+        self._remember(key, result)
+        with self._lock:
+            self.stats['stores'] += 1
+        if self.client:
+            try:
+                self.client.setex(f"{self.prefix}:{key}", self.ttl, json.dumps(result))
+            except (redis.RedisError, TypeError, ValueError) as e:
+                logger.error(f"Could not write {self.prefix} cache to Redis: {e}")
+
+    def _remember(self, key: str, result: Dict[str, Any]):
+        with self._lock:
+            self._lru[key] = result
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.max_entries:
+                self._lru.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hits = self.stats['memory_hits'] + self.stats['redis_hits']
+            lookups = hits + self.stats['misses']
+            return {
+                **self.stats,
+                'hits': hits,
+                'hit_rate': round(hits / lookups, 3) if lookups else 0.0,
+                'entries': len(self._lru),
+                'max_entries': self.max_entries,
+                'ttl': self.ttl,
+                'redis': self.client is not None
+            }
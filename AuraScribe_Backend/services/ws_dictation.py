@@ -5,11 +5,14 @@ import logging
 from google.oauth2 import id_token
 from google.auth.transport import requests as google_requests
 import redis
-import json
 import os
 import base64
-import tempfile
-import uuid
+import threading
+
+from services.dictation_store import ChunkCounter, TranscriptLog
+from services.codec import get_codec
+from services.local_cache import LocalTTLCache
+from services.storage import get_redis
 
 # Error handler for WebSocket events
 
@@ -28,58 +31,71 @@ socketio = SocketIO(cors_allowed_origins="*", async_mode='threading', logger=Tru
 API_KEY = os.getenv('AURASCRIBE_API_KEY')
 
 # Session management with Redis fallback
-def get_redis_connection():
-    redis_url = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
-    try:
-        client = redis.from_url(redis_url, decode_responses=True)
-        client.ping()
-        return client
-    except:
-        return None
+WS_SESSION_TTL = 3600
+
+redis_client = get_redis()
+# ws_session records are codec-encoded bytes (services/codec.py)
+raw_redis_client = get_redis(decode_responses=False)
+codec = get_codec()
+local_sessions = LocalTTLCache('ws_sessions', WS_SESSION_TTL)  # Fallback storage (bounded, expiring)
+
+# Audio chunks are transcribed as they arrive; only their count is stored, never in the session JSON
+audio_chunks = ChunkCounter(redis_client, WS_SESSION_TTL)
 
-redis_client = get_redis_connection()
-local_sessions = {}  # Fallback storage
+# Final transcript segments are appended (RPUSH), never rewritten with the session record
+transcript_log = TranscriptLog(redis_client, WS_SESSION_TTL)
 
 def save_session(session_id, data):
-    try:
-        if redis_client:
-            redis_client.setex(f"ws_session:{session_id}", 3600, json.dumps(data))
-        else:
-            local_sessions[session_id] = data
-    except Exception as e:
-        local_sessions[session_id] = data
+    if redis_client:
+        try:
+            raw_redis_client.setex(f"ws_session:{session_id}", WS_SESSION_TTL, codec.encode(data))
+            return
+        except redis.RedisError as e:
+            logger.error(f"Redis error saving ws session {session_id}: {e}")
+    local_sessions.set(session_id, data)
 
 def get_session(session_id):
-    try:
-        if redis_client:
-            data = redis_client.get(f"ws_session:{session_id}")
-            return json.loads(data) if data else None
-        else:
-            return local_sessions.get(session_id)
-    except:
-        return local_sessions.get(session_id)
+    if redis_client:
+        try:
+            data = raw_redis_client.get(f"ws_session:{session_id}")
+            if data:
+                return codec.decode(data)
+        except (redis.RedisError, ValueError) as e:
+            logger.error(f"Redis error getting ws session {session_id}: {e}")
+    return local_sessions.get(session_id)
 
 def delete_session(session_id):
-    try:
-        if redis_client:
+    if redis_client:
+        try:
             redis_client.delete(f"ws_session:{session_id}")
-        local_sessions.pop(session_id, None)
-    except:
-        local_sessions.pop(session_id, None)
+        except redis.RedisError as e:
+            logger.error(f"Redis error deleting ws session {session_id}: {e}")
+    local_sessions.pop(session_id, None)
 
 logger = logging.getLogger(__name__)
 
-# Track active sessions
+# Track active sessions (process-local: live Deepgram streams and per-session locks)
 active_sessions = {}
 
+# Audio transports accepted by audio_chunk, in server preference order.
+# Both are always accepted; the negotiated value tells the client which one to send.
+SUPPORTED_AUDIO_FORMATS = ('binary', 'base64')
+
+# Transcript event styles: 'delta' sends transcript_delta (segment id + new text only),
+# 'full' keeps the legacy transcript_update carrying the whole accumulated transcript
+SUPPORTED_TRANSCRIPT_MODES = ('delta', 'full')
+
+# Stream audio over one long-lived Deepgram connection per session instead of one HTTP call per chunk
+WS_STREAMING_ENABLED = os.getenv('WS_DICTATION_STREAMING', 'true').lower() in ('1', 'true')
+
 # Allow toggling Google ID token enforcement for WebSocket connections
 REQUIRE_WS_ID_TOKEN = os.getenv('REQUIRE_WS_ID_TOKEN', 'false').lower() in ('1', 'true')
 logger.debug(f"WebSocket ID token enforcement: {REQUIRE_WS_ID_TOKEN}")
 
 # Import Deepgram service
 try:
-    from services.deepgram_local_service import DeepgramLocalService
-    deepgram_service = DeepgramLocalService()
+    from services.deepgram_local_service import get_deepgram_service
+    deepgram_service = get_deepgram_service()
     logger.info("WebSocket: Deepgram service loaded successfully")
 except ImportError as e:
     logger.warning(f"WebSocket: Could not import Deepgram service: {e}")
@@ -140,10 +156,9 @@ def handle_connect(auth=None):
         # Initialize session data
         session_data = {
             'user_email': user_email,
-            'audio_chunks': [],
             'language': 'fr-CA',
             'model': 'general-nova-3',
-            'transcript_buffer': ''
+            'transcript_mode': 'full'
         }
         save_session(sid, session_data)
         
@@ -166,29 +181,81 @@ def handle_disconnect():
     """Handle WebSocket disconnection with proper signature."""
     try:
         sid = request.sid
+        _close_stream(sid)
+        audio_chunks.clear(sid)
+        transcript_log.clear(sid)
         delete_session(sid)
         logger.info(f"WebSocket: Client disconnected - {sid}")
     except Exception as e:
         logger.error(f"WebSocket disconnect error: {e}")
 
 
+def _negotiate_audio_format(data):
+    """Pick the audio transport for this session from the client's start_recording offer.
+
+    Clients may send ``audio_format`` (a single value) or ``audio_formats``
+    (preference-ordered list). The first supported offer wins; base64 stays
+    the default so older clients keep working unchanged.
+    """
+    offered = data.get('audio_formats') or [data.get('audio_format', 'base64')]
+    if isinstance(offered, str):
+        offered = [offered]
+    for audio_format in offered:
+        if audio_format in SUPPORTED_AUDIO_FORMATS:
+            return audio_format
+    return 'base64'
+
+
 @socketio.on('start_recording')
 def handle_start_recording(data):
     """Handle start recording with proper signature."""
     try:
         sid = request.sid
-        session_data = get_session(sid) or {'audio_chunks': [], 'transcript_buffer': ''}
+        data = data or {}
+        _close_stream(sid)
+
+        audio_chunks.clear(sid)
+        transcript_log.clear(sid)
+
+        transcript_mode = data.get('transcript_mode', 'full')
+        if transcript_mode not in SUPPORTED_TRANSCRIPT_MODES:
+            transcript_mode = 'full'
+
+        session_data = get_session(sid) or {}
         session_data.update({
             'language': data.get('language', 'fr-CA'),
             'model': data.get('model', 'general-nova-3'),
-            'audio_chunks': [],
-            'transcript_buffer': '',
-            'chunk_count': 0
+            'mode': 'chunked',
+            'audio_format': _negotiate_audio_format(data),
+            'transcript_mode': transcript_mode
         })
+        active = _new_active_session(transcript_mode)
+        active_sessions[sid] = active
+
+        stream = None
+        if deepgram_service and WS_STREAMING_ENABLED and data.get('streaming', True):
+            stream = deepgram_service.open_live_stream(
+                on_transcript=lambda result: _on_stream_transcript(sid, result),
+                on_error=lambda message: _on_stream_error(sid, message),
+                language=session_data['language'],
+                model=session_data['model']
+            )
+            if stream is None:
+                logger.warning(f"WebSocket: Streaming unavailable for {sid}, falling back to per-chunk transcription")
+        if stream is not None:
+            session_data['mode'] = 'streaming'
+        active['stream'] = stream
         save_session(sid, session_data)
         
-        logger.info(f"WebSocket: Recording started - {sid}, lang={data.get('language')}")
-        emit('recording_started', {'status': 'ok', 'session_id': sid})
+        logger.info(f"WebSocket: Recording started - {sid}, lang={data.get('language')}, mode={session_data['mode']}")
+        emit('recording_started', {
+            'status': 'ok',
+            'session_id': sid,
+            'mode': session_data['mode'],
+            'audio_format': session_data['audio_format'],
+            'audio_formats': list(SUPPORTED_AUDIO_FORMATS),
+            'transcript_mode': transcript_mode
+        })
     except Exception as e:
         logger.error(f"WebSocket start_recording error: {e}")
         emit_error(str(e))
@@ -198,7 +265,10 @@ def handle_start_recording(data):
 def handle_audio_chunk(data):
     """Handle audio chunk with proper signature.
 
-    IMPORTANT: Each WebM chunk is a complete file with headers.
+    Streaming mode: the raw bytes are forwarded to the session's live Deepgram
+    stream and transcripts are pushed back by _on_stream_transcript.
+
+    Chunked mode (fallback): each WebM chunk is a complete file with headers.
     We transcribe each chunk individually and APPEND to the transcript buffer.
     This avoids issues with concatenating WebM files which don't work well.
     """
@@ -209,107 +279,203 @@ def handle_audio_chunk(data):
             emit('error', {'message': 'Session not initialized. Call start_recording first.'})
             return
 
-        audio_b64 = data.get('audio', '')
-        is_final = data.get('is_final', False)
+        if isinstance(data, dict):
+            audio = data.get('audio', b'')
+            is_final = data.get('is_final', False)
+        else:
+            # Bare binary frame: emit('audio_chunk', arrayBuffer)
+            audio = data
+            is_final = False
 
-        if not audio_b64:
+        if not audio:
             emit('error', {'message': 'No audio data received'})
             return
 
         try:
-            audio_bytes = base64.b64decode(audio_b64)
-
-            # Track chunk count for logging
-            chunk_count = session_data.get('chunk_count', 0) + 1
-            session_data['chunk_count'] = chunk_count
-
-            # Store chunk for final processing (keep all chunks for stop_recording)
-            session_data['audio_chunks'].append(audio_bytes.hex())
-
-            # Transcribe every chunk individually (not accumulated)
-            # This works because each WebM chunk from MediaRecorder is a complete file
-            if deepgram_service:
-                temp_dir = tempfile.gettempdir()
-                temp_filename = f"ws_chunk_{uuid.uuid4()}.webm"
-                temp_path = os.path.join(temp_dir, temp_filename)
-
-                with open(temp_path, 'wb') as f:
-                    f.write(audio_bytes)
-
-                try:
-                    result = deepgram_service.transcribe_audio_file(
-                        temp_path,
-                        language=session_data.get('language', 'fr-CA'),
-                        model=session_data.get('model', 'general-nova-3')
-                    )
-
-                    if result.get('success') and result.get('transcript'):
-                        new_text = result['transcript'].strip()
-
-                        if new_text:
-                            # APPEND new transcription to existing buffer
-                            existing = session_data.get('transcript_buffer', '').strip()
-                            if existing:
-                                # Add space between existing and new text
-                                session_data['transcript_buffer'] = existing + ' ' + new_text
-                            else:
-                                session_data['transcript_buffer'] = new_text
-
-                            # Send the FULL accumulated transcript to client
-                            emit('transcript_update', {
-                                'transcript': session_data['transcript_buffer'],
-                                'is_final': is_final,
-                                'confidence': result.get('confidence', 0),
-                                'word_count': len(session_data['transcript_buffer'].split()),
-                                'speaker_segments': result.get('speaker_segments', []),
-                                'chunk_number': chunk_count
-                            })
-
-                            logger.debug(f"WebSocket: Chunk {chunk_count} transcribed, total: {len(session_data['transcript_buffer'])} chars")
-                    else:
-                        # On transcription failure, still acknowledge the chunk
-                        emit('chunk_received', {
-                            'chunk_number': chunk_count,
-                            'transcript': session_data.get('transcript_buffer', ''),
-                            'error': result.get('error', 'Chunk transcription failed')
-                        })
-                finally:
-                    try:
-                        os.remove(temp_path)
-                    except:
-                        pass
-            else:
-                emit('chunk_received', {'chunk_number': chunk_count})
-
-            save_session(sid, session_data)
-
+            audio_bytes = _decode_audio(audio)
         except Exception as decode_error:
             logger.error(f"WebSocket: Audio decode error - {decode_error}")
             emit('error', {'message': 'Invalid audio data format'})
+            return
+
+        # Count the chunk (separate from the session record)
+        chunk_count = audio_chunks.increment(sid)
+
+        active = active_sessions.get(sid) or {}
+        stream = active.get('stream')
+        if stream is not None and stream.send(audio_bytes):
+            return
+
+        # Transcribe every chunk individually (not accumulated)
+        # This works because each WebM chunk from MediaRecorder is a complete file
+        if deepgram_service:
+            result = deepgram_service.transcribe_audio_data(
+                audio_bytes,
+                language=session_data.get('language', 'fr-CA'),
+                model=session_data.get('model', 'general-nova-3'),
+                use_cache=False  # live chunks are never re-sent, keep them out of the upload cache
+            )
+
+            if result.get('success') and result.get('transcript'):
+                new_text = result['transcript'].strip()
+
+                if new_text:
+                    # APPEND new transcription as a final segment
+                    _publish_transcript(sid, new_text, True, result.get('confidence', 0), extra={
+                        'speaker_segments': result.get('speaker_segments', []),
+                        'chunk_number': chunk_count
+                    }, legacy_is_final=is_final)
+
+                    logger.debug(f"WebSocket: Chunk {chunk_count} transcribed, {len(new_text)} new chars")
+            else:
+                # On transcription failure, still acknowledge the chunk
+                ack = {
+                    'chunk_number': chunk_count,
+                    'error': result.get('error', 'Chunk transcription failed')
+                }
+                if _active_session(sid)['transcript_mode'] == 'full':
+                    ack['transcript'] = transcript_log.read(sid)
+                emit('chunk_received', ack)
+        else:
+            emit('chunk_received', {'chunk_number': chunk_count})
 
     except Exception as e:
         logger.error(f"WebSocket audio_chunk error: {e}")
         emit_error(str(e))
 
 
+def _decode_audio(audio):
+    """Return raw audio bytes from a binary attachment or a legacy base64 string."""
+    if isinstance(audio, bytes):
+        # Binary Socket.IO attachment - no decode or copy needed
+        return audio
+    if isinstance(audio, (bytearray, memoryview)):
+        return bytes(audio)
+    if isinstance(audio, str):
+        return base64.b64decode(audio, validate=True)
+    raise ValueError(f"Unsupported audio payload type: {type(audio).__name__}")
+
+
+def _on_stream_transcript(sid, result):
+    """Push interim/final streaming results to the client (runs on the stream reader thread)."""
+    if sid not in active_sessions:
+        return
+    text = result.get('transcript', '').strip()
+    is_final = bool(result.get('is_final'))
+    if is_final and not text:
+        return
+    _publish_transcript(sid, text, is_final, result.get('confidence', 0), extra={
+        'interim': not is_final,
+        'chunk_number': audio_chunks.count(sid)
+    })
+
+
+def _new_active_session(transcript_mode='full'):
+    return {
+        'stream': None,
+        'lock': threading.Lock(),
+        'transcript_mode': transcript_mode,
+        'segments': 0,      # final segments appended so far (next segment id)
+        'word_count': 0     # words across final segments
+    }
+
+
+def _active_session(sid):
+    """Process-local state for a session; created on demand for clients that skip start_recording."""
+    active = active_sessions.get(sid)
+    if active is None:
+        active = active_sessions.setdefault(sid, _new_active_session())
+    return active
+
+
+def _publish_transcript(sid, text, is_final, confidence, extra=None, legacy_is_final=None):
+    """Record a transcript result and send it to the client.
+
+    Final text is appended to the session's TranscriptLog; interim text is only
+    forwarded. Delta clients receive transcript_delta with just the segment id and
+    new text; legacy clients receive transcript_update with the full transcript.
+    """
+    active = _active_session(sid)
+    with active['lock']:
+        if is_final:
+            segment_id = transcript_log.append(sid, text)
+            active['segments'] = segment_id + 1
+            active['word_count'] += len(text.split())
+        else:
+            # Interim hypotheses share the id of the segment they will finalize into
+            segment_id = active['segments']
+        word_count = active['word_count']
+
+    if active['transcript_mode'] == 'delta':
+        event = 'transcript_delta'
+        payload = {
+            'segment_id': segment_id,
+            'text': text,
+            'is_final': is_final,
+            'confidence': confidence,
+            'word_count': word_count if is_final else word_count + len(text.split())
+        }
+    else:
+        event = 'transcript_update'
+        transcript = transcript_log.read(sid)
+        if not is_final:
+            transcript = f"{transcript} {text}".strip()
+        payload = {
+            'transcript': transcript,
+            'is_final': is_final if legacy_is_final is None else legacy_is_final,
+            'confidence': confidence,
+            'word_count': len(transcript.split())
+        }
+    payload.update(extra or {})
+    socketio.emit(event, payload, to=sid)
+
+
+def _on_stream_error(sid, message):
+    """Report a dropped stream; subsequent chunks fall back to per-chunk transcription."""
+    logger.error(f"WebSocket: Deepgram stream error for {sid}: {message}")
+    active = active_sessions.get(sid)
+    if active:
+        active['stream'] = None
+    socketio.emit('error', {'message': f'Streaming transcription interrupted: {message}'}, to=sid)
+
+
+def _close_stream(sid, flush=False):
+    """Close the session's live stream, optionally waiting for pending final results."""
+    active = active_sessions.pop(sid, None)
+    stream = active.get('stream') if active else None
+    if stream is None:
+        return
+    if flush:
+        # Keep the entry registered while flushing so the last finals still reach the session
+        active_sessions[sid] = active
+        try:
+            stream.finish()
+        finally:
+            active_sessions.pop(sid, None)
+    else:
+        stream.close()
+
+
 @socketio.on('stop_recording')
 def handle_stop_recording(data=None):
     """Handle stop recording with proper signature.
 
-    Since we've been transcribing each chunk individually and accumulating,
-    the transcript_buffer already contains the full transcript.
+    Since we've been transcribing each chunk individually (or streaming) and
+    appending final segments, the transcript log already contains the full transcript.
     We just return it without trying to re-transcribe concatenated WebM files.
     """
     try:
         sid = request.sid
+        # Flush the live stream first so its last final results land in the buffer
+        _close_stream(sid, flush=True)
         session_data = get_session(sid)
         if not session_data:
             emit('error', {'message': 'No active session'})
             return
 
         # Use the accumulated transcript from individual chunk transcriptions
-        final_transcript = session_data.get('transcript_buffer', '').strip()
-        chunk_count = session_data.get('chunk_count', 0)
+        final_transcript = transcript_log.read(sid)
+        chunk_count = audio_chunks.count(sid)
 
         emit('recording_stopped', {
             'status': 'ok',
@@ -322,16 +488,47 @@ def handle_stop_recording(data=None):
 
         logger.info(f"WebSocket: Recording stopped - {sid}, transcript length: {len(final_transcript)}, chunks: {chunk_count}")
 
-        # Clean up session
-        session_data['audio_chunks'] = []
-        session_data['chunk_count'] = 0
-        save_session(sid, session_data)
+        # Clean up spooled audio
+        audio_chunks.clear(sid)
         
     except Exception as e:
         logger.error(f"WebSocket stop_recording error: {e}")
         emit_error(str(e))
 
 
+@socketio.on('orchestrate')
+def handle_orchestrate(data=None):
+    """Run the agents on a transcript (default: this session's dictation so far).
+
+    Emits orchestration_started, one orchestration_agent_result per agent as soon
+    as it finishes, then orchestration_complete with the summary and confidence.
+    """
+    try:
+        sid = request.sid
+        data = data or {}
+        transcript = data.get('transcript') or transcript_log.read(sid)
+        if not transcript:
+            emit_error('No transcript to orchestrate')
+            return
+        socketio.start_background_task(_stream_orchestration, sid, transcript,
+                                       data.get('persona', 'generalist'), data.get('selective'))
+    except Exception as e:
+        logger.error(f"WebSocket orchestrate error: {e}")
+        emit_error(str(e))
+
+
+def _stream_orchestration(sid, transcript, persona_key, selective):
+    # Imported here: the agents load on first use, after main.py has read the environment
+    from services.AuraScribeOrchestrator import stream_orchestration, orchestration_event
+    try:
+        for event in stream_orchestration(transcript, persona_key=persona_key, selective=selective):
+            payload = orchestration_event(*event)
+            socketio.emit(f"orchestration_{payload['event']}", payload, to=sid)
+    except Exception as e:
+        logger.error(f"WebSocket: orchestration failed for {sid}: {e}")
+        socketio.emit('error', {'message': f'Orchestration failed: {e}'}, to=sid)
+
+
 @socketio.on('get_status')
 def handle_get_status(data=None):
     """Handle get status with proper signature."""
@@ -342,8 +539,10 @@ def handle_get_status(data=None):
         emit('status', {
             'session_id': sid,
             'active': bool(session_data),
-            'chunk_count': len(session_data.get('audio_chunks', [])),
-            'current_transcript': session_data.get('transcript_buffer', ''),
+            'chunk_count': audio_chunks.count(sid),
+            'current_transcript': transcript_log.read(sid),
+            'segment_count': transcript_log.count(sid),
+            'mode': session_data.get('mode', 'chunked'),
             'deepgram_available': deepgram_service is not None
         })
     except Exception as e:
@@ -0,0 +1,94 @@
+"""
+Benchmark: orchestration throughput with agents in threads vs in worker processes.
+
+Runs the same synthetic transcripts through orchestrate_transcript (result cache
+off) from several concurrent callers, first with the default thread backend,
+then with AgentProcessPool at increasing worker counts, checks the agent
+outputs agree, and prints orchestrations per second for each.
+
+Run from AuraScribe_Backend:  python tests/benchmark_agent_execution.py [transcripts] [concurrency] [words]
+"""
+
+import logging
+import os
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+logging.disable(logging.CRITICAL)
+
+import services.agent_process_pool as process_backend
+from agents.keyword_matcher import get_automaton
+from services.AuraScribeOrchestrator import orchestrate_transcript
+
+FILLER = (
+    "le patient rapporte une douleur depuis trois jours sans autre plainte la nuit "
+    "was seen today for a routine visit vital signs stable no acute distress noted "
+    "nous avons revu la médication et expliqué les résultats au patient et à sa famille"
+).split()
+
+
+def make_transcript(words: int, terms, seed: int) -> str:
+    rng = random.Random(seed)
+    out = []
+    while len(out) < words:
+        out.extend(rng.choice(terms).split() if rng.random() < 0.05 else [rng.choice(FILLER)])
+        if rng.random() < 0.08:
+            out[-1] += '.'
+    return ' '.join(out)
+
+
+def agent_outputs(result) -> dict:
+    """Agent results minus timing metadata and per-run ids/timestamps"""
+    volatile = {'_meta', 'timestamp', 'generated_at', 'report_id'}
+
+    def clean(value):
+        if isinstance(value, dict):
+            return {k: clean(v) for k, v in value.items() if k not in volatile}
+        if isinstance(value, list):
+            return [clean(v) for v in value]
+        return value
+    return clean(result['agent_results'])
+
+
+def run(transcripts, concurrency: int):
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as callers:
+        results = list(callers.map(lambda text: orchestrate_transcript(text, use_cache=False), transcripts))
+    return len(transcripts) / (time.perf_counter() - started), results
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 48
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    words = int(sys.argv[3]) if len(sys.argv) > 3 else 3000
+
+    terms = [term for terms in get_automaton().vocabularies.values() for term in terms]
+    transcripts = [make_transcript(words, terms, seed) for seed in range(count)]
+    cores = os.cpu_count() or 1
+    print(f"{count} transcripts x {words} words, {concurrency} concurrent callers, {cores} cores\n")
+
+    process_backend.AGENT_EXECUTION_MODE = 'thread'
+    run(transcripts[:2], concurrency)  # warm-up
+    baseline, reference = run(transcripts, concurrency)
+    print(f"  {'threads':<22} {baseline:8.1f} orchestrations/s")
+
+    process_backend.AGENT_EXECUTION_MODE = 'process'
+    workers = 1
+    while True:
+        pool = process_backend._process_pool = process_backend.AgentProcessPool(workers=workers)
+        pool.warm()
+        throughput, results = run(transcripts, concurrency)
+        pool.shutdown()
+        assert [agent_outputs(r) for r in results] == [agent_outputs(r) for r in reference]
+        print(f"  {f'processes x{workers}':<22} {throughput:8.1f} orchestrations/s  ({throughput / baseline:4.1f}x)")
+        if workers >= cores:
+            break
+        workers = min(workers * 2, cores)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""
+Micro-benchmark: compiled keyword automaton vs one substring scan per keyword.
+
+Builds synthetic ~5k-word transcripts from the registered agent vocabularies
+plus filler text, checks both approaches find the same terms, and prints the
+per-transcript cost of each.
+
+Run from AuraScribe_Backend:  python tests/benchmark_keyword_matcher.py [words] [rounds]
+"""
+
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+logging.disable(logging.CRITICAL)
+
+# Importing the agents registers their vocabularies
+import agents.AskAura_agent  # noqa: F401
+import agents.ClinicalDocumentationAgent  # noqa: F401
+import agents.ComplianceMonitorAgent  # noqa: F401
+import agents.CustomFormAgent  # noqa: F401
+import agents.MADO_ReportingAgent  # noqa: F401
+import agents.PrescriptionLabAgent  # noqa: F401
+import agents.RAMQ_BillingAgent  # noqa: F401
+import agents.TaskManagerAgent  # noqa: F401
+from agents.keyword_matcher import fold_text, get_automaton
+from agents.transcript_analysis import TranscriptAnalysis
+
+FILLER = (
+    "le patient rapporte une douleur depuis trois jours sans autre plainte la nuit "
+    "was seen today for a routine visit vital signs stable no acute distress noted "
+    "nous avons revu la médication et expliqué les résultats au patient et à sa famille"
+).split()
+
+
+def make_transcript(words: int, vocabulary_terms, seed: int) -> str:
+    rng = random.Random(seed)
+    out = []
+    while len(out) < words:
+        if rng.random() < 0.05:
+            out.extend(rng.choice(vocabulary_terms).split())
+        else:
+            out.append(rng.choice(FILLER))
+        if rng.random() < 0.08:
+            out[-1] += '.'
+    return ' '.join(out)
+
+
+def per_keyword(text: str, vocabularies) -> dict:
+    """What agents did before: lowercase the transcript, then one `in` scan per keyword"""
+    found = {}
+    for vocab_id, terms in vocabularies.items():
+        text_lower = text.lower()
+        found[vocab_id] = [term for term in terms if term.lower() in text_lower]
+    return found
+
+
+def per_keyword_folded(text: str, vocabularies) -> dict:
+    """Same, but accent-insensitive like the automaton, so results are comparable"""
+    folded = fold_text(text)
+    return {vocab_id: [term for term in terms if fold_text(term) in folded]
+            for vocab_id, terms in vocabularies.items()}
+
+
+def automaton(text: str, vocabularies) -> dict:
+    analysis = TranscriptAnalysis(text)
+    return {vocab_id: analysis.vocabulary(vocab_id) for vocab_id in vocabularies}
+
+
+def bench(func, transcripts, vocabularies, rounds: int) -> float:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for text in transcripts:
+            func(text, vocabularies)
+    return (time.perf_counter() - started) * 1000 / (rounds * len(transcripts))
+
+
+def main():
+    words = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    compiled = get_automaton()
+    vocabularies = compiled.vocabularies
+    all_terms = [term for terms in vocabularies.values() for term in terms]
+    transcripts = [make_transcript(words, all_terms, seed) for seed in range(5)]
+
+    for text in transcripts:
+        assert automaton(text, vocabularies) == per_keyword_folded(text, vocabularies)
+
+    print(f"{len(vocabularies)} vocabularies, {len(all_terms)} keywords "
+          f"({len(compiled.terms)} distinct), {compiled.state_count} automaton states")
+    print(f"{len(transcripts)} transcripts x {words} words, {rounds} rounds\n")
+
+    baseline = bench(per_keyword, transcripts, vocabularies, rounds)
+    folded = bench(per_keyword_folded, transcripts, vocabularies, rounds)
+    single_pass = bench(automaton, transcripts, vocabularies, rounds)
+    for label, ms in (("per-keyword scan (lowercase)", baseline),
+                      ("per-keyword scan (folded)", folded),
+                      ("automaton single pass", single_pass)):
+        print(f"  {label:<30} {ms:8.2f} ms/transcript  ({baseline / ms:4.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""
+Benchmark: storage codecs on records carrying a one-hour dictation.
+
+Builds session-like records with ~1 h of transcript (150 words/min) and, for
+the legacy json.dumps text and every codec available here (json/msgpack x
+none/zlib/zstd), prints the stored size, median encode/decode time and, when a
+real Redis is reachable at REDIS_URL, the MEMORY USAGE of the stored key.
+
+Run from AuraScribe_Backend:  python tests/benchmark_storage_codec.py [minutes] [repeats]
+"""
+
+import json
+import logging
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+logging.disable(logging.WARNING)
+
+from services import codec as codecs
+from services.storage import STORAGE_BACKEND, get_redis
+
+WORDS = (
+    "le patient rapporte une douleur thoracique depuis trois jours sans irradiation "
+    "tension artérielle cent trente sur quatre-vingts saturation normale auscultation "
+    "pulmonaire claire nous allons prescrire metformine cinq cents milligrammes deux fois "
+    "par jour et revoir la glycémie à jeun dans six semaines the patient denies fever "
+    "or chills follow up with cardiology if symptoms persist"
+).split()
+
+
+def make_record(minutes: int, seed: int = 0) -> dict:
+    rng = random.Random(seed)
+    words = []
+    for _ in range(minutes * 150):
+        words.append(rng.choice(WORDS))
+        if rng.random() < 0.07:
+            words[-1] += '.'
+    return {
+        'id': f'sess-bench-{seed}',
+        'patient_name': 'Jean Tremblay',
+        'patient_ramq': 'TREJ12345678',
+        'language': 'fr',
+        'model_used': 'nova-3',
+        'status': 'completed',
+        'transcript': ' '.join(words),
+        'created_at': '2026-10-17T09:00:00',
+        'updated_at': '2026-10-17T10:00:00',
+    }
+
+
+def median_us(func, repeats: int) -> float:
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1e6
+
+
+def redis_memory(client, key: str, data: bytes):
+    if client is None:
+        return None
+    client.set(key, data, ex=60)
+    try:
+        return client.memory_usage(key)
+    finally:
+        client.delete(key)
+
+
+def main():
+    minutes = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    record = make_record(minutes)
+    client = get_redis(decode_responses=False) if STORAGE_BACKEND == 'redis' else None
+
+    variants = [('legacy json.dumps', lambda value: json.dumps(value).encode(), json.loads)]
+    for serializer in ('json', 'msgpack'):
+        for compression in ('none', 'zlib', 'zstd'):
+            if serializer == 'msgpack' and codecs.msgpack is None:
+                continue
+            if compression == 'zstd' and codecs.zstandard is None:
+                continue
+            codec = codecs.Codec(serializer, compression)
+            variants.append((codec.name, codec.encode, codec.decode))
+
+    print(f"{minutes} min transcript: {len(record['transcript'].split())} words, "
+          f"{len(record['transcript'].encode())} bytes; orjson={'yes' if codecs.orjson else 'no'}, "
+          f"redis={'yes' if client else 'no (MEMORY USAGE skipped)'}\n")
+    print(f"  {'codec':<20} {'stored':>9} {'ratio':>6} {'encode':>10} {'decode':>10} {'redis mem':>10}")
+    baseline = None
+    for name, encode, decode in variants:
+        data = encode(record)
+        assert decode(data) == record
+        baseline = baseline or len(data)
+        memory = redis_memory(client, 'aurascribe:bench:codec', data)
+        print(f"  {name:<20} {len(data):>9} {len(data) / baseline:>6.2f} "
+              f"{median_us(lambda: encode(record), repeats):>8.0f}us "
+              f"{median_us(lambda: decode(data), repeats):>8.0f}us "
+              f"{memory if memory is not None else '-':>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,29 @@
+"""
+Shared pytest setup. Run from AuraScribe_Backend:  python -m pytest -q tests
+
+Redis-backed checks run against fakeredis (optional dependency, with lupa for
+the Lua scripts) and are skipped when it is not installed.
+"""
+
+import pytest
+
+# Manual scripts that call a live Deepgram instance; not part of the suite
+collect_ignore = ['test_deepgram.py']
+
+
+@pytest.fixture
+def fake_server():
+    fakeredis = pytest.importorskip('fakeredis')
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture
+def redis_client(fake_server):
+    import fakeredis
+    return fakeredis.FakeRedis(server=fake_server, decode_responses=True)
+
+
+@pytest.fixture
+def raw_client(fake_server):
+    import fakeredis
+    return fakeredis.FakeRedis(server=fake_server, decode_responses=False)
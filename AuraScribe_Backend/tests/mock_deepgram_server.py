@@ -0,0 +1,218 @@
+"""
+Local stand-in for the self-hosted Deepgram server (stdlib only).
+
+Serves the prerecorded REST endpoint (POST /v1/listen) and the streaming
+WebSocket endpoint (GET /v1/listen with Upgrade: websocket) with canned
+transcripts, so ws_dictation and /api/transcribe can be exercised without
+the real ASR server.
+
+Usage:
+    python tests/mock_deepgram_server.py --port 8080
+    DEEPGRAM_SELF_HOSTED_URL=http://localhost:8080 python main.py
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import socket
+import struct
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+WS_GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+
+PHRASES = [
+    "le patient présente une toux depuis trois semaines",
+    "pas de fièvre ni de frissons",
+    "auscultation pulmonaire normale",
+    "on prescrit un sirop et un suivi dans deux semaines",
+]
+
+
+def _results(transcript, is_final, start, duration, speech_final=False):
+    words = [
+        {'word': word, 'start': start + i * 0.3, 'end': start + (i + 1) * 0.3, 'confidence': 0.95}
+        for i, word in enumerate(transcript.split())
+    ]
+    return {
+        'type': 'Results',
+        'channel_index': [0, 1],
+        'start': start,
+        'duration': duration,
+        'is_final': is_final,
+        'speech_final': speech_final,
+        'channel': {'alternatives': [{'transcript': transcript, 'confidence': 0.95, 'words': words}]},
+    }
+
+
+class MockDeepgramHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    final_every = 4      # binary frames per final segment
+    latency_ms = 0       # artificial delay before each streamed result
+
+    def log_message(self, fmt, *args):
+        if self.server.verbose:
+            super().log_message(fmt, *args)
+
+    # ---------- REST ----------
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def do_GET(self):
+        if self.headers.get('Upgrade', '').lower() == 'websocket':
+            return self._handle_websocket()
+        self._send_json(200, {'status': 'ok', 'service': 'mock-deepgram'})
+
+    def do_POST(self):
+        if urlparse(self.path).path != '/v1/listen':
+            return self._send_json(404, {'err_msg': 'not found'})
+        body = self._read_body()
+        params = parse_qs(urlparse(self.path).query)
+        if not body:
+            return self._send_json(400, {'err_code': 'Bad Request', 'err_msg': 'empty body'})
+        transcript = PHRASES[len(body) % len(PHRASES)]
+        result = _results(transcript, True, 0.0, 1.2)
+        self._send_json(200, {
+            'metadata': {'duration': 1.2, 'request_id': hashlib.sha1(body).hexdigest()},
+            'results': {
+                'channels': [{'alternatives': result['channel']['alternatives']}],
+                'language': params.get('language', ['fr-ca'])[0],
+            },
+        })
+
+    def _read_body(self):
+        if self.headers.get('Transfer-Encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                size = int(self.rfile.readline().strip() or b'0', 16)
+                if size == 0:
+                    self.rfile.readline()
+                    break
+                chunks.append(self.rfile.read(size))
+                self.rfile.readline()
+            return b''.join(chunks)
+        length = int(self.headers.get('Content-Length', 0))
+        return self.rfile.read(length) if length else b''
+
+    # ---------- WebSocket ----------
+
+    def _handle_websocket(self):
+        key = self.headers.get('Sec-WebSocket-Key', '')
+        accept = base64.b64encode(hashlib.sha1((key + WS_GUID).encode()).digest()).decode()
+        self.send_response(101, 'Switching Protocols')
+        self.send_header('Upgrade', 'websocket')
+        self.send_header('Connection', 'Upgrade')
+        self.send_header('Sec-WebSocket-Accept', accept)
+        self.end_headers()
+        self.wfile.flush()
+        self.close_connection = True
+
+        frames = 0
+        phrase_index = 0
+        offset = 0.0
+        while True:
+            try:
+                opcode, payload = self._recv_frame()
+            except (ConnectionError, socket.timeout, struct.error):
+                return
+            if opcode == 0x2:
+                frames += 1
+                phrase = PHRASES[phrase_index % len(PHRASES)]
+                words = phrase.split()
+                if frames % self.final_every == 0:
+                    self._send_results(_results(phrase, True, offset, 1.2, speech_final=True))
+                    phrase_index += 1
+                    offset += 1.2
+                else:
+                    partial = ' '.join(words[:max(1, len(words) * (frames % self.final_every) // self.final_every)])
+                    self._send_results(_results(partial, False, offset, 0.6))
+            elif opcode == 0x1:
+                message = json.loads(payload.decode('utf-8') or '{}')
+                if message.get('type') == 'CloseStream':
+                    if frames % self.final_every:
+                        self._send_results(_results(PHRASES[phrase_index % len(PHRASES)], True, offset, 1.2, True))
+                    self._send_frame(0x1, json.dumps({'type': 'Metadata', 'duration': offset}).encode())
+                    self._send_frame(0x8, struct.pack('!H', 1000))
+                    return
+            elif opcode == 0x8:
+                self._send_frame(0x8, payload[:2])
+                return
+            elif opcode == 0x9:
+                self._send_frame(0xA, payload)
+
+    def _send_results(self, result):
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000.0)
+        self._send_frame(0x1, json.dumps(result).encode('utf-8'))
+
+    def _recv_exact(self, n):
+        data = self.rfile.read(n)
+        if len(data) < n:
+            raise ConnectionError('client closed')
+        return data
+
+    def _recv_frame(self):
+        first, second = self._recv_exact(2)
+        opcode = first & 0x0F
+        masked = second & 0x80
+        length = second & 0x7F
+        if length == 126:
+            length = struct.unpack('!H', self._recv_exact(2))[0]
+        elif length == 127:
+            length = struct.unpack('!Q', self._recv_exact(8))[0]
+        mask = self._recv_exact(4) if masked else b'\x00\x00\x00\x00'
+        payload = bytearray(self._recv_exact(length))
+        for i in range(length):
+            payload[i] ^= mask[i % 4]
+        return opcode, bytes(payload)
+
+    def _send_frame(self, opcode, payload):
+        header = bytes([0x80 | opcode])
+        length = len(payload)
+        if length < 126:
+            header += bytes([length])
+        elif length < 65536:
+            header += bytes([126]) + struct.pack('!H', length)
+        else:
+            header += bytes([127]) + struct.pack('!Q', length)
+        self.wfile.write(header + payload)
+        self.wfile.flush()
+
+
+def make_server(host='127.0.0.1', port=8080, final_every=4, latency_ms=0, verbose=False):
+    MockDeepgramHandler.final_every = final_every
+    MockDeepgramHandler.latency_ms = latency_ms
+    server = ThreadingHTTPServer((host, port), MockDeepgramHandler)
+    server.daemon_threads = True
+    server.verbose = verbose
+    return server
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Mock self-hosted Deepgram server')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--final-every', type=int, default=4, help='binary frames per final segment')
+    parser.add_argument('--latency-ms', type=int, default=0, help='delay before each streamed result')
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.final_every, args.latency_ms, args.verbose)
+    print(f"Mock Deepgram listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
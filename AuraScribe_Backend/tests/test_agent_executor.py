@@ -0,0 +1,119 @@
+"""Agent graph scheduling: dependencies, deadlines, timeouts and cycles"""
+
+import threading
+import time
+
+import pytest
+
+from services.agent_executor import AGENT_ERROR, AGENT_OK, AGENT_REJECTED, AGENT_TIMEOUT, AgentExecutor
+
+
+@pytest.fixture
+def executor():
+    return AgentExecutor(workers=4, max_inflight=8)
+
+
+def node(name, result=None, depends_on=(), sleep=0.0, seen=None, error=None):
+    def func(upstream):
+        if seen is not None:
+            seen[name] = dict(upstream)
+        time.sleep(sleep)
+        if error:
+            raise error
+        return result if result is not None else name
+    return name, func, tuple(depends_on)
+
+
+def test_dependencies_receive_upstream_results(executor):
+    seen = {}
+    results, timings = executor.run_graph([
+        node('a', seen=seen),
+        node('b', depends_on=['a'], seen=seen),
+        node('c', depends_on=['a', 'b'], seen=seen),
+    ], deadline=5, agent_timeout=5)
+    assert {name: status for name, (status, _) in results.items()} == {'a': AGENT_OK, 'b': AGENT_OK, 'c': AGENT_OK}
+    assert seen == {'a': {}, 'b': {'a': 'a'}, 'c': {'a': 'a', 'b': 'b'}}
+    assert timings['c']['submitted_ms'] >= timings['b']['finished_ms']
+    assert {'submitted_ms', 'started_ms', 'finished_ms', 'duration_ms'} <= set(timings['a'])
+
+
+def test_failed_dependency_is_left_out_but_dependent_runs(executor):
+    seen = {}
+    results, _ = executor.run_graph([
+        node('a', error=RuntimeError('boom')),
+        node('b'),
+        node('c', depends_on=['a', 'b'], seen=seen),
+    ], deadline=5, agent_timeout=5)
+    assert results['a'][0] == AGENT_ERROR and isinstance(results['a'][1], RuntimeError)
+    assert results['c'][0] == AGENT_OK
+    assert seen['c'] == {'b': 'b'}
+
+
+def test_dependencies_outside_the_graph_are_ignored(executor):
+    results, _ = executor.run_graph([node('a', depends_on=['not-loaded'])], deadline=5, agent_timeout=5)
+    assert results['a'][0] == AGENT_OK
+
+
+def test_agent_timeout_returns_partial_results(executor):
+    started = time.monotonic()
+    results, timings = executor.run_graph([
+        node('fast'),
+        node('slow', sleep=1.0),
+    ], deadline=5, agent_timeout=0.2)
+    assert time.monotonic() - started < 0.8
+    assert results['fast'][0] == AGENT_OK
+    assert results['slow'] == (AGENT_TIMEOUT, None)
+    assert 'duration_ms' not in timings['slow']
+
+
+def test_overall_deadline_times_out_dependents(executor):
+    started = time.monotonic()
+    results, _ = executor.run_graph([
+        node('a', sleep=0.3),
+        node('b', depends_on=['a']),
+    ], deadline=0.15, agent_timeout=5)
+    assert time.monotonic() - started < 0.6
+    assert results['a'][0] == AGENT_TIMEOUT
+    assert results['b'][0] == AGENT_TIMEOUT
+
+
+def test_cycle_reported_as_error_without_blocking(executor):
+    results, _ = executor.run_graph([
+        node('a', depends_on=['b']),
+        node('b', depends_on=['a']),
+        node('c'),
+        node('d', depends_on=['a']),
+    ], deadline=5, agent_timeout=5)
+    assert results['c'][0] == AGENT_OK
+    for name in 'abd':
+        status, error = results[name]
+        assert status == AGENT_ERROR
+        assert 'cycle' in str(error)
+
+
+def test_self_dependency_is_ignored(executor):
+    results, _ = executor.run_graph([node('a', depends_on=['a'])], deadline=5, agent_timeout=5)
+    assert results['a'][0] == AGENT_OK
+
+
+def test_iter_graph_yields_in_completion_order(executor):
+    events = [name for name, _, _ in executor.iter_graph([
+        node('slow', sleep=0.3),
+        node('fast'),
+        node('after_fast', depends_on=['fast']),
+    ], deadline=5, agent_timeout=5)]
+    assert events == ['fast', 'after_fast', 'slow']
+
+
+def test_saturated_executor_rejects_after_the_deadline():
+    executor = AgentExecutor(workers=1, max_inflight=1)
+    release = threading.Event()
+    blocker = threading.Thread(target=executor.run_all,
+                               args=([('hold', release.wait, (1.0,))], 2, 2), daemon=True)
+    blocker.start()
+    time.sleep(0.05)
+    results = executor.run_all([('late', lambda: 'x', ())], deadline=0.1, agent_timeout=0.1)
+    release.set()
+    blocker.join()
+    assert results['late'][0] == AGENT_REJECTED
+    assert executor.get_stats()['rejected'] == 1
@@ -0,0 +1,90 @@
+"""Deepgram language/model attempts: hedging, concurrent fallbacks and preference order"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from services.deepgram_local_service import DeepgramLocalService
+
+ATTEMPTS = [{'model': 'nova-3', 'language': 'fr-CA'},
+            {'model': 'nova-3', 'language': 'en-US'},
+            {'model': 'nova-2', 'language': 'fr'}]
+
+
+@pytest.fixture
+def service():
+    # No __init__: it reads the environment and probes the Deepgram server
+    service = DeepgramLocalService.__new__(DeepgramLocalService)
+    service._hedge_executor = ThreadPoolExecutor(max_workers=8)
+    service.hedging_enabled = True
+    service.hedge_delay = 0.1
+    yield service
+    service._hedge_executor.shutdown(wait=False)
+
+
+class Deepgram:
+    """Fake /v1/listen: per-language delay and transcript, records the requests"""
+
+    def __init__(self, **answers):
+        self.answers = answers
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, attempt):
+        with self._lock:
+            self.calls.append(attempt['language'])
+        delay, transcript = self.answers[attempt['language'].replace('-', '_')]
+        time.sleep(delay)
+        if transcript is None:
+            return {'success': False, 'error': f"timeout {attempt['language']}"}
+        return {'success': True, 'transcript': transcript}
+
+
+def test_fast_primary_sends_one_request(service):
+    deepgram = Deepgram(fr_CA=(0, 'bonjour'), en_US=(0, 'hello'), fr=(0, 'salut'))
+    result = service._run_attempts(ATTEMPTS, deepgram)
+    assert (result['transcript'], result['attempts'], result['fallback_used']) == ('bonjour', 1, False)
+
+
+def test_failed_primary_starts_all_fallbacks_at_once(service):
+    deepgram = Deepgram(fr_CA=(0, None), en_US=(0.3, None), fr=(0.3, 'salut'))
+    started = time.monotonic()
+    result = service._run_attempts(ATTEMPTS, deepgram)
+    assert time.monotonic() - started < 0.5  # one timeout, not one per fallback
+    assert result['transcript'] == 'salut' and result['fallback_used']
+    assert result['attempts'] == 3
+
+
+def test_bad_audio_costs_about_one_timeout(service):
+    deepgram = Deepgram(fr_CA=(0.3, None), en_US=(0.3, None), fr=(0.3, None))
+    started = time.monotonic()
+    result = service._run_attempts(ATTEMPTS, deepgram)
+    assert time.monotonic() - started < 0.6
+    assert not result['success'] and result['error'] == 'timeout fr-CA'
+
+
+def test_slow_primary_still_beats_a_fast_fallback_language(service):
+    deepgram = Deepgram(fr_CA=(0.3, 'bonjour'), en_US=(0, 'hello'), fr=(0, 'salut'))
+    result = service._run_attempts(ATTEMPTS, deepgram)
+    assert result['transcript'] == 'bonjour' and not result['fallback_used']
+    assert deepgram.calls.count('fr-CA') == 2  # the hedge copy
+
+
+def test_fallbacks_settle_in_preference_order(service):
+    deepgram = Deepgram(fr_CA=(0, ''), en_US=(0.2, 'hello'), fr=(0, 'salut'))
+    assert service._run_attempts(ATTEMPTS, deepgram)['transcript'] == 'hello'
+
+
+def test_all_empty_returns_the_primary_empty_success(service):
+    deepgram = Deepgram(fr_CA=(0, ''), en_US=(0, None), fr=(0, ''))
+    result = service._run_attempts(ATTEMPTS, deepgram)
+    assert result['success'] and result['transcript'] == '' and not result['fallback_used']
+
+
+def test_without_hedging_the_primary_is_awaited_alone(service):
+    service.hedging_enabled = False
+    deepgram = Deepgram(fr_CA=(0.2, 'bonjour'), en_US=(0, 'hello'), fr=(0, 'salut'))
+    result = service._run_attempts(ATTEMPTS, deepgram)
+    assert result['transcript'] == 'bonjour' and deepgram.calls == ['fr-CA']
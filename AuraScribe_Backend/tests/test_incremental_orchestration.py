@@ -0,0 +1,112 @@
+"""Incremental dictation orchestration: segment appends and the resync (409) flow"""
+
+import uuid
+
+import pytest
+
+from services.AuraScribeOrchestrator import ResyncRequired, orchestrate_incremental
+from services.orchestration_sessions import get_session_store
+
+FIRST = 'Le patient rapporte une douleur thoracique depuis trois jours.'
+SECOND = 'Prescription de metformine et analyse sanguine.'
+
+
+@pytest.fixture
+def session_id():
+    session_id = f'test-{uuid.uuid4()}'
+    yield session_id
+    get_session_store().discard(session_id)
+
+
+def session_text(session_id):
+    return get_session_store().get_or_create(session_id, 'generalist').analysis.text
+
+
+def stats(result):
+    return result['execution_stats']['incremental']
+
+
+def test_segment_without_prior_state_requires_resync(session_id):
+    with pytest.raises(ResyncRequired) as raised:
+        orchestrate_incremental(session_id, segment=FIRST)
+    assert raised.value.known_length == 0
+
+
+def test_segment_at_offset_zero_starts_the_dictation(session_id):
+    result = orchestrate_incremental(session_id, segment=FIRST, offset=0)
+    assert stats(result)['mode'] == 'full'
+    assert session_text(session_id) == FIRST
+
+
+def test_segments_are_joined_with_a_space(session_id):
+    orchestrate_incremental(session_id, segment=FIRST, offset=0)
+    result = orchestrate_incremental(session_id, segment=SECOND, offset=len(FIRST))
+    assert stats(result)['mode'] == 'incremental'
+    assert session_text(session_id) == f'{FIRST} {SECOND}'
+    assert result['agent_results']['PrescriptionLabAgent'].get('prescription')
+
+
+def test_segment_at_the_wrong_offset_requires_resync(session_id):
+    orchestrate_incremental(session_id, segment=FIRST, offset=0)
+    with pytest.raises(ResyncRequired) as raised:
+        orchestrate_incremental(session_id, segment=SECOND, offset=len(FIRST) + 5)
+    assert raised.value.known_length == len(FIRST)
+    assert session_text(session_id) == FIRST
+
+
+@pytest.mark.parametrize('change', [{'reset': True}, {'persona_key': 'cardiologist'}])
+def test_segment_after_reset_or_persona_change_requires_resync(session_id, change):
+    orchestrate_incremental(session_id, segment=FIRST, offset=0)
+    with pytest.raises(ResyncRequired):
+        orchestrate_incremental(session_id, segment=SECOND, **change)
+
+
+def test_full_transcript_sent_with_the_segment_resyncs(session_id):
+    full = f'{FIRST} {SECOND}'
+    result = orchestrate_incremental(session_id, transcript_text=full, segment=SECOND)
+    assert stats(result)['mode'] == 'full'
+    assert session_text(session_id) == full
+
+
+def test_growing_transcript_is_extended(session_id):
+    orchestrate_incremental(session_id, transcript_text=FIRST)
+    result = orchestrate_incremental(session_id, transcript_text=f'{FIRST} {SECOND}')
+    assert stats(result)['mode'] == 'incremental'
+    assert stats(result)['segment_length'] == len(SECOND) + 1
+
+
+def test_edited_transcript_starts_over(session_id):
+    orchestrate_incremental(session_id, transcript_text=FIRST)
+    result = orchestrate_incremental(session_id, transcript_text=SECOND)
+    assert stats(result)['mode'] == 'full'
+    assert session_text(session_id) == SECOND
+
+
+@pytest.fixture
+def client(monkeypatch):
+    main = pytest.importorskip('main')
+    monkeypatch.setattr(main, 'API_KEY', 'test-key')
+    monkeypatch.setattr(main.limiter, 'enabled', False)
+    return main.app.test_client()
+
+
+def post(client, body):
+    return client.post('/api/orchestrate', json=body, headers={'X-API-KEY': 'test-key'})
+
+
+def test_endpoint_answers_409_then_accepts_the_full_transcript(client, session_id):
+    response = post(client, {'session_id': session_id, 'segment': SECOND})
+    assert response.status_code == 409
+    assert response.get_json()['resync_required'] is True
+    response = post(client, {'session_id': session_id, 'transcript': f'{FIRST} {SECOND}'})
+    assert response.status_code == 200
+    response = post(client, {'session_id': session_id, 'segment': 'Revoir dans six semaines.',
+                             'offset': len(f'{FIRST} {SECOND}')})
+    assert response.status_code == 200
+    assert response.get_json()['execution_stats']['incremental']['mode'] == 'incremental'
+
+
+@pytest.mark.parametrize('body', [[1, 2], 'text', {'session_id': 's', 'segment': 'x', 'offset': -1},
+                                  {'transcript': 5}])
+def test_endpoint_rejects_malformed_bodies(client, body):
+    assert post(client, body).status_code == 400
@@ -0,0 +1,87 @@
+"""LocalTTLCache: expiry, LRU eviction by entries and bytes"""
+
+import time
+
+from services.local_cache import LocalTTLCache, estimate_size
+
+
+def make(ttl=60, max_entries=100, max_bytes=10 ** 6):
+    return LocalTTLCache('test', ttl, max_entries=max_entries, max_bytes=max_bytes)
+
+
+def test_get_set_pop():
+    cache = make()
+    cache.set('a', {'x': 1})
+    assert cache.get('a') == {'x': 1}
+    assert 'a' in cache and len(cache) == 1
+    assert cache.pop('a') == {'x': 1}
+    assert cache.get('a', 'missing') == 'missing'
+
+
+def test_entries_expire(monkeypatch):
+    cache = make(ttl=10)
+    now = time.time()
+    cache.set('a', 1)
+    cache.set('b', 2, ttl=100)
+    monkeypatch.setattr(time, 'time', lambda: now + 11)
+    assert cache.get('a') is None
+    assert 'a' not in cache
+    assert cache.get('b') == 2
+    assert cache.values() == [2]
+    assert list(cache) == ['b']
+
+
+def test_sweep_removes_expired_entries(monkeypatch):
+    cache = make(ttl=10)
+    now = time.time()
+    for key in 'abc':
+        cache.set(key, key)
+    monkeypatch.setattr(time, 'time', lambda: now + 11)
+    assert cache.sweep() == 3
+    assert len(cache) == 0
+    assert cache.get_stats()['bytes'] == 0
+
+
+def test_rewrite_refreshes_ttl(monkeypatch):
+    cache = make(ttl=10)
+    now = time.time()
+    cache.set('a', 1)
+    monkeypatch.setattr(time, 'time', lambda: now + 8)
+    cache.set('a', 2)
+    monkeypatch.setattr(time, 'time', lambda: now + 15)
+    assert cache.get('a') == 2
+
+
+def test_least_recently_used_evicted_by_entries():
+    cache = make(max_entries=3)
+    for key in 'abc':
+        cache.set(key, key)
+    cache.get('a')  # b is now the least recently used
+    cache.set('d', 'd')
+    assert list(cache) == ['c', 'a', 'd']
+    assert cache.get_stats()['evicted_entries'] == 1
+
+
+def test_evicted_by_bytes():
+    value = 'x' * 100
+    size = estimate_size(value)
+    cache = make(max_bytes=size * 3)
+    for key in 'abcd':
+        cache.set(key, value)
+    assert list(cache) == ['b', 'c', 'd']
+    assert cache.get_stats()['bytes'] == size * 3
+
+
+def test_oversized_value_rejected():
+    cache = make(max_bytes=50)
+    cache.set('small', 'x')
+    cache.set('big', 'x' * 100)
+    assert 'big' not in cache and 'small' in cache
+    assert cache.get_stats()['rejected'] == 1
+
+
+def test_stale_expiry_entries_are_compacted():
+    cache = make()
+    for _ in range(500):
+        cache.set('a', 1)
+    assert len(cache._expiry) <= 2 * len(cache) + 65
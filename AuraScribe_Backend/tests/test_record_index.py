@@ -0,0 +1,118 @@
+"""RecordIndex listings: cursor paging, lazy cleanup and backfill of records saved before the index"""
+
+import json
+
+import pytest
+
+from services.codec import Codec
+from services.record_index import RecordIndex, decode_cursor, page_records
+
+
+@pytest.fixture
+def index(redis_client, raw_client):
+    return RecordIndex(redis_client, 'aurascribe:test:', 'test', raw_client=raw_client,
+                       codec=Codec('json', 'zlib', compress_min_bytes=64))
+
+
+def record(number, minute=None):
+    return {'id': f'rec-{number:03d}', 'created_at': f'2026-10-17T09:{minute if minute is not None else number:02d}:00'}
+
+
+def save(index, records, ttl=3600):
+    for item in records:
+        index.save(item['id'], item, ttl, item['created_at'])
+
+
+def walk(index, limit):
+    ids, cursor = [], None
+    while True:
+        page, cursor = index.page(limit, cursor)
+        assert len(page) <= limit
+        ids += [item['id'] for item in page]
+        if cursor is None:
+            return ids
+
+
+def test_pages_newest_first(index):
+    records = [record(n) for n in range(25)]
+    save(index, records)
+    assert walk(index, 10) == [item['id'] for item in reversed(records)]
+
+
+def test_ties_on_created_at_are_neither_skipped_nor_repeated(index):
+    records = [record(n, minute=5) for n in range(12)]
+    save(index, records)
+    ids = walk(index, 5)
+    assert sorted(ids) == sorted(item['id'] for item in records)
+    assert len(ids) == len(set(ids))
+
+
+def test_records_created_after_the_first_page_do_not_shift_later_pages(index):
+    save(index, [record(n) for n in range(10)])
+    first, cursor = index.page(4)
+    save(index, [record(50)])
+    second, _ = index.page(4, cursor)
+    assert [item['id'] for item in first] == ['rec-009', 'rec-008', 'rec-007', 'rec-006']
+    assert [item['id'] for item in second] == ['rec-005', 'rec-004', 'rec-003', 'rec-002']
+
+
+def test_gone_records_are_unindexed(index, redis_client):
+    save(index, [record(n) for n in range(6)])
+    redis_client.delete(index.key('rec-004'))
+    page, _ = index.page(10)
+    assert 'rec-004' not in [item['id'] for item in page]
+    assert redis_client.zscore(index.created_key, 'rec-004') is None
+
+
+def test_prune_drops_expired_ids_only(index, redis_client):
+    save(index, [record(1), record(2)])
+    # Both index entries look expired; only rec-1's record is actually gone
+    redis_client.zadd(index.expires_key, {'rec-001': 0, 'rec-002': 0})
+    redis_client.delete(index.key('rec-001'))
+    index.prune()
+    assert redis_client.zscore(index.created_key, 'rec-001') is None
+    assert redis_client.zscore(index.expires_key, 'rec-002') > 0
+
+
+def test_backfill_indexes_records_saved_before_the_index(index, redis_client, raw_client):
+    # Written by the old code: plain JSON strings and codec records, no index
+    redis_client.setex(index.key('rec-001'), 3600, json.dumps(record(1)))
+    raw_client.setex(index.key('rec-002'), 3600, index.codec.encode(record(2)))
+    redis_client.set(index.key('rec-003'), json.dumps(record(3)))  # no TTL
+    page, cursor = index.page(10)
+    assert [item['id'] for item in page] == ['rec-003', 'rec-002', 'rec-001']
+    assert cursor is None
+    assert redis_client.zcard(index.created_key) == 3
+    assert redis_client.zcard(index.expires_key) == 3
+
+
+def test_backfill_still_runs_when_a_record_was_saved_first(index, redis_client):
+    # After an upgrade the first save creates the index before any listing ran
+    redis_client.setex(index.key('rec-001'), 3600, json.dumps(record(1)))
+    save(index, [record(2)])
+    assert walk(index, 10) == ['rec-002', 'rec-001']
+
+
+def test_backfill_runs_once(index, redis_client):
+    index.page(10)
+    redis_client.setex(index.key('rec-001'), 3600, json.dumps(record(1)))
+    index._backfilled = False  # a new process
+    assert walk(index, 10) == []
+
+
+def test_invalid_cursor():
+    with pytest.raises(ValueError):
+        decode_cursor('not-a-score:rec-1')
+
+
+def test_page_records_matches_the_redis_order(index):
+    records = [record(n, minute=n // 3) for n in range(10)]
+    save(index, records)
+    expected = walk(index, 3)
+    ids, cursor = [], None
+    while True:
+        page, cursor = page_records(records, 3, cursor)
+        ids += [item['id'] for item in page]
+        if cursor is None:
+            break
+    assert ids == expected
@@ -0,0 +1,112 @@
+"""Session hash layout: Lua append/update scripts and conversion of sessions stored as JSON strings"""
+
+import json
+
+import pytest
+
+from services.session_store import SessionStore
+
+pytest.importorskip('lupa')  # fakeredis runs the Lua scripts through lupa
+
+TTL = 3600
+
+
+@pytest.fixture
+def store(redis_client):
+    return SessionStore(redis_client, TTL)
+
+
+def session(session_id='sess-1', **fields):
+    return {'id': session_id, 'status': 'recording', 'language': 'fr', 'patient': {'name': 'Jean'},
+            'transcript': '', 'created_at': '2026-10-17T09:00:00', **fields}
+
+
+def test_save_and_get(store, redis_client):
+    store.save(session(transcript='bonjour'))
+    assert store.get('sess-1') == session(transcript='bonjour')
+    assert redis_client.type(store.key('sess-1')) == 'hash'
+    assert redis_client.hget(store.key('sess-1'), 'transcript_length') == '7'
+    assert redis_client.get(store.transcript_key('sess-1')) == 'bonjour'
+
+
+def test_append_is_space_separated_and_counts_characters(store, redis_client):
+    store.save(session())
+    assert store.append_transcript('sess-1', 'première phrase', '2026-10-17T09:01:00') == 15
+    assert store.append_transcript('sess-1', 'deuxième', '2026-10-17T09:02:00') == 24
+    saved = store.get('sess-1')
+    assert saved['transcript'] == 'première phrase deuxième'
+    assert saved['updated_at'] == '2026-10-17T09:02:00'
+    assert int(redis_client.hget(store.key('sess-1'), 'transcript_length')) == len(saved['transcript'])
+
+
+def test_append_refreshes_ttls_and_index(store, redis_client):
+    store.save(session(), ttl=10)
+    store.append_transcript('sess-1', 'texte', '2026-10-17T09:01:00')
+    assert redis_client.ttl(store.key('sess-1')) > 10
+    assert redis_client.ttl(store.transcript_key('sess-1')) > 10
+    assert redis_client.zscore(store.expires_key, 'sess-1') is not None
+
+
+def test_missing_session(store):
+    assert store.get('nope') is None
+    assert store.append_transcript('nope', 'texte', '2026-10-17T09:01:00') is None
+    assert store.update('nope', {'status': 'done'}) is None
+
+
+def test_update_sets_fields_and_returns_the_session(store):
+    store.save(session(transcript='bonjour'))
+    updated = store.update('sess-1', {'status': 'completed', 'summary': {'soap': True}})
+    assert updated == session(transcript='bonjour', status='completed', summary={'soap': True})
+    assert store.get('sess-1') == updated
+
+
+@pytest.mark.parametrize('field', ['id', 'transcript', 'transcript_length'])
+def test_update_rejects_managed_fields(store, field):
+    store.save(session())
+    with pytest.raises(ValueError):
+        store.update('sess-1', {field: 'x'})
+
+
+def legacy(redis_client, store, value, ttl=500):
+    redis_client.setex(store.key(value['id']), ttl, json.dumps(value))
+
+
+def test_legacy_json_session_is_converted_on_read(store, redis_client):
+    legacy(redis_client, store, session(transcript='ancien texte'))
+    assert store.get('sess-1') == session(transcript='ancien texte')
+    assert redis_client.type(store.key('sess-1')) == 'hash'
+    assert 0 < redis_client.ttl(store.key('sess-1')) <= 500  # TTL kept, not reset to the default
+    assert store.get('sess-1') == session(transcript='ancien texte')
+
+
+def test_legacy_json_session_is_converted_on_append(store, redis_client):
+    legacy(redis_client, store, session(transcript='ancien texte'))
+    assert store.append_transcript('sess-1', 'suite', '2026-10-17T09:05:00') == len('ancien texte suite')
+    assert store.get('sess-1')['transcript'] == 'ancien texte suite'
+
+
+def test_legacy_json_session_is_converted_on_update(store, redis_client):
+    legacy(redis_client, store, session())
+    assert store.update('sess-1', {'status': 'completed'})['status'] == 'completed'
+
+
+def test_unreadable_legacy_session_counts_as_missing(store, redis_client):
+    redis_client.set(store.key('sess-1'), '{broken')
+    assert store.get('sess-1') is None
+    assert store.append_transcript('sess-1', 'texte', '2026-10-17T09:01:00') is None
+
+
+def test_listing_converts_and_indexes_legacy_sessions(store, redis_client):
+    legacy(redis_client, store, session('sess-old', created_at='2026-10-16T09:00:00'))
+    store.save(session('sess-new'))
+    page, cursor = store.page(10)
+    assert [item['id'] for item in page] == ['sess-new', 'sess-old']
+    assert redis_client.type(store.key('sess-old')) == 'hash'
+
+
+def test_delete_removes_transcript_and_index(store, redis_client):
+    store.save(session(transcript='bonjour'))
+    store.delete('sess-1')
+    assert store.get('sess-1') is None
+    assert not redis_client.exists(store.transcript_key('sess-1'))
+    assert redis_client.zscore(store.created_key, 'sess-1') is None
@@ -554,13 +554,8 @@ const NewSession: React.FC<NewSessionProps> = ({ lang, onComplete, onError, clin
         if (event.data.size > 0) {
           setRecordedChunks(prev => [...prev, event.data]);
           if (sendAudioChunk) {
-            const reader = new FileReader();
-            reader.onloadend = () => {
-              const result = reader.result as string;
-              const base64 = result.split(',')[1];
-              sendAudioChunk(base64);
-            };
-            reader.readAsDataURL(event.data);
+            // Send the raw bytes as a binary Socket.IO attachment (no base64 inflation)
+            event.data.arrayBuffer().then(buffer => sendAudioChunk(buffer));
           }
         }
       };
@@ -83,6 +83,48 @@ export async function orchestrateTranscript(transcript, options = {}) {
     return res.json();
 }
 
+// Orchestrate a live dictation: re-post the transcript so far under one session id;
+// the backend only analyses the text added since the previous call.
+// When posting only options.segment, a server without the earlier text answers
+// resync_required and the full transcript is sent instead.
+export async function orchestrateDictation(sessionId, transcript, options = {}) {
+    const result = await orchestrateTranscript(transcript, { session_id: sessionId, ...options });
+    if (result && result.resync_required && options.segment !== undefined) {
+        const { segment, offset, ...rest } = options;
+        return orchestrateTranscript(transcript, { session_id: sessionId, ...rest });
+    }
+    return result;
+}
+
+// Orchestrate with per-agent results pushed as they complete (NDJSON stream).
+// onEvent receives {event: 'started' | 'agent_result' | 'complete' | 'error', ...}
+export async function streamOrchestration(transcript, onEvent, options = {}) {
+    const res = await fetch(`${API_BASE_URL}/api/orchestrate?stream=ndjson`, {
+        method: 'POST',
+        headers: getAuthHeaders({ 'Content-Type': 'application/json', 'Accept': 'application/x-ndjson' }),
+        body: JSON.stringify({ transcript, ...options })
+    });
+    if (!res.ok || !res.body) {
+        const error = await res.json().catch(() => ({ error: res.statusText }));
+        onEvent({ event: 'error', ...error });
+        return;
+    }
+    const reader = res.body.getReader();
+    const decoder = new TextDecoder();
+    let buffered = '';
+    for (;;) {
+        const { done, value } = await reader.read();
+        buffered += decoder.decode(value || new Uint8Array(), { stream: !done });
+        const lines = buffered.split('\n');
+        buffered = lines.pop() || '';
+        for (const line of lines) {
+            if (line.trim()) onEvent(JSON.parse(line));
+        }
+        if (done) break;
+    }
+    if (buffered.trim()) onEvent(JSON.parse(buffered));
+}
+
 // Process (generic)
 export async function processDocument(data) {
     const res = await fetch(`${API_BASE_URL}/api/process`, {
@@ -133,6 +175,8 @@ export async function updateSessionStatus(sessionId: string, status: string) {
 }
 
 // Upload recording for transcription
+// The blob is sent as the raw request body (options in the query string) so the
+// backend can pipe it to Deepgram without writing a temp file
 export async function uploadRecordingForTranscription(options: {
     audioBlob: Blob;
     language: string;
@@ -140,17 +184,17 @@ export async function uploadRecordingForTranscription(options: {
     analyze?: boolean;
     translateQuebecTerms?: boolean;
 }) {
-    const formData = new FormData();
-    formData.append('audio', options.audioBlob);
-    formData.append('language', options.language);
-    formData.append('model', options.model);
-    if (options.analyze) formData.append('analyze', 'true');
-    if (options.translateQuebecTerms) formData.append('translate_quebec_terms', 'true');
+    const params = new URLSearchParams({
+        language: options.language,
+        model: options.model,
+    });
+    if (options.analyze) params.append('analyze', 'true');
+    if (options.translateQuebecTerms) params.append('translate_quebec_terms', 'true');
 
-    const res = await fetch(`${API_BASE_URL}/api/transcribe`, {
+    const res = await fetch(`${API_BASE_URL}/api/transcribe?${params.toString()}`, {
         method: 'POST',
-        headers: getAuthHeaders(),
-        body: formData
+        headers: getAuthHeaders({ 'Content-Type': options.audioBlob.type || 'application/octet-stream' }),
+        body: options.audioBlob
     });
     return res.json();
 }
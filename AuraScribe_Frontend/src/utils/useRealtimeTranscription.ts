@@ -3,6 +3,18 @@ import { io, Socket } from 'socket.io-client';
 
 const API_KEY = import.meta.env.VITE_API_KEY;
 
+// Preferred audio transports for audio_chunk; the server answers with the one it picked
+const AUDIO_FORMATS = ['binary', 'base64'];
+
+// Final segments by segment_id plus the current interim hypothesis
+interface TranscriptSegments {
+    finals: string[];
+    interim: string;
+}
+
+const joinSegments = ({ finals, interim }: TranscriptSegments) =>
+    [...finals, interim].filter(Boolean).join(' ').trim();
+
 export interface RealtimeTranscript {
     transcript: string;
     isFinal: boolean;
@@ -28,6 +40,7 @@ export function useRealtimeTranscription({
     const socketRef = useRef<Socket | null>(null);
     const isRecordingRef = useRef(false);
     const onStatusRef = useRef(onStatus);
+    const segmentsRef = useRef<TranscriptSegments>({ finals: [], interim: '' });
 
     // Keep onStatus ref updated
     useEffect(() => {
@@ -52,7 +65,9 @@ export function useRealtimeTranscription({
 
             // Only emit start_recording if we're supposed to be recording
             if (isRecordingRef.current) {
-                socket.emit('start_recording', { language, model });
+                // A new server session restarts segment ids at 0
+                segmentsRef.current = { finals: [], interim: '' };
+                socket.emit('start_recording', { language, model, audio_formats: AUDIO_FORMATS, transcript_mode: 'delta' });
             }
         });
 
@@ -82,6 +97,23 @@ export function useRealtimeTranscription({
             });
         });
 
+        // Delta mode: the server only sends the new segment text, the full transcript is rebuilt here
+        socket.on('transcript_delta', (data) => {
+            const segments = segmentsRef.current;
+            if (data.is_final) {
+                segments.finals[data.segment_id] = data.text || '';
+                segments.interim = '';
+            } else {
+                segments.interim = data.text || '';
+            }
+            setTranscript({
+                transcript: joinSegments(segments),
+                isFinal: !!data.is_final,
+                confidence: data.confidence || 0,
+                wordCount: data.word_count || 0,
+            });
+        });
+
         socket.on('recording_stopped', (data) => {
             console.log('Recording stopped, final transcript:', data.final_transcript?.substring(0, 50));
             if (data.final_transcript) {
@@ -108,8 +140,9 @@ export function useRealtimeTranscription({
 
         // Initialize recording on mount
         isRecordingRef.current = true;
+        segmentsRef.current = { finals: [], interim: '' };
         if (socket.connected) {
-            socket.emit('start_recording', { language, model });
+            socket.emit('start_recording', { language, model, audio_formats: AUDIO_FORMATS, transcript_mode: 'delta' });
         }
 
         return () => {
@@ -118,11 +151,11 @@ export function useRealtimeTranscription({
         };
     }, [backendUrl, language, model]);
 
-    // Function to send audio chunk
-    const sendAudioChunk = useCallback((audioBase64: string, isFinal = false) => {
+    // Function to send audio chunk (raw ArrayBuffer is sent as a binary frame, string as legacy base64)
+    const sendAudioChunk = useCallback((audio: ArrayBuffer | string, isFinal = false) => {
         if (socketRef.current && socketRef.current.connected) {
             socketRef.current.emit('audio_chunk', {
-                audio: audioBase64,
+                audio,
                 language,
                 is_final: isFinal,
             });
@@ -142,9 +175,10 @@ export function useRealtimeTranscription({
     // Function to start recording (can be called to restart)
     const startRecording = useCallback(() => {
         isRecordingRef.current = true;
+        segmentsRef.current = { finals: [], interim: '' };
         setTranscript({ transcript: '', isFinal: false });
         if (socketRef.current && socketRef.current.connected) {
-            socketRef.current.emit('start_recording', { language, model });
+            socketRef.current.emit('start_recording', { language, model, audio_formats: AUDIO_FORMATS, transcript_mode: 'delta' });
         }
     }, [language, model]);
 